@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""Benchmarks do LSD Blockchain (saida em JSON para comparar entre commits).
+
+Exemplos:
+    python benchmarks/run.py --output bench.json
+    python benchmarks/run.py --only codec,validation --sizes 1000,10000
+    python benchmarks/run.py --output novo.json --compare bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Callable
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_PATH = os.path.join(ROOT, "src")
+if SRC_PATH not in sys.path:
+    sys.path.insert(0, SRC_PATH)
+
+from lsdchain.core.block import Block  # noqa: E402
+from lsdchain.core.blockchain import Blockchain  # noqa: E402
+from lsdchain.core.difficulty import Difficulty  # noqa: E402
+from lsdchain.core.mining import Miner  # noqa: E402
+from lsdchain.core.transaction import Transaction  # noqa: E402
+from lsdchain.network.node import Node  # noqa: E402
+from lsdchain.network.protocol import Message, Protocol  # noqa: E402
+from lsdchain.tools.generator import ChainGenerator, GeneratorConfig  # noqa: E402
+
+# Dificuldade trivial (qualquer hash serve): as cadeias sinteticas medem o
+# custo de validacao, nao o de mineracao.
+NO_POW = Difficulty.from_bits(0)
+MINER_ADDRESS = "127.0.0.1:9000"
+
+
+def _timed(func: Callable[[], Any]) -> tuple[float, Any]:
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def _generator(height: int, txs_per_block: int = 2, seed: int = 0) -> ChainGenerator:
+    # Mesma seed => mesma cadeia em todas as execucoes (comparavel entre commits).
+    return ChainGenerator(
+        GeneratorConfig(
+            height=height,
+            txs_per_block=txs_per_block,
+            addresses=1000,
+            seed=seed,
+            difficulty=NO_POW,
+        )
+    )
+
+
+def _synthetic_chain(height: int, txs_per_block: int = 2) -> list[Block]:
+    """Cadeia valida (sem PoW) gerada deterministicamente."""
+    return _generator(height, txs_per_block).blockchain().chain
+
+
+def bench_mining(args: argparse.Namespace) -> dict[str, Any]:
+    """Hashes por segundo de Miner.mine_block (alvo impossivel, parada por tempo)."""
+    blockchain = Blockchain(Difficulty(target=1))
+    # Pelo setter: a lista de pendentes nunca e alterada no lugar (indices do mempool).
+    blockchain.pending_transactions = [
+        Transaction(origem="genesis", destino=f"10.0.0.{i % 250 + 1}:1", valor=1.0)
+        for i in range(args.block_txs)
+    ]
+    miner = Miner(blockchain, MINER_ADDRESS)
+    progress: list[tuple[float, int]] = []
+    start = time.perf_counter()
+
+    def on_progress(nonce: int) -> None:
+        progress.append((time.perf_counter() - start, nonce))
+
+    timer = threading.Timer(args.mining_seconds, miner.stop)
+    timer.start()
+    miner.mine_block(on_progress=on_progress)
+    timer.cancel()
+    elapsed, hashes = progress[-1] if progress else (time.perf_counter() - start, 0)
+
+    # Referencia: hash completo (JSON + hexdigest) por tentativa.
+    block = Block(index=1, previous_hash="0" * 64, transactions=list(blockchain.pending_transactions))
+    rounds = 2000
+    ref_elapsed, _ = _timed(lambda: [block.calculate_hash() for _ in range(rounds)])
+    return {
+        "block_txs": args.block_txs,
+        "hashes": hashes,
+        "seconds": elapsed,
+        "hashes_per_second": hashes / elapsed if elapsed else 0.0,
+        "calculate_hash_per_second": rounds / ref_elapsed,
+    }
+
+
+def bench_add_transaction(args: argparse.Namespace) -> dict[str, Any]:
+    """Vazao de add_transaction conforme a cadeia cresce."""
+    results = []
+    for height in args.tx_heights:
+        generator = _generator(height)
+        blockchain = generator.blockchain()
+        count = args.tx_count
+        txs = [tx for _, tx in generator.workload(count, rate=1000.0)]
+        elapsed, accepted = _timed(lambda: sum(blockchain.add_transaction(tx) for tx in txs))
+        results.append(
+            {
+                "chain_height": height,
+                "transactions": len(txs),
+                "accepted": accepted,
+                "seconds": elapsed,
+                "tx_per_second": len(txs) / elapsed if elapsed else 0.0,
+            }
+        )
+    return {"cases": results}
+
+
+def bench_validation(args: argparse.Namespace) -> dict[str, Any]:
+    """is_valid_chain / replace_chain em cadeias sinteticas."""
+    results = []
+    for size in args.sizes:
+        build_elapsed, chain = _timed(lambda: _synthetic_chain(size))
+        validator = Blockchain(NO_POW)
+        valid_elapsed, valid = _timed(lambda: validator.is_valid_chain(chain))
+        replace_elapsed, replaced = _timed(lambda: Blockchain(NO_POW).replace_chain(chain))
+        results.append(
+            {
+                "blocks": size,
+                "build_seconds": build_elapsed,
+                "is_valid_chain_seconds": valid_elapsed,
+                "replace_chain_seconds": replace_elapsed,
+                "valid": valid and replaced,
+                "blocks_per_second": size / valid_elapsed if valid_elapsed else 0.0,
+            }
+        )
+    return {"cases": results}
+
+
+def bench_codec(args: argparse.Namespace) -> dict[str, Any]:
+    """Custo de Message.to_bytes / Message.from_bytes."""
+    # Bloco do fim da cadeia: ha saldo espalhado para preencher block_txs.
+    block = _synthetic_chain(50, txs_per_block=args.block_txs)[-1]
+    messages = {
+        "new_transaction": Protocol.new_transaction(block.transactions[1].to_dict()),
+        "new_block": Protocol.new_block(block.to_dict()),
+    }
+    results = {}
+    for name, message in messages.items():
+        rounds = args.codec_rounds if name == "new_transaction" else max(1, args.codec_rounds // 20)
+        encode_elapsed, frames = _timed(lambda: [message.to_bytes() for _ in range(rounds)])
+        body = frames[0][4:]
+        decode_elapsed, _ = _timed(lambda: [Message.from_bytes(body) for _ in range(rounds)])
+        results[name] = {
+            "bytes": len(frames[0]),
+            "transactions": len(block.transactions) if name == "new_block" else 1,
+            "rounds": rounds,
+            "encode_us": encode_elapsed / rounds * 1e6,
+            "decode_us": decode_elapsed / rounds * 1e6,
+            "encode_mb_per_second": len(frames[0]) * rounds / encode_elapsed / 1e6,
+            "decode_mb_per_second": len(body) * rounds / decode_elapsed / 1e6,
+        }
+    return results
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def bench_gossip(args: argparse.Namespace) -> dict[str, Any]:
+    """Vazao e latencia de propagacao de transacoes entre nos locais (linha)."""
+    nodes = [Node("127.0.0.1", _free_port(), difficulty=NO_POW) for _ in range(args.nodes)]
+    for node in nodes:
+        node.start()
+    try:
+        for previous, node in zip(nodes, nodes[1:]):
+            node.connect_to_peer(previous.address, sync=False)
+        # Saldo para o remetente: um bloco minerado no primeiro no.
+        source = nodes[0]
+        source.mine()
+        deadline = time.time() + 10
+        while time.time() < deadline and any(len(n.blockchain.chain) < 2 for n in nodes):
+            time.sleep(0.01)
+
+        txs = [
+            Transaction(origem=source.address, destino=f"10.2.0.{i % 250 + 1}:1", valor=0.001)
+            for i in range(args.gossip_txs)
+        ]
+        pending_ids = {tx.id for tx in txs}
+        sent_at: dict[str, float] = {}
+        seen_at: dict[str, float] = {}
+        last = nodes[-1]
+
+        start = time.perf_counter()
+        for tx in txs:
+            sent_at[tx.id] = time.perf_counter()
+            source.broadcast_transaction(tx)
+        deadline = time.perf_counter() + args.gossip_timeout
+        while pending_ids and time.perf_counter() < deadline:
+            now = time.perf_counter()
+            for tx in list(last.blockchain.pending_transactions):
+                if tx.id in pending_ids:
+                    pending_ids.discard(tx.id)
+                    seen_at[tx.id] = now
+            time.sleep(0.002)
+        elapsed = time.perf_counter() - start
+        latencies = sorted(seen_at[i] - sent_at[i] for i in seen_at)
+        return {
+            "nodes": args.nodes,
+            "transactions": len(txs),
+            "delivered": len(seen_at),
+            "seconds": elapsed,
+            "tx_per_second": len(seen_at) / elapsed if elapsed else 0.0,
+            "latency_p50_ms": statistics.median(latencies) * 1000 if latencies else None,
+            "latency_p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else None,
+        }
+    finally:
+        for node in nodes:
+            node.stop()
+
+
+BENCHMARKS: dict[str, Callable[[argparse.Namespace], dict[str, Any]]] = {
+    "mining": bench_mining,
+    "add_transaction": bench_add_transaction,
+    "validation": bench_validation,
+    "codec": bench_codec,
+    "gossip": bench_gossip,
+}
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def _flatten(data: Any, prefix: str = "") -> dict[str, float]:
+    flat: dict[str, float] = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            flat.update(_flatten(value, f"{prefix}{key}."))
+    elif isinstance(data, list):
+        for position, value in enumerate(data):
+            flat.update(_flatten(value, f"{prefix}{position}."))
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        flat[prefix[:-1]] = float(data)
+    return flat
+
+
+def _print_comparison(previous: dict[str, Any], current: dict[str, Any]) -> None:
+    old = _flatten(previous.get("results", {}))
+    new = _flatten(current.get("results", {}))
+    print(f"\nComparacao com {previous.get('meta', {}).get('commit')}:")
+    for key in sorted(new):
+        if key in old and old[key]:
+            change = (new[key] - old[key]) / old[key] * 100
+            print(f"  {key}: {old[key]:.4g} -> {new[key]:.4g} ({change:+.1f}%)")
+
+
+def _int_list(raw: str) -> list[int]:
+    return [int(item) for item in raw.split(",") if item.strip()]
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmarks do LSD Blockchain")
+    parser.add_argument("--output", help="Arquivo JSON de saida (padrao: stdout)")
+    parser.add_argument("--compare", help="JSON de uma execucao anterior")
+    parser.add_argument(
+        "--only", default=",".join(BENCHMARKS), help="Benchmarks separados por virgula"
+    )
+    parser.add_argument("--sizes", type=_int_list, default=[1000, 10000, 100000])
+    parser.add_argument("--tx-heights", type=_int_list, default=[100, 1000, 10000])
+    parser.add_argument("--tx-count", type=int, default=500)
+    parser.add_argument("--block-txs", type=int, default=100)
+    parser.add_argument("--mining-seconds", type=float, default=3.0)
+    parser.add_argument("--codec-rounds", type=int, default=20000)
+    parser.add_argument("--nodes", type=int, default=4)
+    parser.add_argument("--gossip-txs", type=int, default=200)
+    parser.add_argument("--gossip-timeout", type=float, default=60.0)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    # Logs dos nos atrapalham a medicao.
+    logging.disable(logging.WARNING)
+
+    results: dict[str, Any] = {}
+    for name in [item.strip() for item in args.only.split(",") if item.strip()]:
+        if name not in BENCHMARKS:
+            raise SystemExit(f"Benchmark desconhecido: {name}")
+        print(f"Executando {name}...", file=sys.stderr)
+        results[name] = BENCHMARKS[name](args)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        },
+        "results": results,
+    }
+    encoded = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(encoded + "\n")
+    else:
+        print(encoded)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            _print_comparison(json.load(handle), report)
+
+
+if __name__ == "__main__":
+    main()
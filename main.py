@@ -13,6 +13,15 @@ if SRC_PATH not in sys.path:
 
 
 def main() -> None:
+    if "--daemon" in sys.argv:
+        sys.argv.remove("--daemon")
+        # Servidor sem interface (arquivo de configuracao JSON); nao importa
+        # Tkinter nem o menu do CLI.
+        from lsdchain.cli.daemon import run as run_daemon
+
+        run_daemon()
+        return
+
     if "--cli" in sys.argv:
         sys.argv.remove("--cli")
         # Modo texto explicito: usa o menu CLI para ambientes sem GUI.
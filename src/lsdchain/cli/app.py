@@ -3,15 +3,27 @@
 from __future__ import annotations
 
 import argparse
+import logging
+import os
+import sys
 import time
 
+from ..core.blockchain import AssumeValid
+from ..core.difficulty import DEFAULT_PREFIX, Difficulty, RetargetPolicy
 from ..core.transaction import Transaction
 from ..core.validation import is_host_port_address
 from ..network.node import Node
+from ..observability.logs import configure_logging
+from ..observability.tracing import TRACER, install_signal_toggle
+from ..tools.chainio import import_chain
+from . import batch
 
 
 def _parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="No da blockchain LSD 2025")
+    parser = argparse.ArgumentParser(
+        description="No da blockchain LSD 2025",
+        epilog="Sem COMANDO abre o menu interativo; com COMANDO executa e encerra o no.",
+    )
     parser.add_argument("--host", default="localhost", help="Host do no")
     parser.add_argument("--port", type=int, default=5000, help="Porta do no")
     parser.add_argument(
@@ -20,9 +32,91 @@ def _parse_args() -> argparse.Namespace:
         default=[],
         help="Enderecos bootstrap (ex: localhost:5001)",
     )
+    parser.add_argument(
+        "--difficulty-bits",
+        type=int,
+        default=None,
+        help="Bits zerados exigidos no hash (padrao: prefixo '000' = 12 bits)",
+    )
+    parser.add_argument(
+        "--retarget-interval",
+        type=int,
+        default=0,
+        help="Reajusta a dificuldade a cada N blocos (0 = dificuldade fixa)",
+    )
+    parser.add_argument(
+        "--block-time",
+        type=float,
+        default=10.0,
+        help="Tempo alvo entre blocos em segundos (usado no reajuste)",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Expoe metricas Prometheus em 127.0.0.1:<porta>/metrics",
+    )
+    parser.add_argument(
+        "--query-port",
+        type=int,
+        default=None,
+        help="Consultas JSON somente leitura em 127.0.0.1:<porta> (/tip, /balance, /block, /tx, /mempool)",
+    )
+    parser.add_argument(
+        "--assume-valid",
+        type=AssumeValid.parse,
+        default=None,
+        metavar="ALTURA:HASH",
+        help="Checkpoint confiavel: ancestrais deste bloco pulam a validacao de PoW e saldos",
+    )
+    parser.add_argument(
+        "--load",
+        default=None,
+        help="Semeia a cadeia a partir de um arquivo exportado (NDJSON ou block store)",
+    )
+    parser.add_argument(
+        "--prune",
+        type=int,
+        default=None,
+        help="Mantem so os N corpos de bloco mais recentes (saldos anteriores em snapshot)",
+    )
+    parser.add_argument(
+        "--trace",
+        default=None,
+        help="Liga o tracing e grava o trace (Chrome JSON) neste arquivo ao sair",
+    )
+    parser.add_argument(
+        "--trace-sample",
+        type=int,
+        default=1,
+        help="Registra 1 de cada N chamadas instrumentadas",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Nivel minimo do log",
+    )
+    parser.add_argument(
+        "--log-json", action="store_true", help="Log em JSON (uma linha por registro)"
+    )
+    # Modo lote: submit, mine, sync, stats, script (cli/batch.py).
+    batch.add_commands(parser)
     return parser.parse_args()
 
 
+def _difficulty_from_args(args: argparse.Namespace) -> Difficulty:
+    # Todos os nos da rede precisam usar a mesma configuracao.
+    retarget = None
+    if args.retarget_interval:
+        retarget = RetargetPolicy(
+            interval=args.retarget_interval, block_time=args.block_time
+        )
+    if args.difficulty_bits is None:
+        return Difficulty.from_prefix(DEFAULT_PREFIX, retarget)
+    return Difficulty.from_bits(args.difficulty_bits, retarget)
+
+
 def _print_menu() -> None:
     print("\n" + "=" * 60)
     print("BLOCKCHAIN LSD 2025 - Menu")
@@ -35,6 +129,7 @@ def _print_menu() -> None:
     print("6. Ver peers conectados")
     print("7. Conectar a peer")
     print("8. Sincronizar blockchain")
+    print("9. Historico de endereco")
     print("0. Sair")
     print("=" * 60)
 
@@ -110,13 +205,46 @@ def _show_balance(node: Node) -> None:
     print(f"Saldo de {address}: {balance}")
 
 
+def _show_history(node: Node, page_size: int = 10) -> None:
+    address = input("\nEndereco: ").strip()
+    if not is_host_port_address(address):
+        print("Endereco invalido. Use o formato host:porta.")
+        return
+    page = 0
+    while True:
+        # Consulta pelo indice de enderecos: custo proporcional a pagina.
+        result = node.blockchain.get_history(address, page, page_size)
+        if not result.total:
+            print("Nenhuma transacao confirmada para este endereco.")
+            return
+        print(
+            f"\n--- Historico de {address} "
+            f"(pagina {page + 1}/{result.pages}, {result.total} transacoes) ---"
+        )
+        for entry in result.entries:
+            tx = entry.transaction
+            signal = "-" if tx.origem == address else "+"
+            print(
+                f"#{entry.height} [{tx.id[:8]}...] {tx.origem} -> {tx.destino}: "
+                f"{signal}{tx.valor}"
+            )
+        choice = input("[n] proxima  [p] anterior  [Enter] voltar: ").strip().lower()
+        if choice == "n" and page + 1 < result.pages:
+            page += 1
+        elif choice == "p" and page > 0:
+            page -= 1
+        elif choice not in ("n", "p"):
+            return
+
+
 def _show_peers(node: Node) -> None:
     print("\n--- Peers ---")
     if not node.peers:
         print("Nenhum peer conectado.")
         return
-    for peer in node.peers:
-        print(f"- {peer}")
+    for info in sorted(node.peer_manager.snapshot(), key=lambda item: item.score):
+        rtt = f"{info.rtt * 1000:.1f} ms" if info.rtt is not None else "?"
+        print(f"- {info.address} (rtt {rtt}, falhas {info.failures})")
 
 
 def _connect_peer(node: Node) -> None:
@@ -139,16 +267,50 @@ def _sync_chain(node: Node) -> None:
 
 def run() -> None:
     args = _parse_args()
-    node = Node(host=args.host, port=args.port)
+    configure_logging(level=getattr(logging, args.log_level), json_lines=args.log_json)
+    node = Node(
+        host=args.host,
+        port=args.port,
+        difficulty=_difficulty_from_args(args),
+        prune=args.prune,
+        assume_valid=args.assume_valid,
+    )
+    # No modo lote a saida padrao tem so as linhas JSON dos comandos.
+    info = sys.stderr if args.command else sys.stdout
+    if args.load:
+        started = time.perf_counter()
+        try:
+            import_chain(args.load, node.blockchain, workers=min(4, os.cpu_count() or 1))
+        except (OSError, ValueError) as exc:
+            raise SystemExit(f"Falha ao carregar {args.load}: {exc}") from None
+        print(
+            f"Cadeia com {len(node.blockchain.chain)} blocos carregada de {args.load} "
+            f"em {time.perf_counter() - started:.1f}s",
+            file=info,
+        )
+    # SIGUSR1 liga/desliga o tracing em execucao (grava o arquivo ao desligar).
+    trace_path = args.trace or f"trace-{args.port}.json"
+    TRACER.sample_every = max(1, args.trace_sample)
+    install_signal_toggle(trace_path)
+    if args.trace:
+        TRACER.enable(args.trace_sample)
+
     node.start()
+    if args.metrics_port is not None:
+        node.start_metrics_server(args.metrics_port)
+    if args.query_port is not None:
+        node.start_query_server(args.query_port)
 
     for bootstrap in args.bootstrap:
-        if node.connect_to_peer(bootstrap):
-            print(f"Conectado ao bootstrap: {bootstrap}")
+        if node.connect_to_peer(bootstrap, sync=False):
+            print(f"Conectado ao bootstrap: {bootstrap}", file=info)
 
     if node.peers:
         node.sync_blockchain()
 
+    if args.command:
+        raise SystemExit(_run_batch(node, args, trace_path))
+
     try:
         while True:
             _print_menu()
@@ -169,6 +331,8 @@ def run() -> None:
                 _connect_peer(node)
             elif choice == "8":
                 _sync_chain(node)
+            elif choice == "9":
+                _show_history(node)
             elif choice == "0":
                 print("Encerrando...")
                 break
@@ -177,7 +341,29 @@ def run() -> None:
     except KeyboardInterrupt:
         print("\nInterrompido pelo usuario")
     finally:
-        node.stop()
+        _shutdown(node, trace_path)
+
+
+def _run_batch(node: Node, args: argparse.Namespace, trace_path: str) -> int:
+    try:
+        return batch.run_command(node, args)
+    except (OSError, ValueError) as exc:
+        print(f"Erro: {exc}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        # Entrega aos peers o que o comando propagou antes de encerrar.
+        node.transport.flush(batch.FLUSH_TIMEOUT)
+        _shutdown(node, trace_path)
+
+
+def _shutdown(node: Node, trace_path: str) -> None:
+    node.stop()
+    if TRACER.enabled:
+        TRACER.disable()
+        count = TRACER.export_chrome(trace_path)
+        print(f"Trace com {count} eventos em {trace_path}", file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,269 @@
+"""Comandos nao interativos do CLI (modo lote, para scripts e testes de carga).
+
+Cada comando imprime o resultado como uma linha JSON:
+
+    submit ARQUIVO    envia transacoes de um CSV ou NDJSON ("-" = stdin)
+    mine N            minera N blocos
+    sync              sincroniza com os peers
+    stats             altura, mempool, peers, agregados da cadeia e metricas
+    script ARQUIVO    executa um comando por linha no mesmo no
+
+No CSV a primeira linha e o cabecalho (`origem,destino,valor` e,
+opcionalmente, `id,timestamp`). No NDJSON cada linha e uma transacao
+(`Transaction.to_dict`) ou `{"transaction": {...}}`, como a carga gravada
+por tools/generator.py.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import shlex
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterable, Iterator
+
+from ..core.transaction import Transaction
+from ..core.validation import is_host_port_address
+
+if TYPE_CHECKING:
+    from ..network.node import Node
+
+# Transacoes por chamada de `Node.broadcast_transactions` (um lock por lote).
+BATCH_SIZE = 1000
+# Prazo para os envios pendentes aos peers antes de encerrar o no.
+FLUSH_TIMEOUT = 30.0
+
+_REQUIRED = ("origem", "destino", "valor")
+
+
+@dataclass
+class SubmitReport:
+    """Resultado de um envio em lote."""
+
+    accepted: int = 0
+    # Motivo da recusa -> quantidade (duplicate, insufficient_funds, ...).
+    rejected: dict[str, int] = field(default_factory=dict)
+    # Linhas que nao formam uma transacao valida.
+    malformed: int = 0
+    seconds: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return self.accepted + sum(self.rejected.values()) + self.malformed
+
+    @property
+    def rate(self) -> float:
+        return self.total / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "total": self.total, "per_second": round(self.rate, 1)}
+
+
+def _transaction(data: dict[str, Any]) -> Transaction | None:
+    try:
+        origem = data["origem"].strip()
+        destino = data["destino"].strip()
+        fields: dict[str, Any] = {
+            "origem": origem,
+            "destino": destino,
+            "valor": float(data["valor"]),
+        }
+        if data.get("id"):
+            fields["id"] = str(data["id"])
+        if data.get("timestamp") not in (None, ""):
+            fields["timestamp"] = float(data["timestamp"])
+        if origem != "genesis" and not is_host_port_address(origem):
+            return None
+        if not is_host_port_address(destino):
+            return None
+        return Transaction(**fields)
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+
+
+def read_transactions(stream: IO[str], fmt: str) -> Iterator[Transaction | None]:
+    """Transacoes do arquivo, em ordem; None para cada linha malformada."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        if reader.fieldnames is None or not set(_REQUIRED) <= set(reader.fieldnames):
+            raise ValueError(f"Cabecalho CSV deve conter {', '.join(_REQUIRED)}")
+        for row in reader:
+            yield _transaction(row)
+        return
+    loads = json.loads
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            data = loads(line)
+        except ValueError:
+            yield None
+            continue
+        if isinstance(data, dict) and isinstance(data.get("transaction"), dict):
+            data = data["transaction"]
+        yield _transaction(data) if isinstance(data, dict) else None
+
+
+def _batches(items: Iterable[Transaction | None], size: int) -> Iterator[list[Transaction | None]]:
+    batch: list[Transaction | None] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def submit(
+    node: "Node",
+    transactions: Iterable[Transaction | None],
+    batch_size: int = BATCH_SIZE,
+    on_batch: Callable[[SubmitReport], None] | None = None,
+) -> SubmitReport:
+    """Envia as transacoes em lotes por `Node.broadcast_transactions`."""
+    report = SubmitReport()
+    rejected = report.rejected
+    started = time.perf_counter()
+    for batch in _batches(transactions, max(1, batch_size)):
+        valid = [tx for tx in batch if tx is not None]
+        report.malformed += len(batch) - len(valid)
+        for error in node.broadcast_transactions(valid):
+            if error is None:
+                report.accepted += 1
+            else:
+                rejected[error] = rejected.get(error, 0) + 1
+        report.seconds = time.perf_counter() - started
+        if on_batch is not None:
+            on_batch(report)
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def mine(node: "Node", count: int) -> dict[str, Any]:
+    """Minera ate `count` blocos (para se a mineracao for interrompida)."""
+    started = time.perf_counter()
+    blocks = []
+    for _ in range(count):
+        block = node.mine()
+        if block is None:
+            break
+        blocks.append(block)
+    return {
+        "mined": len(blocks),
+        "transactions": sum(len(block.transactions) for block in blocks),
+        "height": len(node.blockchain.chain) - 1,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def stats(node: "Node") -> dict[str, Any]:
+    """Estado do no: topo, mempool, peers, agregados da cadeia e metricas."""
+    blockchain = node.blockchain
+    tip = blockchain.chain[-1]
+    return {
+        "address": node.address,
+        "height": tip.index,
+        "hash": tip.hash,
+        "mempool": len(blockchain.pending_transactions),
+        "peers": sorted(node.peers),
+        "pruned_height": blockchain.pruned_height,
+        "chain": asdict(blockchain.analytics.range_stats()),
+        "metrics": node.metrics.snapshot(),
+    }
+
+
+## linha de comando
+def add_commands(parser: argparse.ArgumentParser) -> None:
+    """Registra os comandos em lote como subcomandos de `parser`."""
+    commands = parser.add_subparsers(dest="command", metavar="COMANDO")
+    submit_parser = commands.add_parser("submit", help="Envia transacoes de um arquivo")
+    submit_parser.add_argument("source", help="Arquivo CSV/NDJSON ou '-' para stdin")
+    submit_parser.add_argument(
+        "--format",
+        choices=["csv", "ndjson"],
+        default=None,
+        help="Formato (padrao: pela extensao; stdin = ndjson)",
+    )
+    submit_parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    mine_parser = commands.add_parser("mine", help="Minera N blocos")
+    mine_parser.add_argument("count", type=int, nargs="?", default=1)
+    commands.add_parser("sync", help="Sincroniza com os peers")
+    commands.add_parser("stats", help="Imprime o estado do no em JSON")
+    script_parser = commands.add_parser("script", help="Executa um comando por linha")
+    script_parser.add_argument("source", help="Arquivo de comandos ou '-' para stdin")
+
+
+def _open(source: str) -> IO[str]:
+    if source == "-":
+        return sys.stdin
+    return open(source, encoding="utf-8", newline="")
+
+
+def _emit(command: str, result: dict[str, Any]) -> None:
+    print(json.dumps({"command": command, **result}, separators=(",", ":")), flush=True)
+
+
+def run_command(node: "Node", args: argparse.Namespace) -> int:
+    """Executa o comando em `args.command`; retorna o codigo de saida."""
+    if args.command == "submit":
+        fmt = args.format or ("csv" if args.source.lower().endswith(".csv") else "ndjson")
+        stream = _open(args.source)
+        try:
+            report = submit(node, read_transactions(stream, fmt), args.batch_size)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        _emit("submit", report.to_dict())
+        return 0
+    if args.command == "mine":
+        result = mine(node, args.count)
+        _emit("mine", result)
+        return 0 if result["mined"] == args.count else 1
+    if args.command == "sync":
+        started = time.perf_counter()
+        node.sync_blockchain()
+        _emit(
+            "sync",
+            {
+                "height": len(node.blockchain.chain) - 1,
+                "seconds": round(time.perf_counter() - started, 3),
+            },
+        )
+        return 0
+    if args.command == "stats":
+        _emit("stats", stats(node))
+        return 0
+    if args.command == "script":
+        return run_script(node, args.source)
+    raise ValueError(f"Comando desconhecido: {args.command}")
+
+
+def run_script(node: "Node", source: str) -> int:
+    """Executa os comandos do arquivo em ordem; para no primeiro que falhar."""
+    parser = argparse.ArgumentParser(prog="script", add_help=False)
+    add_commands(parser)
+    stream = _open(source)
+    try:
+        for number, line in enumerate(stream, 1):
+            words = shlex.split(line, comments=True)
+            if not words:
+                continue
+            try:
+                args = parser.parse_args(words)
+            except SystemExit:
+                print(f"Linha {number}: comando invalido: {line.strip()}", file=sys.stderr)
+                return 2
+            if args.command == "script":
+                print(f"Linha {number}: script aninhado nao e suportado", file=sys.stderr)
+                return 2
+            status = run_command(node, args)
+            if status:
+                return status
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    return 0
@@ -0,0 +1,370 @@
+"""Modo daemon: no sem interface, configurado por um arquivo JSON.
+
+    python main.py --daemon no.json
+    PYTHONPATH=src python -m lsdchain.cli.daemon no.json
+
+Exemplo de configuracao (so `port` e obrigatorio):
+
+    {
+      "host": "0.0.0.0",
+      "port": 5000,
+      "bootstrap": ["node1:5000"],
+      "storage": "data/node1",
+      "mining": true,
+      "metrics_port": 9100
+    }
+
+Na partida, cadeia e mempool sao lidos do diretorio `storage` antes de
+qualquer contato com a rede, e o no passa a atender (P2P, metricas,
+consultas) em seguida; bootstrap, sincronizacao e mineracao rodam em
+segundo plano. SIGTERM/SIGINT encerram o no: a mineracao para, o estado e
+gravado e o transporte fecha. Tkinter e o menu do CLI nunca sao importados.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from dataclasses import dataclass, field, fields
+from typing import Any
+
+from ..core.block import Block
+from ..core.blockchain import AssumeValid, Blockchain
+from ..core.difficulty import DEFAULT_PREFIX, Difficulty, RetargetPolicy
+from ..core.transaction import Transaction
+from ..core.validation import is_host_port_address
+from ..network.node import Node
+from ..observability.logs import configure_logging
+from ..tools.chainio import (
+    MAGIC,
+    append_records,
+    block_records,
+    import_chain,
+    store_offsets,
+    write_records,
+)
+
+STORE_FILE = "chain.lsdstore"
+STATE_FILE = "state.json"
+# Prazo para as threads de rede e mineracao terminarem no encerramento.
+STOP_TIMEOUT = 10.0
+_LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+
+@dataclass
+class DaemonConfig:
+    """Opcoes do arquivo de configuracao (chaves com os mesmos nomes)."""
+
+    port: int
+    host: str = "localhost"
+    bootstrap: list[str] = field(default_factory=list)
+    # Diretorio da cadeia e do mempool gravados; None = so em memoria.
+    storage: str | None = None
+    mining: bool = False
+    metrics_port: int | None = None
+    query_port: int | None = None
+    # Segundos entre gravacoes do estado (alem da gravacao ao encerrar).
+    save_interval: float = 60.0
+    # Todos os nos da rede precisam usar a mesma dificuldade.
+    difficulty_bits: int | None = None
+    retarget_interval: int = 0
+    block_time: float = 10.0
+    log_level: str = "INFO"
+    log_json: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "DaemonConfig":
+        if not isinstance(data, dict):
+            raise ValueError("A configuracao deve ser um objeto JSON")
+        unknown = set(data) - {item.name for item in fields(cls)}
+        if unknown:
+            raise ValueError(f"Opcoes desconhecidas: {', '.join(sorted(unknown))}")
+        if "port" not in data:
+            raise ValueError("Opcao obrigatoria ausente: port")
+        config = cls(**data)
+        for name in ("port", "metrics_port", "query_port"):
+            value = getattr(config, name)
+            if value is not None and (type(value) is not int or not 0 < value < 65536):
+                raise ValueError(f"{name} deve ser uma porta entre 1 e 65535")
+        if not isinstance(config.bootstrap, list) or not all(
+            isinstance(peer, str) and is_host_port_address(peer) for peer in config.bootstrap
+        ):
+            raise ValueError("bootstrap deve ser uma lista de enderecos host:porta")
+        if config.log_level not in _LOG_LEVELS:
+            raise ValueError(f"log_level deve ser um de {', '.join(_LOG_LEVELS)}")
+        if not isinstance(config.save_interval, (int, float)) or config.save_interval <= 0:
+            raise ValueError("save_interval deve ser positivo")
+        return config
+
+    @classmethod
+    def load(cls, path: str) -> "DaemonConfig":
+        with open(path, encoding="utf-8") as handle:
+            return cls.from_dict(json.load(handle))
+
+    def difficulty(self) -> Difficulty:
+        retarget = None
+        if self.retarget_interval:
+            retarget = RetargetPolicy(
+                interval=self.retarget_interval, block_time=self.block_time
+            )
+        if self.difficulty_bits is None:
+            return Difficulty.from_prefix(DEFAULT_PREFIX, retarget)
+        return Difficulty.from_bits(self.difficulty_bits, retarget)
+
+
+class LocalStorage:
+    """Cadeia e mempool do no em um diretorio.
+
+    - `chain.lsdstore`: block store (tools/chainio.py) so com acrescimos; so
+      e reescrito quando uma troca de cadeia desfaz blocos ja gravados.
+    - `state.json`: topo gravado (altura, hash, tamanho do store) e as
+      pendentes. E trocado atomicamente depois dos blocos, entao registros
+      alem do topo gravado (queda no meio da gravacao) sao descartados.
+
+    Os blocos ate o topo gravado foram validados por este no; na carga eles
+    entram como checkpoint (`AssumeValid`), sem refazer PoW e saldos. Se o
+    store nao contem esse topo (queda entre a reescrita do store e a troca
+    do estado), os registros completos sao importados com validacao total.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.store_path = os.path.join(path, STORE_FILE)
+        self.state_path = os.path.join(path, STATE_FILE)
+        # Topo ja gravado no store (altura -1 = nada gravado).
+        self._height = -1
+        self._hash = ""
+
+    def load(self, blockchain: Blockchain) -> int:
+        """Carrega a cadeia e as pendentes gravadas; retorna a altura carregada."""
+        os.makedirs(self.path, exist_ok=True)
+        if not os.path.exists(self.store_path):
+            return 0
+        state = self._read_state()
+        checkpoint = None
+        if state is not None:
+            saved, end = self._scan_store(state)
+            if saved:
+                end = state["store_size"]
+                checkpoint = AssumeValid(state["height"], state["hash"])
+            if os.path.getsize(self.store_path) > end:
+                os.truncate(self.store_path, end)
+        previous = blockchain.assume_valid
+        if checkpoint is not None and checkpoint.height > 0:
+            blockchain.assume_valid = checkpoint
+        try:
+            # Sem estado (arquivo de outra origem) ou sem o topo dele no store:
+            # hashes, PoW e saldos conferidos.
+            import_chain(self.store_path, blockchain, verify=checkpoint is None)
+        finally:
+            blockchain.assume_valid = previous
+        tip = blockchain.last_block
+        self._height, self._hash = tip.index, tip.hash
+        if state is not None:
+            try:
+                pending = [
+                    Transaction.from_dict(tx) for tx in state.get("pending_transactions", [])
+                ]
+            except (KeyError, TypeError, ValueError) as exc:
+                raise ValueError(f"Pendentes invalidas em {self.state_path}: {exc!r}") from None
+            blockchain.add_transactions(pending)
+        return tip.index
+
+    def _scan_store(self, state: dict[str, Any]) -> tuple[bool, int]:
+        """(o topo do estado termina em `store_size`, fim do ultimo registro completo)."""
+        # O primeiro registro e o genesis (altura 0).
+        height, end, saved = -1, len(MAGIC), False
+        for block_hash, end in store_offsets(self.store_path):
+            height += 1
+            if end == state["store_size"]:
+                saved = height == state["height"] and block_hash == state["hash"]
+        return saved, end
+
+    def _read_state(self) -> dict[str, Any] | None:
+        try:
+            with open(self.state_path, encoding="utf-8") as handle:
+                state = json.load(handle)
+            int(state["height"]), str(state["hash"]), int(state["store_size"])
+        except FileNotFoundError:
+            return None
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"{self.state_path} invalido: {exc}") from None
+        return state
+
+    def save(self, chain: list[Block], pending: list[Transaction]) -> int:
+        """Grava os blocos novos e as pendentes; retorna quantos blocos foram gravados."""
+        os.makedirs(self.path, exist_ok=True)
+        if self._height >= 0 and (
+            len(chain) <= self._height or chain[self._height].hash != self._hash
+        ):
+            # Blocos gravados foram desfeitos por uma troca de cadeia.
+            temporary = self.store_path + ".tmp"
+            write_records(block_records(chain), temporary, "store")
+            with open(temporary, "rb") as handle:
+                os.fsync(handle.fileno())
+            # Ate `state.json` ser trocado, o estado aponta um topo que o
+            # store novo nao tem: a carga cai na validacao completa.
+            os.replace(temporary, self.store_path)
+            written = len(chain)
+        else:
+            written = len(chain) - 1 - self._height
+            if written:
+                append_records(block_records(chain[self._height + 1 :]), self.store_path)
+        tip = chain[-1]
+        self._height, self._hash = tip.index, tip.hash
+        state = {
+            "height": tip.index,
+            "hash": tip.hash,
+            "store_size": os.path.getsize(self.store_path),
+            "saved_at": time.time(),
+            "pending_transactions": [tx.to_dict() for tx in pending],
+        }
+        temporary = self.state_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump(state, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, self.state_path)
+        return written
+
+
+class Daemon:
+    """Ciclo de vida do no sem interface: carga local, servico, rede e encerramento."""
+
+    def __init__(self, config: DaemonConfig) -> None:
+        self.config = config
+        self.node = Node(host=config.host, port=config.port, difficulty=config.difficulty())
+        self.storage = LocalStorage(config.storage) if config.storage else None
+        self._stopping = threading.Event()
+        # Sinal recebido (o handler so anota; o resto roda na thread principal).
+        self._signal: int | None = None
+        self._threads: list[threading.Thread] = []
+        self._startup = self.node.metrics.gauge(
+            "lsdchain_startup_seconds", "Tempo da partida ate o no atender"
+        )
+
+    def start(self) -> float:
+        """Carrega o estado local e passa a atender; retorna os segundos gastos."""
+        started = time.perf_counter()
+        node = self.node
+        if self.storage is not None:
+            height = self.storage.load(node.blockchain)
+            node.events.info(
+                "storage.loaded",
+                path=self.storage.path,
+                height=height,
+                pending=len(node.blockchain.pending_transactions),
+                seconds=round(time.perf_counter() - started, 3),
+            )
+        node.start()
+        if self.config.metrics_port is not None:
+            node.start_metrics_server(self.config.metrics_port)
+        if self.config.query_port is not None:
+            node.start_query_server(self.config.query_port)
+        elapsed = time.perf_counter() - started
+        self._startup.set(elapsed)
+        node.events.info("daemon.ready", address=node.address, seconds=round(elapsed, 3))
+
+        # Rede e mineracao depois de atender: a partida nao espera peers.
+        self._spawn(self._join_network, "network")
+        if self.storage is not None:
+            self._spawn(self._save_loop, "storage")
+        return elapsed
+
+    def _spawn(self, target: Any, name: str) -> None:
+        thread = threading.Thread(target=target, name=f"{name}-{self.config.port}", daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def _join_network(self) -> None:
+        node = self.node
+        for peer in self.config.bootstrap:
+            if self._stopping.is_set():
+                return
+            if node.connect_to_peer(peer, sync=False):
+                node.events.info("bootstrap.connected", peer=peer)
+        if node.peers and not self._stopping.is_set():
+            node.sync_blockchain()
+        if self.config.mining:
+            # Minera sobre o topo sincronizado; um bloco recebido interrompe
+            # a tentativa atual e a proxima comeca no novo topo.
+            while not self._stopping.is_set():
+                node.mine()
+
+    def _save_loop(self) -> None:
+        while not self._stopping.wait(self.config.save_interval):
+            self.save()
+
+    def save(self) -> None:
+        """Grava o estado (copia da cadeia tirada sob o lock; escrita fora dele)."""
+        if self.storage is None:
+            return
+        with self.node._chain_lock:
+            chain = list(self.node.blockchain.chain)
+            pending = list(self.node.blockchain.pending_transactions)
+        try:
+            written = self.storage.save(chain, pending)
+        except OSError as exc:
+            self.node.events.error("storage.save_failed", path=self.storage.path, error=exc)
+            return
+        if written:
+            self.node.events.info("storage.saved", height=chain[-1].index, blocks=written)
+
+    def request_stop(self) -> None:
+        self._stopping.set()
+        self.node.miner.stop()
+
+    def handle_signal(self, signum: int, _frame: Any = None) -> None:
+        self._signal = signum
+
+    def wait(self) -> None:
+        """Bloqueia ate um sinal de encerramento ou `request_stop`."""
+        while self._signal is None and not self._stopping.is_set():
+            time.sleep(0.2)
+        if self._signal is not None:
+            self.node.events.info("daemon.signal", signal=signal.Signals(self._signal).name)
+
+    def stop(self) -> None:
+        """Para a mineracao, fecha o transporte e grava o estado."""
+        self.request_stop()
+        deadline = time.monotonic() + STOP_TIMEOUT
+        for thread in self._threads:
+            # A mineracao pode ter recomecado entre o aviso e o fim do laco.
+            while thread.is_alive() and time.monotonic() < deadline:
+                self.node.miner.stop()
+                thread.join(0.1)
+        self.node.stop()
+        self.save()
+
+
+def run(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="No da blockchain LSD 2025 sem interface")
+    parser.add_argument("config", help="Arquivo JSON de configuracao")
+    args = parser.parse_args(argv)
+    try:
+        config = DaemonConfig.load(args.config)
+    except (OSError, TypeError, ValueError) as exc:
+        raise SystemExit(f"Configuracao invalida em {args.config}: {exc}") from None
+    configure_logging(level=getattr(logging, config.log_level), json_lines=config.log_json)
+
+    daemon = Daemon(config)
+    signal.signal(signal.SIGTERM, daemon.handle_signal)
+    signal.signal(signal.SIGINT, daemon.handle_signal)
+    try:
+        daemon.start()
+    except (OSError, ValueError) as exc:
+        daemon.node.stop()
+        raise SystemExit(f"Falha ao iniciar o no: {exc}") from None
+    try:
+        daemon.wait()
+    finally:
+        daemon.stop()
+
+
+if __name__ == "__main__":
+    run()
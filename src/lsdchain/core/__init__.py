@@ -1,8 +1,32 @@
 """Componentes centrais da blockchain."""
 
-from .block import Block, GENESIS_BLOCK
-from .blockchain import Blockchain
+from .analytics import ChainAnalytics, RangeStats
+from .block import Block, BlockHeader, GENESIS_BLOCK, LazyBlock
+from .blockchain import AssumeValid, Blockchain, HistoryEntry, HistoryPage
+from .difficulty import Difficulty, RetargetPolicy
+from .events import ChainEvent, EventHub, Subscription
 from .transaction import Transaction
+from .merkle import MerkleTree, TxProof
 from .mining import Miner
 
-__all__ = ["Block", "GENESIS_BLOCK", "Blockchain", "Transaction", "Miner"]
+__all__ = [
+    "Block",
+    "BlockHeader",
+    "LazyBlock",
+    "ChainAnalytics",
+    "RangeStats",
+    "GENESIS_BLOCK",
+    "AssumeValid",
+    "Blockchain",
+    "HistoryEntry",
+    "HistoryPage",
+    "ChainEvent",
+    "EventHub",
+    "Subscription",
+    "Difficulty",
+    "RetargetPolicy",
+    "Transaction",
+    "MerkleTree",
+    "TxProof",
+    "Miner",
+]
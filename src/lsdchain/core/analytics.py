@@ -0,0 +1,353 @@
+"""Agregados da cadeia para consultas por intervalo de altura ou de tempo.
+
+`ChainAnalytics` e mantido pela `Blockchain` a cada bloco anexado (e
+truncado na troca de cadeia). Guarda somas de prefixo por bloco, de modo
+que contagem de transacoes, volume, emissao e intervalos entre blocos de
+qualquer faixa saem em O(1), e o maior timestamp ate cada altura, para
+localizar faixas de tempo por busca binaria.
+
+As transacoes tambem ficam em colunas (remetente, destinatario, valor)
+para analises em lote (distribuicao de saldos, maiores saldos); com NumPy
+instalado essas analises sao vetorizadas, sem ele usam Python puro.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+try:  # Dependencia opcional: apenas acelera as analises em lote.
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+
+from .transaction import COINBASE_SENDER
+
+if TYPE_CHECKING:
+    from .block import Block
+
+
+@dataclass
+class RangeStats:
+    """Agregados de um intervalo de alturas [start, end]."""
+
+    start: int
+    end: int
+    blocks: int
+    # Transacoes de transferencia (sem a coinbase).
+    transactions: int
+    volume: float
+    # Moedas criadas pelas coinbases do intervalo.
+    issuance: float
+    first_timestamp: float
+    last_timestamp: float
+    # Intervalo entre blocos consecutivos (o primeiro bloco conta a partir
+    # do anterior ao intervalo). O genesis tem timestamp fixo, entao o
+    # intervalo ate o bloco 1 nao entra; None se nao houver intervalos.
+    mean_interval: float | None
+    interval_stddev: float | None
+
+
+class ChainAnalytics:
+    """Somas de prefixo e colunas de transacoes, atualizadas por bloco."""
+
+    def __init__(self) -> None:
+        # Valores acumulados ate a altura i, inclusive.
+        self._tx_count: list[int] = []
+        self._volume: list[float] = []
+        self._issuance: list[float] = []
+        # Soma dos intervalos (e quadrados) entre blocos consecutivos.
+        self._intervals: list[int] = []
+        self._interval: list[float] = []
+        self._interval_sq: list[float] = []
+        self._timestamps: list[float] = []
+        # Maior timestamp ate a altura i: sequencia nao decrescente, usada
+        # na busca binaria mesmo com relogios de mineradores fora de ordem.
+        self._time_key: list[float] = []
+        # Colunas das transacoes (inclui coinbase) e inicio de cada bloco.
+        self._tx_offset: list[int] = []
+        self._senders: list[int] = []
+        self._receivers: list[int] = []
+        self._values: list[float] = []
+        self._address_ids: dict[str, int] = {}
+        self._addresses: list[str] = []
+        # Poda (core/blockchain.py): as colunas abaixo de `_compacted` sao
+        # descartadas e os saldos delas ficam em `_base` (por id de endereco);
+        # `_shift` e quantas entradas foram removidas do inicio das colunas.
+        self._compacted = 0
+        self._shift = 0
+        self._base: list[float] = []
+
+    def __len__(self) -> int:
+        return len(self._tx_count)
+
+    def _address_id(self, address: str) -> int:
+        address_id = self._address_ids.get(address)
+        if address_id is None:
+            address_id = len(self._addresses)
+            self._address_ids[address] = address_id
+            self._addresses.append(address)
+        return address_id
+
+    def append(self, block: "Block") -> None:
+        count = 0
+        volume = 0.0
+        issuance = 0.0
+        self._tx_offset.append(len(self._values) + self._shift)
+        # Laco quente (reindex e importacao): metodos ligados a variaveis locais.
+        ids = self._address_ids.get
+        address_id = self._address_id
+        add_sender = self._senders.append
+        add_receiver = self._receivers.append
+        add_value = self._values.append
+        for tx in block.transactions:
+            valor = tx.valor
+            if tx.origem == COINBASE_SENDER:
+                issuance += valor
+            else:
+                count += 1
+                volume += valor
+            sender = ids(tx.origem)
+            add_sender(address_id(tx.origem) if sender is None else sender)
+            receiver = ids(tx.destino)
+            add_receiver(address_id(tx.destino) if receiver is None else receiver)
+            add_value(valor)
+
+        if self._tx_count:
+            # Sem intervalo entre o genesis (timestamp fixo) e o bloco 1.
+            measured = len(self._tx_count) > 1
+            interval = block.timestamp - self._timestamps[-1] if measured else 0.0
+            self._tx_count.append(self._tx_count[-1] + count)
+            self._volume.append(self._volume[-1] + volume)
+            self._issuance.append(self._issuance[-1] + issuance)
+            self._intervals.append(self._intervals[-1] + measured)
+            self._interval.append(self._interval[-1] + interval)
+            self._interval_sq.append(self._interval_sq[-1] + interval * interval)
+            self._time_key.append(max(self._time_key[-1], block.timestamp))
+        else:
+            self._tx_count.append(count)
+            self._volume.append(volume)
+            self._issuance.append(issuance)
+            self._intervals.append(0)
+            self._interval.append(0.0)
+            self._interval_sq.append(0.0)
+            self._time_key.append(block.timestamp)
+        self._timestamps.append(block.timestamp)
+
+    def truncate(self, length: int) -> None:
+        """Mantem apenas os blocos de altura < `length` (troca de cadeia)."""
+        if length >= len(self):
+            return
+        if length < self._compacted:
+            raise ValueError("Alturas compactadas nao podem ser desfeitas")
+        tx_end = self._tx_offset[length] - self._shift
+        for column in (
+            self._tx_count,
+            self._volume,
+            self._issuance,
+            self._intervals,
+            self._interval,
+            self._interval_sq,
+            self._timestamps,
+            self._time_key,
+            self._tx_offset,
+        ):
+            del column[length:]
+        del self._senders[tx_end:]
+        del self._receivers[tx_end:]
+        del self._values[tx_end:]
+
+    def compact(self, height: int, balances: dict[str, float] | None = None) -> None:
+        """Descarta as colunas de transacoes das alturas <= `height`.
+
+        Os saldos dessas alturas passam a valer como base; com `balances`
+        (snapshot do ledger) a base e substituida por esses valores. As
+        somas de prefixo continuam completas.
+        """
+        cut = min(height + 1, len(self))
+        if balances is None and cut <= self._compacted:
+            return
+        if cut < len(self):
+            end = max(0, self._tx_offset[cut] - self._shift)
+        else:
+            end = len(self._values)
+        if balances is not None:
+            self._base = [0.0] * len(self._addresses)
+            for address, value in balances.items():
+                address_id = self._address_id(address)
+                if address_id >= len(self._base):
+                    self._base.extend([0.0] * (address_id + 1 - len(self._base)))
+                self._base[address_id] = value
+        else:
+            base = self._base
+            base.extend([0.0] * (len(self._addresses) - len(base)))
+            for sender, receiver, value in zip(
+                self._senders[:end], self._receivers[:end], self._values[:end]
+            ):
+                base[receiver] += value
+                base[sender] -= value
+        del self._senders[:end]
+        del self._receivers[:end]
+        del self._values[:end]
+        self._shift += end
+        self._compacted = max(self._compacted, cut)
+
+    ## consultas por intervalo (O(1))
+    def _clamp(self, start: int, end: int | None) -> tuple[int, int]:
+        last = len(self) - 1
+        end = last if end is None else min(end, last)
+        return max(0, start), end
+
+    def range_stats(self, start: int = 0, end: int | None = None) -> RangeStats:
+        """Agregados das alturas [start, end] (inclusive)."""
+        start, end = self._clamp(start, end)
+        if end < start:
+            raise ValueError("Intervalo de alturas vazio")
+
+        def delta(prefix: list) -> float:
+            return prefix[end] - (prefix[start - 1] if start > 0 else 0)
+
+        intervals = int(delta(self._intervals))
+        mean = stddev = None
+        if intervals > 0:
+            total = delta(self._interval)
+            mean = total / intervals
+            variance = delta(self._interval_sq) / intervals - mean * mean
+            stddev = math.sqrt(max(0.0, variance))
+        return RangeStats(
+            start=start,
+            end=end,
+            blocks=end - start + 1,
+            transactions=int(delta(self._tx_count)),
+            volume=delta(self._volume),
+            issuance=delta(self._issuance),
+            first_timestamp=self._timestamps[start],
+            last_timestamp=self._timestamps[end],
+            mean_interval=mean,
+            interval_stddev=stddev,
+        )
+
+    def height_at(self, timestamp: float) -> int:
+        """Maior altura cujo bloco (e anteriores) tem timestamp <= `timestamp`; -1 se nenhuma."""
+        return bisect_right(self._time_key, timestamp) - 1
+
+    def heights_between(self, start_time: float, end_time: float) -> tuple[int, int]:
+        """Faixa de alturas minerada em [start_time, end_time] (busca binaria)."""
+        return bisect_left(self._time_key, start_time), self.height_at(end_time)
+
+    def stats_between(self, start_time: float, end_time: float) -> RangeStats | None:
+        start, end = self.heights_between(start_time, end_time)
+        if end < start:
+            return None
+        return self.range_stats(start, end)
+
+    def active_addresses(self, start: int = 0, end: int | None = None) -> int:
+        """Enderecos distintos (fora a coinbase) com transacoes nas alturas [start, end].
+
+        Em cadeias podadas, considera apenas as alturas com transacoes retidas.
+        """
+        start, end = self._clamp(start, end)
+        start = max(start, self._compacted)
+        if end < start:
+            return 0
+        first = self._tx_offset[start] - self._shift
+        last = (
+            self._tx_offset[end + 1] - self._shift if end + 1 < len(self) else len(self._values)
+        )
+        coinbase = self._address_ids.get(COINBASE_SENDER)
+        if np is not None:
+            ids = np.unique(
+                np.concatenate(
+                    (
+                        np.asarray(self._senders[first:last], dtype=np.int64),
+                        np.asarray(self._receivers[first:last], dtype=np.int64),
+                    )
+                )
+            )
+            return int(ids.size - (1 if coinbase is not None and coinbase in ids else 0))
+        ids = set(self._senders[first:last])
+        ids.update(self._receivers[first:last])
+        ids.discard(coinbase)
+        return len(ids)
+
+    ## analises em lote
+    def balances(self) -> dict[str, float]:
+        """Saldo confirmado de todos os enderecos (exceto a coinbase)."""
+        totals = self._balance_vector()
+        return {
+            address: float(totals[address_id])
+            for address_id, address in enumerate(self._addresses)
+            if address != COINBASE_SENDER
+        }
+
+    def _balance_vector(self):
+        size = len(self._addresses)
+        base = self._base + [0.0] * (size - len(self._base))
+        if np is not None:
+            values = np.asarray(self._values, dtype=np.float64)
+            received = np.bincount(
+                np.asarray(self._receivers, dtype=np.int64), weights=values, minlength=size
+            )
+            sent = np.bincount(
+                np.asarray(self._senders, dtype=np.int64), weights=values, minlength=size
+            )
+            return np.asarray(base, dtype=np.float64) + received - sent
+        totals = base
+        for sender, receiver, value in zip(self._senders, self._receivers, self._values):
+            totals[receiver] += value
+            totals[sender] -= value
+        return totals
+
+    def _holder_balances(self) -> list[tuple[str, float]]:
+        totals = self._balance_vector()
+        return [
+            (address, float(totals[address_id]))
+            for address_id, address in enumerate(self._addresses)
+            if address != COINBASE_SENDER
+        ]
+
+    def top_holders(self, count: int = 10) -> list[tuple[str, float]]:
+        """Os `count` maiores saldos confirmados, em ordem decrescente."""
+        if np is not None and self._addresses:
+            totals = self._balance_vector()
+            coinbase = self._address_ids.get(COINBASE_SENDER)
+            if coinbase is not None:
+                totals[coinbase] = -np.inf
+            count = min(count, len(totals))
+            if count <= 0:
+                return []
+            # Empates no limite saem por id do endereco (ordem de aparicao na
+            # cadeia), como no caminho em Python puro.
+            kth = -np.partition(-totals, count - 1)[count - 1]
+            above = np.flatnonzero(totals > kth)
+            tied = np.flatnonzero(totals == kth)[: count - above.size]
+            top = np.concatenate((above, tied))
+            top = top[np.lexsort((top, -totals[top]))]
+            return [
+                (self._addresses[i], float(totals[i])) for i in top if np.isfinite(totals[i])
+            ]
+        # nlargest e estavel: empates na ordem de `_holder_balances` (id do endereco).
+        return heapq.nlargest(count, self._holder_balances(), key=lambda item: item[1])
+
+    def balance_distribution(self, bins: int = 10) -> tuple[list[float], list[int]]:
+        """Histograma dos saldos: (limites das faixas, quantidade por faixa)."""
+        holders = self._holder_balances()
+        if not holders:
+            return [], []
+        values = [balance for _, balance in holders]
+        low, high = min(values), max(values)
+        if high == low:
+            high = low + 1.0
+        if np is not None:
+            counts, edges = np.histogram(np.asarray(values), bins=bins, range=(low, high))
+            return edges.tolist(), counts.tolist()
+        # Mesmas faixas de `np.histogram`: semiabertas, a ultima inclui `high`.
+        width = (high - low) / bins
+        edges = [low + width * i for i in range(bins)] + [high]
+        counts = [0] * bins
+        for value in values:
+            counts[min(bins - 1, bisect_right(edges, value) - 1)] += 1
+        return edges, counts
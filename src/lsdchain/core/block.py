@@ -8,10 +8,13 @@ import hashlib
 import json
 import time
 
+from .difficulty import hash_meets_target
 from .transaction import Transaction
 
 GENESIS_PREVIOUS_HASH = "0" * 64
 GENESIS_HASH = "0567c32b97c36a70d3f4cb865710d329a0be5d713c8cb1b8c769fbaf89f1afb7"
+# Valor sentinela usado apenas para localizar o nonce no JSON do hash.
+_NONCE_MARKER = "__lsdchain_nonce__"
 
 
 @dataclass
@@ -29,17 +32,45 @@ class Block:
         if not self.hash:
             self.hash = self.calculate_hash()
 
-    def calculate_hash(self) -> str:
-        # Hash SHA-256 com JSON ordenado (sort_keys=True) para interoperabilidade.
-        block_data = {
+    def _hash_data(self) -> dict[str, Any]:
+        return {
             "index": self.index,
             "previous_hash": self.previous_hash,
             "transactions": [tx.to_dict() for tx in self.transactions],
             "nonce": self.nonce,
             "timestamp": self.timestamp,
         }
-        encoded = json.dumps(block_data, sort_keys=True).encode()
-        return hashlib.sha256(encoded).hexdigest()
+
+    def hash_preimage(self) -> bytes:
+        """Bytes exatos sobre os quais o hash e calculado (JSON com sort_keys=True)."""
+        return json.dumps(self._hash_data(), sort_keys=True).encode()
+
+    def calculate_digest(self) -> bytes:
+        # Hash SHA-256 com JSON ordenado (sort_keys=True) para interoperabilidade.
+        return hashlib.sha256(self.hash_preimage()).digest()
+
+    def calculate_hash(self) -> str:
+        return self.calculate_digest().hex()
+
+    def hash_template(self) -> tuple[bytes, bytes]:
+        """Divide o JSON do hash em (antes do nonce, depois do nonce).
+
+        Com sort_keys o nonce fica entre "index" e "previous_hash"; o
+        minerador so precisa concatenar `prefixo + str(nonce) + sufixo`,
+        gerando exatamente os mesmos bytes de `calculate_hash`.
+        """
+        data = self._hash_data()
+        # Troca o sentinela caso alguma transacao contenha o mesmo texto.
+        attempt = 0
+        while True:
+            sentinel = f"{_NONCE_MARKER}{attempt}"
+            data["nonce"] = sentinel
+            encoded = json.dumps(data, sort_keys=True).encode()
+            marker = json.dumps(sentinel).encode()
+            if encoded.count(marker) == 1:
+                prefix, suffix = encoded.split(marker)
+                return prefix, suffix
+            attempt += 1
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -81,5 +112,216 @@ class Block:
     def is_valid_pow(self, difficulty_prefix: str) -> bool:
         return self.hash.startswith(difficulty_prefix)
 
+    def meets_target(self, target: int) -> bool:
+        # Comparacao numerica do hash com o alvo (dificuldade configuravel).
+        return hash_meets_target(self.hash, target)
+
+
+# Chave das transacoes no JSON do hash: com sort_keys e a ultima do bloco.
+_TRANSACTIONS_KEY = b', "transactions": '
+_HEADER_KEYS = frozenset(("index", "nonce", "previous_hash", "timestamp"))
+_TX_KEYS = frozenset(("id", "origem", "destino", "valor", "timestamp"))
+
+
+class LazyBlock(Block):
+    """Bloco que guarda a forma recebida e so cria as `Transaction` quando usadas.
+
+    O cabecalho e lido na criacao; as transacoes ficam como os bytes do
+    hash (`from_preimage`, arquivos do chainio) ou como os dicts da mensagem
+    (`from_dict`) ate o primeiro acesso a `transactions`. Ate la, conferir
+    o hash, repassar (`to_dict`) ou gravar (`hash_preimage`) o bloco nao cria
+    objetos `Transaction`. Os valores nao sao convertidos (como em
+    `Block.from_dict`): o bloco materializado serializa exatamente os mesmos
+    bytes, entao a forma recebida e descartada ao materializar.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        previous_hash: str,
+        nonce: int,
+        timestamp: float,
+        hash: str,
+        preimage: bytes | None = None,
+        tx_data: list[dict[str, Any]] | None = None,
+    ) -> None:
+        self.index = index
+        self.previous_hash = previous_hash
+        self.nonce = nonce
+        self.timestamp = timestamp
+        self.hash = hash
+        self._preimage = preimage
+        self._tx_data = tx_data
+        self._transactions: list[Transaction] | None = None
+
+    @property
+    def materialized(self) -> bool:
+        return self._transactions is not None
+
+    @property
+    def transactions(self) -> list[Transaction]:  # type: ignore[override]
+        if self._transactions is None:
+            try:
+                self._transactions = [_transaction(tx) for tx in self._transaction_dicts()]
+            except (KeyError, TypeError, ValueError, AttributeError) as exc:
+                raise ValueError(f"Transacao malformada no bloco {self.index}: {exc!r}") from None
+            self._preimage = None
+            self._tx_data = None
+        return self._transactions
+
+    @transactions.setter
+    def transactions(self, transactions: list[Transaction]) -> None:
+        self._transactions = transactions
+        self._preimage = None
+        self._tx_data = None
+
+    def _transaction_dicts(self) -> list[dict[str, Any]]:
+        if self._transactions is not None:
+            return [tx.to_dict() for tx in self._transactions]
+        if self._tx_data is None:
+            preimage = self._preimage
+            start = preimage.find(_TRANSACTIONS_KEY) + len(_TRANSACTIONS_KEY)
+            data = json.loads(preimage[start:-1])
+            if not isinstance(data, list):
+                raise ValueError(f"Transacoes malformadas no bloco {self.index}")
+            self._tx_data = data
+        return self._tx_data
+
+    def hash_preimage(self) -> bytes:
+        if self._preimage is not None:
+            return self._preimage
+        if self._transactions is not None:
+            return super().hash_preimage()
+        return json.dumps(
+            {
+                "index": self.index,
+                "previous_hash": self.previous_hash,
+                "transactions": self._tx_data,
+                "nonce": self.nonce,
+                "timestamp": self.timestamp,
+            },
+            sort_keys=True,
+        ).encode()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "index": self.index,
+            "previous_hash": self.previous_hash,
+            "transactions": self._transaction_dicts(),
+            "nonce": self.nonce,
+            "timestamp": self.timestamp,
+            "hash": self.hash,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LazyBlock":
+        transactions = data["transactions"]
+        if not isinstance(transactions, list):
+            raise ValueError("Campo transactions deve ser uma lista")
+        return cls._from_header(data, str(data["hash"]), tx_data=transactions)
+
+    @classmethod
+    def from_preimage(
+        cls, block_hash: str, preimage: bytes, fields: dict[str, Any] | None = None
+    ) -> "LazyBlock":
+        """Bloco a partir dos bytes do hash; `fields` evita reler o JSON se ja decodificado."""
+        if fields is not None:
+            return cls._from_header(
+                fields, block_hash, preimage=preimage, tx_data=fields["transactions"]
+            )
+        position = preimage.find(_TRANSACTIONS_KEY)
+        if position < 0 or not preimage.endswith(b"]}"):
+            raise ValueError("JSON do bloco fora da forma canonica")
+        header = json.loads(preimage[:position] + b"}")
+        if not isinstance(header, dict) or header.keys() != _HEADER_KEYS:
+            raise ValueError("Cabecalho do bloco com campos inesperados")
+        return cls._from_header(header, block_hash, preimage=preimage)
+
+    @classmethod
+    def _from_header(
+        cls,
+        data: dict[str, Any],
+        block_hash: str,
+        preimage: bytes | None = None,
+        tx_data: list[dict[str, Any]] | None = None,
+    ) -> "LazyBlock":
+        index, nonce, timestamp = data["index"], data["nonce"], data["timestamp"]
+        previous_hash = data["previous_hash"]
+        if not (
+            _is_int(index)
+            and _is_int(nonce)
+            and _is_number(timestamp)
+            and isinstance(previous_hash, str)
+        ):
+            raise ValueError("Cabecalho do bloco com tipos invalidos")
+        return cls(index, previous_hash, nonce, timestamp, block_hash, preimage, tx_data)
+
+
+def _is_int(value: Any) -> bool:
+    return type(value) is int
+
+
+def _is_number(value: Any) -> bool:
+    return type(value) in (int, float)
+
+
+def _transaction(data: dict[str, Any]) -> Transaction:
+    # Valores exatamente como recebidos: o bloco continua com o mesmo hash.
+    if data.keys() != _TX_KEYS:
+        raise ValueError("Campos da transacao diferentes do padrao")
+    valor, timestamp = data["valor"], data["timestamp"]
+    if not (_is_number(valor) and _is_number(timestamp)):
+        raise ValueError("valor e timestamp devem ser numeros")
+    return Transaction(
+        origem=data["origem"],
+        destino=data["destino"],
+        valor=valor,
+        id=data["id"],
+        timestamp=timestamp,
+    )
+
+
+@dataclass
+class BlockHeader:
+    """Cabecalho de um bloco sem as transacoes (clientes leves).
+
+    `merkle_root` e `tx_count` vem da arvore de Merkle lateral (core/merkle.py);
+    o hash do bloco continua sendo o do padrao, calculado com as transacoes.
+    """
+
+    index: int
+    previous_hash: str
+    timestamp: float
+    nonce: int
+    hash: str
+    merkle_root: str
+    tx_count: int
+
+    def meets_target(self, target: int) -> bool:
+        return hash_meets_target(self.hash, target)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "index": self.index,
+            "previous_hash": self.previous_hash,
+            "timestamp": self.timestamp,
+            "nonce": self.nonce,
+            "hash": self.hash,
+            "merkle_root": self.merkle_root,
+            "tx_count": self.tx_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "BlockHeader":
+        return cls(
+            index=int(data["index"]),
+            previous_hash=str(data["previous_hash"]),
+            timestamp=float(data["timestamp"]),
+            nonce=int(data["nonce"]),
+            hash=str(data["hash"]),
+            merkle_root=str(data["merkle_root"]),
+            tx_count=int(data["tx_count"]),
+        )
+
 
 GENESIS_BLOCK = Block.create_genesis()
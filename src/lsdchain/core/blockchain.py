@@ -2,63 +2,323 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
-from typing import Any
+import math
+import time
+from bisect import bisect_right
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Any, Iterable, Sequence
 
-from .block import Block, GENESIS_HASH, GENESIS_PREVIOUS_HASH
-from .transaction import Transaction
+from ..observability.metrics import MetricsRegistry
+from .analytics import ChainAnalytics
+from .block import Block, BlockHeader, GENESIS_HASH, GENESIS_PREVIOUS_HASH
+from .difficulty import DEFAULT_PREFIX, Difficulty, target_work
+from .events import EventHub
+from .merkle import MerkleTree, TxProof
+from .transaction import COINBASE_SENDER, Transaction
 
-DIFFICULTY_PREFIX = "000"
-COINBASE_SENDER = "coinbase"
+DIFFICULTY_PREFIX = DEFAULT_PREFIX
 COINBASE_REWARD = 50.0
+# Arvores de Merkle completas mantidas para gerar provas (as mais recentes).
+MERKLE_TREE_CACHE = 64
+# Poda: menor numero de corpos de bloco mantidos e quantos blocos novos
+# acumulam antes de cada nova poda (o snapshot nao e refeito a cada bloco).
+MIN_PRUNE_KEEP = 10
+DEFAULT_PRUNE_INTERVAL = 100
+# Timestamp de um bloco: acima da mediana dos MEDIAN_TIME_SPAN anteriores e
+# no maximo MAX_FUTURE_DRIFT segundos a frente do relogio local.
+MEDIAN_TIME_SPAN = 11
+MAX_FUTURE_DRIFT = 2 * 60 * 60
+
+
+def timestamp_error(
+    previous: Sequence[Block | BlockHeader], block: Block | BlockHeader, now: float
+) -> str | None:
+    """Confere o timestamp contra os (ate MEDIAN_TIME_SPAN) blocos anteriores.
+
+    O reajuste de dificuldade le os timestamps: sem estas regras um
+    minerador poderia declarar janelas lentas e baratear o alvo.
+    """
+    timestamp = block.timestamp
+    if not math.isfinite(timestamp):
+        return "timestamp"
+    times = sorted(other.timestamp for other in previous)
+    if timestamp <= times[len(times) // 2]:
+        return "time_too_old"
+    if timestamp > now + MAX_FUTURE_DRIFT:
+        return "time_too_new"
+    return None
+
+
+def build_locator(chain: Sequence[Block | BlockHeader]) -> list[list[Any]]:
+    """Locator de uma sequencia de blocos ou cabecalhos (ver `Blockchain.locator`)."""
+    entries: list[list[Any]] = []
+    height = len(chain) - 1
+    step = 1
+    while height > 0:
+        entries.append([height, chain[height].hash])
+        if len(entries) >= 10:
+            step *= 2
+        height -= step
+    entries.append([0, chain[0].hash])
+    return entries
+
+
+@dataclass
+class LedgerSnapshot:
+    """Saldos confirmados de todos os enderecos ate `height` (inclusive)."""
+
+    height: int
+    block_hash: str
+    balances: dict[str, float]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"height": self.height, "block_hash": self.block_hash, "balances": self.balances}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LedgerSnapshot":
+        return cls(
+            height=int(data["height"]),
+            block_hash=str(data["block_hash"]),
+            balances={str(k): float(v) for k, v in data["balances"].items()},
+        )
+
+
+@dataclass(frozen=True)
+class AssumeValid:
+    """Bloco confiavel: seus ancestrais pulam a validacao de PoW e de saldos."""
+
+    height: int
+    block_hash: str
+
+    @classmethod
+    def parse(cls, text: str) -> "AssumeValid":
+        """Le `altura:hash` (formato da linha de comando)."""
+        height, _, block_hash = text.partition(":")
+        if not height.isdigit() or len(block_hash) != 64:
+            raise ValueError("Use altura:hash (hash com 64 caracteres hexadecimais)")
+        return cls(int(height), block_hash.lower())
+
+
+class _ConfirmedBalances(dict):
+    """Saldos confirmados calculados sob demanda (so os enderecos usados)."""
+
+    def __init__(self, blockchain: "Blockchain") -> None:
+        super().__init__()
+        self._blockchain = blockchain
+
+    def __missing__(self, address: str) -> float:
+        value = self[address] = self._blockchain.confirmed_balance(address)
+        return value
+
+
+@dataclass
+class HistoryEntry:
+    """Transacao confirmada que envolve um endereco."""
+
+    height: int
+    position: int
+    transaction: Transaction
+
+
+@dataclass
+class HistoryPage:
+    """Pagina do historico de um endereco (mais recentes primeiro)."""
+
+    address: str
+    entries: list[HistoryEntry]
+    page: int
+    page_size: int
+    # Total de transacoes confirmadas do endereco (todas as paginas).
+    total: int
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-self.total // self.page_size))
 
 
 class Blockchain:
     """Mantem a cadeia de blocos e o pool de transacoes pendentes."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        difficulty: Difficulty | None = None,
+        metrics: MetricsRegistry | None = None,
+        assume_valid: AssumeValid | None = None,
+    ) -> None:
         self.chain: list[Block] = [Block.create_genesis()]
+        # Checkpoint confiavel (assume-valid): acelera a sincronizacao inicial.
+        self.assume_valid = assume_valid
+        # Incrementada a cada mudanca do mempool (chave de caches externos).
+        self.mempool_version = 0
+        # Mempool: id -> transacao (em ordem de chegada), transacoes de cada
+        # endereco (como origem ou destino), quantas cada endereco envia e
+        # efeito liquido por endereco. A lista de `pending_transactions` e
+        # montada sob demanda.
+        self._pending_by_id: dict[str, Transaction] = {}
+        self._pending_by_address: dict[str, dict[str, Transaction]] = {}
+        self._pending_sent: dict[str, int] = defaultdict(int)
+        self._pending_delta: dict[str, float] = defaultdict(float)
+        self._pending_list: list[Transaction] | None = None
         self.pending_transactions: list[Transaction] = []
+        # Saldos confirmados ja calculados, validos enquanto o topo for
+        # `_balance_cache_tip`.
+        self._balance_cache: dict[str, float] = {}
+        self._balance_cache_tip: str | None = None
+        # Dificuldade da rede; o padrao equivale ao prefixo "000".
+        self.difficulty = difficulty or Difficulty()
+        self._target_cache: dict[int, int] = {}
+        # Relogio do limite de timestamps futuros (a simulacao usa tempo virtual).
+        self.clock = time.time
+        # (hash do topo, saldos ate ele): ledger corrente de `extend_chain`.
+        self._ledger: tuple[str, dict[str, float]] | None = None
+        # Endereco -> [(altura, posicao da tx no bloco)], em ordem da cadeia.
+        self._address_index: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        # Id da transacao -> (altura, posicao); hash do bloco -> altura.
+        self._tx_index: dict[str, tuple[int, int]] = {}
+        self._hash_index: dict[str, int] = {}
+        # Raiz de Merkle das transacoes de cada altura (estrutura lateral; o
+        # hash do bloco segue o padrao), calculada na primeira consulta, e
+        # arvores recentes para provas.
+        self._merkle_roots: list[str | None] = []
+        self._merkle_trees: OrderedDict[str, MerkleTree] = OrderedDict()
+        # Trabalho acumulado (soma de 2**256 // alvo) ate cada altura.
+        self._chain_work: list[int] = []
+        # Poda: blocos de altura <= pruned_height guardam so o cabecalho; os
+        # saldos ate ali ficam no snapshot do ledger.
+        self.pruned_height = 0
+        self.snapshot: LedgerSnapshot | None = None
+        self.prune_keep: int | None = None
+        self.prune_interval = DEFAULT_PRUNE_INTERVAL
+        # Numero de transacoes de cada bloco podado (altura 1 em diante).
+        self._pruned_tx_counts: list[int] = []
+        # Somas de prefixo por bloco para consultas por intervalo.
+        self.analytics = ChainAnalytics()
+        self._index_block(self.chain[0])
+        # Assinaturas de eventos (topo, blocos, reorgs, mempool).
+        self.subscriptions = EventHub()
+        self._init_metrics(metrics or MetricsRegistry())
+
+    def _init_metrics(self, metrics: MetricsRegistry) -> None:
+        self.metrics = metrics
+        self._tx_accepted = metrics.counter(
+            "lsdchain_transactions_accepted_total", "Transacoes aceitas no mempool"
+        )
+        self._tx_rejected = metrics.counter(
+            "lsdchain_transactions_rejected_total",
+            "Transacoes recusadas, por motivo",
+            ("reason",),
+        )
+        self._tx_evicted = metrics.counter(
+            "lsdchain_mempool_evicted_total",
+            "Pendentes removidas por blocos novos ou trocas de cadeia, por motivo",
+            ("reason",),
+        )
+        self._tx_restored = metrics.counter(
+            "lsdchain_mempool_restored_total",
+            "Transacoes de blocos desfeitos devolvidas ao mempool",
+        )
+        self._blocks_accepted = metrics.counter(
+            "lsdchain_blocks_accepted_total", "Blocos anexados a cadeia"
+        )
+        self._blocks_rejected = metrics.counter(
+            "lsdchain_blocks_rejected_total", "Blocos recusados, por motivo", ("reason",)
+        )
+        self._blocks_assumed = metrics.counter(
+            "lsdchain_blocks_assumed_valid_total",
+            "Blocos ancestrais do checkpoint aceitos sem validar PoW e saldos",
+        )
+        self._reorgs = metrics.counter(
+            "lsdchain_chain_replacements_total", "Trocas de cadeia (consenso)"
+        )
+        # Calculados so na coleta: sem custo no caminho de validacao.
+        metrics.gauge("lsdchain_chain_height", "Altura do topo").set_function(
+            lambda: len(self.chain) - 1
+        )
+        metrics.gauge("lsdchain_mempool_size", "Transacoes pendentes").set_function(
+            lambda: len(self._pending_by_id)
+        )
+        metrics.gauge(
+            "lsdchain_pruned_height", "Maior altura cujo corpo foi descartado (poda)"
+        ).set_function(lambda: self.pruned_height)
 
     @property
     def last_block(self) -> Block:
         return self.chain[-1]
 
+    @property
+    def pending_transactions(self) -> list[Transaction]:
+        # Nao deve ser alterada no lugar: use o setter ou `add_transaction`.
+        if self._pending_list is None:
+            self._pending_list = list(self._pending_by_id.values())
+        return self._pending_list
+
+    @pending_transactions.setter
+    def pending_transactions(self, transactions: list[Transaction]) -> None:
+        # Substituir a lista refaz todos os indices.
+        self._pending_by_id = {}
+        self._pending_by_address = {}
+        self._pending_sent = defaultdict(int)
+        self._pending_delta = defaultdict(float)
+        self._pending_list = []
+        for tx in transactions:
+            self._push_pending(tx)
+        self.mempool_version += 1
+
+    def target_for_index(self, index: int) -> int:
+        """Alvo de PoW exigido para o bloco `index` desta cadeia."""
+        return self.difficulty.target_for(self.chain, index, self._target_cache)
+
+    def next_target(self) -> int:
+        """Alvo do proximo bloco a ser minerado."""
+        return self.target_for_index(len(self.chain))
+
+    @property
+    def chain_work(self) -> int:
+        """Trabalho acumulado da cadeia (criterio da escolha entre forks)."""
+        return self._chain_work[-1]
+
     ## Funções do saldo 
     def get_balance(self, address: str) -> float:
-        """Calcula o saldo de um endereço percorrendo toda a cadeia e as transações pendentes."""
+        """Calcula o saldo de um endereço a partir das suas transações confirmadas e pendentes."""
 
-        balance = 0.0
-        # Soma/Sub valores de todos os blocos já confirmados
-        for block in self.chain:
-            for tx in block.transactions:
-                if tx.destino == address:
-                    balance += tx.valor
-                if tx.origem == address:
-                    balance -= tx.valor
         # Considera transacoes que estao na fila para evitar gasto duplo antes da mineracao
-        for tx in self.pending_transactions:
+        return self.confirmed_balance(address) + self._pending_delta.get(address, 0.0)
+
+    def confirmed_balance(self, address: str) -> float:
+        """Saldo so com transacoes confirmadas (snapshot da poda + indice)."""
+        # Cache por topo: envios em lote consultam o mesmo remetente muitas vezes.
+        tip = self.chain[-1].hash
+        if tip != self._balance_cache_tip:
+            self._balance_cache = {}
+            self._balance_cache_tip = tip
+        cache = self._balance_cache
+        cached = cache.get(address)
+        if cached is not None:
+            return cached
+        balance = self.snapshot.balances.get(address, 0.0) if self.snapshot else 0.0
+        # Soma/Sub valores das transacoes confirmadas do endereco (via indice)
+        for height, position in self._address_index.get(address, ()):
+            tx = self.chain[height].transactions[position]
             if tx.destino == address:
                 balance += tx.valor
             if tx.origem == address:
                 balance -= tx.valor
+        cache[address] = balance
         return balance
 
     def has_address(self, address: str) -> bool:
-        for block in self.chain:
-            for tx in block.transactions:
-                if tx.origem == address or tx.destino == address:
-                    return True
-        for tx in self.pending_transactions:
-            if tx.origem == address or tx.destino == address:
-                return True
-        return False
+        if self._address_index.get(address):
+            return True
+        if self.snapshot and address in self.snapshot.balances:
+            return True
+        return address in self._pending_delta
 
     def _get_chain_balances(
         self, target_chain: list[Block] | None = None
     ) -> dict[str, float]:
         if target_chain is None:
-            target_chain = self.chain
+            return self._balances_at(len(self.chain) - 1)
 
         balances: dict[str, float] = defaultdict(float)
         for block in target_chain:
@@ -67,35 +327,189 @@ class Blockchain:
                 balances[tx.origem] -= tx.valor
         return balances
 
+    def _balances_at(self, height: int) -> dict[str, float]:
+        """Saldos confirmados ate `height` desta cadeia (a partir do snapshot, se houver)."""
+        balances: dict[str, float] = defaultdict(float)
+        start = 0
+        if self.snapshot is not None:
+            if height < self.snapshot.height:
+                raise ValueError("Altura anterior ao snapshot (corpos descartados)")
+            balances.update(self.snapshot.balances)
+            start = self.snapshot.height + 1
+        for block in self.chain[start : height + 1]:
+            for tx in block.transactions:
+                balances[tx.destino] += tx.valor
+                balances[tx.origem] -= tx.valor
+        return balances
+
     # funções pra gestão de transações
     def add_transaction(self, transaction: Transaction) -> bool:
+        return self._admit_transaction(transaction) is None
+
+    def add_transactions(self, transactions: Iterable[Transaction]) -> list[str | None]:
+        """Adiciona um lote ao mempool; motivo da recusa de cada transacao (None = aceita)."""
+        admit = self._admit_transaction
+        return [admit(tx) for tx in transactions]
+
+    def _admit_transaction(self, transaction: Transaction) -> str | None:
         # Valida regras basicas e saldo antes de aceitar no pool.
+        error = self._transaction_error(transaction)
+        if error:
+            self._tx_rejected.labels(error).inc()
+            return error
+        self._push_pending(transaction)
+        self.mempool_version += 1
+        self._tx_accepted.inc()
+        if self.subscriptions:
+            self.subscriptions.publish(
+                "transaction",
+                {"transaction": transaction.to_dict()},
+                (transaction.origem, transaction.destino),
+            )
+        return None
+
+    def _push_pending(self, transaction: Transaction) -> None:
+        self._pending_by_id[transaction.id] = transaction
+        if self._pending_list is not None:
+            self._pending_list.append(transaction)
+        by_address = self._pending_by_address
+        by_address.setdefault(transaction.origem, {})[transaction.id] = transaction
+        by_address.setdefault(transaction.destino, {})[transaction.id] = transaction
+        self._pending_sent[transaction.origem] += 1
+        self._pending_delta[transaction.destino] += transaction.valor
+        self._pending_delta[transaction.origem] -= transaction.valor
+
+    def _drop_pending(self, transaction: Transaction) -> None:
+        del self._pending_by_id[transaction.id]
+        self._pending_list = None
+        sent = self._pending_sent
+        sent[transaction.origem] -= 1
+        if not sent[transaction.origem]:
+            del sent[transaction.origem]
+        delta = self._pending_delta
+        delta[transaction.destino] -= transaction.valor
+        delta[transaction.origem] += transaction.valor
+        for address in (transaction.origem, transaction.destino):
+            entries = self._pending_by_address.get(address)
+            if entries is not None:
+                entries.pop(transaction.id, None)
+                if not entries:
+                    # Sem pendentes: o endereco sai (e o efeito volta a zero exato).
+                    del self._pending_by_address[address]
+                    delta.pop(address, None)
+
+    def _reconcile_mempool(
+        self, disconnected: Sequence[Block], connected: Sequence[Block]
+    ) -> None:
+        """Ajusta o mempool depois que blocos entram (e saem) da cadeia.
+
+        Chamado com os indices ja atualizados. Saem as pendentes ja
+        confirmadas e as que ficaram sem saldo; so sao revalidadas as
+        transacoes de remetentes cujo saldo mudou (enderecos dos blocos ou
+        destinatarios de uma transacao removida), no lugar, pelo indice por
+        endereco: o custo e proporcional as pendentes afetadas. Numa troca
+        de cadeia as transacoes dos blocos desfeitos voltam ao mempool,
+        antes das pendentes, e o mempool e refeito.
+        """
+        restored = [
+            tx
+            for block in disconnected
+            for tx in block.transactions
+            if tx.origem != COINBASE_SENDER
+        ]
+        if restored:
+            self._rebuild_mempool(restored, disconnected, connected)
+            return
+        changed: set[str] = set()
+        pending_ids = self._pending_by_id
+        confirmed = []
+        for block in connected:
+            for tx in block.transactions:
+                changed.add(tx.origem)
+                changed.add(tx.destino)
+                pending = pending_ids.get(tx.id)
+                if pending is not None:
+                    confirmed.append(pending)
+        by_address = self._pending_by_address
+        if not confirmed and not any(address in by_address for address in changed):
+            return
+        for tx in confirmed:
+            self._drop_pending(tx)
+            self._tx_evicted.labels("confirmed").inc()
+        # Cada remetente afetado e percorrido em ordem de chegada: fica a
+        # transacao coberta pelo saldo confirmado mais as pendentes anteriores
+        # que ficaram. Uma remocao recoloca o destinatario na fila.
+        sent = self._pending_sent
+        queue = [address for address in changed if address in sent]
+        while queue:
+            address = queue.pop()
+            entries = by_address.get(address)
+            if address not in sent or address in (COINBASE_SENDER, "genesis"):
+                continue
+            balance = self.confirmed_balance(address)
+            for tx in list(entries.values()):
+                if tx.origem != address:
+                    balance += tx.valor
+                elif balance < tx.valor:
+                    self._drop_pending(tx)
+                    self._tx_evicted.labels("insufficient_funds").inc()
+                    if tx.destino != address:
+                        queue.append(tx.destino)
+                elif tx.destino != address:
+                    balance -= tx.valor
+        self.mempool_version += 1
+
+    def _rebuild_mempool(
+        self,
+        restored: list[Transaction],
+        disconnected: Sequence[Block],
+        connected: Sequence[Block],
+    ) -> None:
+        # Troca de cadeia: as devolvidas entram antes das pendentes, entao a
+        # ordem (e o mempool inteiro) e refeita.
+        changed: set[str] = set()
+        for block in (*disconnected, *connected):
+            for tx in block.transactions:
+                changed.add(tx.origem)
+                changed.add(tx.destino)
+        candidates = restored + self.pending_transactions
+        self.pending_transactions = []
+        tx_index = self._tx_index
+        for position, tx in enumerate(candidates):
+            if tx.id in tx_index or tx.id in self._pending_by_id:
+                if position >= len(restored):
+                    self._tx_evicted.labels("confirmed").inc()
+                continue
+            if tx.origem in changed:
+                error = self._transaction_error(tx)
+                if error:
+                    self._tx_evicted.labels(error).inc()
+                    # Quem recebia desta transacao pode ter perdido o saldo.
+                    changed.add(tx.destino)
+                    continue
+            self._push_pending(tx)
+            if position < len(restored):
+                self._tx_restored.inc()
+
+    def _transaction_error(self, transaction: Transaction) -> str | None:
+        """Motivo da recusa da transacao no mempool (None = aceita)."""
         if self._is_duplicate(transaction):
-            return False
+            return "duplicate"
         
         if not self._validate_transaction_basic(transaction):# verifica campos básicos ( valores positivos e existencia de enderecos)
-            return False
+            return "invalid"
         
         if transaction.origem == COINBASE_SENDER: # só pode ser usado em transações de recompensa, não pode ser add diretamente no pool de pendentes
-            return False
+            return "coinbase"
         
         if transaction.origem not in (COINBASE_SENDER, "genesis"):#Verifica se o remetente possui saldo suficiente (exceto no genesis)
             if self.get_balance(transaction.origem) < transaction.valor:
-                return False
-            
-        self.pending_transactions.append(transaction)
-        return True
+                return "insufficient_funds"
+        return None
 
     def _is_duplicate(self, transaction: Transaction) -> bool:
         """Verifica se o ID da transacao ja existe nos pendentes ou na blockchain confirmada."""
-        for tx in self.pending_transactions:
-            if tx.id == transaction.id:
-                return True
-        for block in self.chain:
-            for tx in block.transactions:
-                if tx.id == transaction.id:
-                    return True
-        return False
+        return transaction.id in self._pending_by_id or transaction.id in self._tx_index
 
     def _validate_transaction_basic(self, transaction: Transaction) -> bool:
         """Checagem simples: valor deve ser positivo e campos de endereco preenchidos."""
@@ -107,58 +521,281 @@ class Blockchain:
     ## gestão de bloco 
     def add_block(self, block: Block) -> bool:
         # Aceita o bloco apenas se for valido e remove pendentes incluidas.
-        if not self.is_valid_block(block):
+        if self._assumed_valid_height(self.last_block, [block]):
+            self._blocks_assumed.inc()
+            self._append_block(block)
+            return True
+        error = self._header_error(block) or self._block_transactions_error(block)
+        if error:
+            self._blocks_rejected.labels(error).inc()
             return False
+        self._append_block(block)
+        return True
 
-        included_ids = {tx.id for tx in block.transactions}
-        self.pending_transactions = [
-            tx for tx in self.pending_transactions if tx.id not in included_ids
-        ]
+    def extend_chain(self, blocks: list[Block]) -> int:
+        """Anexa uma sequencia de blocos ao topo, validando-os em ordem.
+
+        Os saldos sao calculados uma unica vez e atualizados bloco a bloco,
+        em vez de percorrer a cadeia inteira para cada bloco como em
+        `add_block`. Entre chamadas seguidas (sincronizacao em lotes) o
+        ledger e reaproveitado enquanto o topo nao mudar por outro caminho.
+        Para no primeiro bloco invalido e retorna quantos blocos foram
+        anexados.
+        """
+        ledger, self._ledger = self._ledger, None
+        if ledger is not None and ledger[0] == self.last_block.hash:
+            balances = ledger[1]
+        else:
+            balances = self._get_chain_balances()
+        assumed = self._assumed_valid_height(self.last_block, blocks)
+        added = 0
+        for block in blocks:
+            if block.index <= assumed:
+                # Ancestral do checkpoint (encadeamento ja conferido).
+                self._apply_transactions(block, balances)
+                self._blocks_assumed.inc()
+                self._append_block(block)
+                added += 1
+                continue
+            error = self._header_error(block) or self._block_transactions_error(
+                block, balances=balances
+            )
+            if error:
+                self._blocks_rejected.labels(error).inc()
+                # Saldos parcialmente atualizados pelo bloco recusado.
+                return added
+            self._append_block(block)
+            added += 1
+        self._ledger = (self.last_block.hash, balances)
+        return added
+
+    def _append_block(self, block: Block) -> None:
         self.chain.append(block)
-        return True
+        self._index_block(block)
+        # Tira as pendentes incluidas e as que o bloco deixou sem saldo.
+        self._reconcile_mempool((), (block,))
+        self._blocks_accepted.inc()
+        if self.subscriptions:
+            self._publish_block(block)
+            self._publish_tip()
+        self._maybe_prune()
+
+    def _publish_block(self, block: Block) -> None:
+        addresses = set()
+        for tx in block.transactions:
+            addresses.add(tx.origem)
+            addresses.add(tx.destino)
+        self.subscriptions.publish("block", block.to_dict(), addresses)
+
+    def _publish_tip(self) -> None:
+        tip = self.chain[-1]
+        self.subscriptions.publish(
+            "tip", {"height": tip.index, "hash": tip.hash, "timestamp": tip.timestamp}
+        )
+
+    ## indice de enderecos
+    def _index_block(self, block: Block, merkle_root: str | None = None) -> None:
+        # `merkle_root` so e informado para blocos podados (sem transacoes);
+        # nos demais a raiz e calculada sob demanda (`_merkle_root`).
+        index = self._address_index
+        tx_index = self._tx_index
+        height = block.index
+        for position, tx in enumerate(block.transactions):
+            entry = (height, position)
+            index[tx.origem].append(entry)
+            if tx.destino != tx.origem:
+                index[tx.destino].append(entry)
+            tx_index[tx.id] = entry
+        self._hash_index[block.hash] = block.index
+        self._merkle_roots.append(merkle_root)
+        work = target_work(self.target_for_index(height))
+        self._chain_work.append(self._chain_work[-1] + work if self._chain_work else work)
+        self.analytics.append(block)
+
+    def _unindex_block(self, block: Block) -> None:
+        # As entradas do bloco sao as ultimas de cada lista (ordem da cadeia).
+        index = self._address_index
+        self._hash_index.pop(block.hash, None)
+        self._merkle_roots.pop()
+        self._chain_work.pop()
+        for tx in block.transactions:
+            self._tx_index.pop(tx.id, None)
+            for address in (tx.origem, tx.destino):
+                entries = index.get(address)
+                while entries and entries[-1][0] == block.index:
+                    entries.pop()
+                if entries is not None and not entries:
+                    del index[address]
+
+    def reindex(self) -> None:
+        """Recalcula o indice de enderecos e os agregados (apos alterar `chain` diretamente)."""
+        # Raizes dos blocos podados nao podem ser recalculadas: sao mantidas.
+        pruned_roots = self._merkle_roots[: self.pruned_height + 1]
+        self._balance_cache_tip = None
+        self._address_index = defaultdict(list)
+        self._tx_index = {}
+        self._hash_index = {}
+        self._merkle_roots = []
+        self._chain_work = []
+        self._target_cache.clear()
+        self.analytics = ChainAnalytics()
+        for block in self.chain:
+            if 0 < block.index <= self.pruned_height:
+                self._index_block(block, pruned_roots[block.index])
+            else:
+                self._index_block(block)
+        if self.snapshot is not None:
+            self.analytics.compact(self.snapshot.height, self.snapshot.balances)
+
+    ## poda
+    def enable_pruning(self, keep: int, interval: int = DEFAULT_PRUNE_INTERVAL) -> None:
+        """Mantem so os `keep` corpos de bloco mais recentes (poda a cada `interval` blocos)."""
+        self.prune_keep = max(MIN_PRUNE_KEEP, keep)
+        self.prune_interval = max(1, interval)
+        self._maybe_prune()
+
+    def _maybe_prune(self) -> None:
+        if self.prune_keep is None:
+            return
+        if len(self.chain) - 1 - self.pruned_height >= self.prune_keep + self.prune_interval:
+            self.prune(self.prune_keep)
+
+    def prune(self, keep: int) -> int:
+        """Grava o snapshot dos saldos e descarta os corpos abaixo dos `keep` ultimos blocos.
+
+        Os cabecalhos (hash, encadeamento, timestamp, raiz de Merkle) ficam,
+        de modo que novos blocos continuam validados normalmente. Retorna a
+        nova altura podada.
+        """
+        keep = max(MIN_PRUNE_KEEP, keep)
+        height = len(self.chain) - 1 - keep
+        if height <= self.pruned_height:
+            return self.pruned_height
+        balances = self._balances_at(height)
+        self.snapshot = LedgerSnapshot(
+            height,
+            self.chain[height].hash,
+            {address: value for address, value in balances.items() if value},
+        )
+        for h in range(self.pruned_height + 1, height + 1):
+            block = self.chain[h]
+            self._merkle_root(h)
+            self._merkle_trees.pop(block.hash, None)
+            self._pruned_tx_counts.append(len(block.transactions))
+            self.chain[h] = Block(
+                index=block.index,
+                previous_hash=block.previous_hash,
+                transactions=[],
+                nonce=block.nonce,
+                timestamp=block.timestamp,
+                hash=block.hash,
+            )
+        # O historico passa a comecar apos o snapshot. Os IDs das transacoes
+        # podadas continuam no indice para recusar reenvios (duplicadas).
+        for address, entries in list(self._address_index.items()):
+            cut = bisect_right(entries, (height, float("inf")))
+            if cut:
+                del entries[:cut]
+                if not entries:
+                    del self._address_index[address]
+        self.analytics.compact(height)
+        self.pruned_height = height
+        return height
+
+    def get_history(self, address: str, page: int = 0, page_size: int = 20) -> HistoryPage:
+        """Transacoes confirmadas do endereco, paginadas (mais recentes primeiro).
+
+        O custo e proporcional ao tamanho da pagina, nao ao da cadeia.
+        """
+        page_size = max(1, page_size)
+        page = max(0, page)
+        entries = self._address_index.get(address, [])
+        total = len(entries)
+        end = total - page * page_size
+        start = max(0, end - page_size)
+        result = []
+        for height, position in reversed(entries[start:max(0, end)]):
+            result.append(
+                HistoryEntry(height, position, self.chain[height].transactions[position])
+            )
+        return HistoryPage(address, result, page, page_size, total)
 
     def is_valid_block(self, block: Block) -> bool:
         # Valida encadeamento, hash, PoW e transacoes do bloco.
-        if block.index != len(self.chain):
-            return False
-        if block.previous_hash != self.last_block.hash:
-            return False
-        if block.hash != block.calculate_hash():
-            return False
-        if not block.is_valid_pow(DIFFICULTY_PREFIX):
+        if not self._is_valid_header(block):
             return False
         if not self._validate_block_transactions(block):
             return False
         return True
 
-    def _validate_block_transactions(self, block: Block, target_chain: list[Block] | None = None) -> bool:
+    def _is_valid_header(self, block: Block) -> bool:
+        return self._header_error(block) is None
+
+    def _header_error(self, block: Block) -> str | None:
+        # Encadeamento com o topo atual, hash, PoW e timestamp.
+        if block.index != len(self.chain):
+            return "height"
+        if block.previous_hash != self.last_block.hash:
+            return "previous_hash"
+        if block.hash != block.calculate_hash():
+            return "hash"
+        if not block.meets_target(self.target_for_index(block.index)):
+            return "pow"
+        return timestamp_error(self.chain[-MEDIAN_TIME_SPAN:], block, self.clock())
+
+    def _validate_block_transactions(
+        self,
+        block: Block,
+        target_chain: list[Block] | None = None,
+        balances: dict[str, float] | None = None,
+    ) -> bool:
+        return self._block_transactions_error(block, target_chain, balances) is None
+
+    def _block_transactions_error(
+        self,
+        block: Block,
+        target_chain: list[Block] | None = None,
+        balances: dict[str, float] | None = None,
+    ) -> str | None:
+        try:
+            # Em um `LazyBlock` este e o primeiro acesso as transacoes.
+            transactions = block.transactions
+        except ValueError:
+            return "malformed"
         # Coinbase deve ser a primeira transacao e cria a recompensa.
-        if not block.transactions:
-            return False
+        if not transactions:
+            return "coinbase"
 
-        first = block.transactions[0]
+        first = transactions[0]
         if first.origem != COINBASE_SENDER:
-            return False
+            return "coinbase"
         if first.valor != COINBASE_REWARD:
-            return False
+            return "coinbase"
         if first.timestamp != block.timestamp:
-            return False
+            return "coinbase"
 
-        balances = self._get_chain_balances(target_chain)
-        for idx, tx in enumerate(block.transactions):
+        # `balances` pode vir pronto (saldos acumulados ate o bloco anterior);
+        # nesse caso e atualizado no lugar com as transacoes deste bloco.
+        if balances is None:
+            # Na cadeia local so os saldos dos enderecos do bloco sao consultados.
+            if target_chain is None:
+                balances = _ConfirmedBalances(self)
+            else:
+                balances = self._get_chain_balances(target_chain)
+        for idx, tx in enumerate(transactions):
             if not self._validate_transaction_basic(tx):
-                return False
+                return "invalid_transaction"
             if idx == 0 and tx.origem == COINBASE_SENDER:
                 balances[tx.destino] += tx.valor
                 continue
             if tx.origem == COINBASE_SENDER:
-                return False
+                return "coinbase"
             # Garante que a origem nao fique negativa.
             if balances[tx.origem] < tx.valor:
-                return False
+                return "insufficient_funds"
             balances[tx.origem] -= tx.valor
             balances[tx.destino] += tx.valor
-        return True
+        return None
 
     def is_valid_chain(self, chain: list[Block]) -> bool:
         """Valida uma blockchain completa (usado ao sincronizar com outros nós)."""
@@ -171,43 +808,335 @@ class Blockchain:
             or genesis.hash != GENESIS_HASH
             or genesis.timestamp != 0
             or genesis.nonce != 0
-            or genesis.transactions
         ):
             return False
-        for i in range(1, len(chain)):
-            current = chain[i]
-            previous = chain[i - 1]
-            if current.index != i:
-                return False
-            if current.previous_hash != previous.hash:
-                return False
-            if current.hash != current.calculate_hash():
-                return False
-            if not current.is_valid_pow(DIFFICULTY_PREFIX):
+        try:
+            if genesis.transactions:
                 return False
-            if not self._validate_block_transactions(current, target_chain=chain[:i]):
+        except ValueError:
+            return False
+        # Saldos acumulados bloco a bloco (evita recalcular chain[:i] a cada passo).
+        return self._is_valid_range(chain, 1, defaultdict(float))
+
+    def _is_valid_range(
+        self, chain: list[Block], start: int, balances: dict[str, float]
+    ) -> bool:
+        """Valida chain[start:], dados os saldos acumulados ate chain[start - 1]."""
+        # Cache local: os alvos dependem dos timestamps da cadeia candidata.
+        target_cache: dict[int, int] = {}
+        assumed = self._assumed_valid_height(chain[start - 1], chain, start)
+        for i in range(start, len(chain)):
+            if i <= assumed:
+                self._apply_transactions(chain[i], balances)
+                self._blocks_assumed.inc()
+            elif self._chain_block_error(chain, i, balances, target_cache):
                 return False
         return True
 
+    ## assume-valid
+    def _assumed_valid_height(
+        self, previous: Block, blocks: Sequence[Block], start: int = 0
+    ) -> int:
+        """Altura ate a qual blocks[start:] pode pular PoW e saldos (0 = nenhuma).
+
+        Vale so quando o bloco do checkpoint esta entre os blocos recebidos e
+        o encadeamento ate ele confere (indice, `previous_hash` e hash
+        recalculado): o hash confiavel cobre, por encadeamento, o conteudo
+        de todos os ancestrais.
+        """
+        checkpoint = self.assume_valid
+        if checkpoint is None or not blocks:
+            return 0
+        position = start + checkpoint.height - previous.index - 1
+        if not start <= position < len(blocks):
+            return 0
+        if blocks[position].hash != checkpoint.block_hash:
+            return 0
+        for block in blocks[start : position + 1]:
+            if (
+                block.index != previous.index + 1
+                or block.previous_hash != previous.hash
+                or block.hash != block.calculate_hash()
+            ):
+                return 0
+            previous = block
+        return checkpoint.height
+
+    @staticmethod
+    def _apply_transactions(block: Block, balances: dict[str, float]) -> None:
+        for tx in block.transactions:
+            balances[tx.destino] += tx.valor
+            balances[tx.origem] -= tx.valor
+
+    def _chain_block_error(
+        self,
+        chain: Sequence[Block],
+        i: int,
+        balances: dict[str, float],
+        target_cache: dict[int, int],
+        check_hash: bool = True,
+    ) -> str | None:
+        """Motivo da recusa de chain[i] dado chain[:i] e os saldos ate ali (None = valido)."""
+        current = chain[i]
+        if current.index != i:
+            return "height"
+        if current.previous_hash != chain[i - 1].hash:
+            return "previous_hash"
+        if check_hash and current.hash != current.calculate_hash():
+            return "hash"
+        if not current.meets_target(self.difficulty.target_for(chain, i, target_cache)):
+            return "pow"
+        error = timestamp_error(chain[max(0, i - MEDIAN_TIME_SPAN) : i], current, self.clock())
+        return error or self._block_transactions_error(current, balances=balances)
+
+    def bulk_load(self, blocks: Iterable[Block], check_hashes: bool = True) -> int:
+        """Carrega uma cadeia inteira, do genesis ao topo, em uma unica passada.
+
+        Caminho da importacao em massa: os blocos sao validados em ordem
+        contra um unico ledger corrente e os indices sao construidos uma vez,
+        no final. `check_hashes=False` quando quem le os blocos ja conferiu
+        os hashes. Levanta ValueError no primeiro bloco invalido, sem alterar
+        a cadeia atual; retorna quantos blocos foram carregados apos o genesis.
+
+        Com `assume_valid`, os blocos ate a altura do checkpoint so tem o
+        encadeamento conferido e suas transacoes entram direto no ledger. Se
+        o arquivo nao contiver o bloco confiavel, esse trecho e validado por
+        completo no final.
+        """
+        if len(self.chain) > 1:
+            raise ValueError("bulk_load exige uma cadeia so com o genesis")
+        iterator = iter(blocks)
+        genesis = next(iterator, None)
+        if genesis is None or genesis.hash != GENESIS_HASH or genesis.transactions:
+            raise ValueError("O primeiro bloco deve ser o genesis")
+        chain = [self.chain[0]]
+        balances: dict[str, float] = defaultdict(float)
+        target_cache: dict[int, int] = {}
+        checkpoint = self.assume_valid
+        assumed_until = checkpoint.height if checkpoint is not None else 0
+        for block in iterator:
+            previous = chain[-1]
+            chain.append(block)
+            i = len(chain) - 1
+            if i <= assumed_until:
+                # Otimista: confirmado ao chegar ao bloco do checkpoint.
+                if (
+                    block.index != i
+                    or block.previous_hash != previous.hash
+                    or (check_hashes and block.hash != block.calculate_hash())
+                ):
+                    raise ValueError(f"Bloco {i} invalido: encadeamento")
+                self._apply_transactions(block, balances)
+                continue
+            error = self._chain_block_error(chain, i, balances, target_cache, check_hashes)
+            if error:
+                raise ValueError(f"Bloco {i} invalido: {error}")
+        if assumed_until:
+            if len(chain) > assumed_until and chain[assumed_until].hash == checkpoint.block_hash:
+                self._blocks_assumed.inc(assumed_until)
+            elif not self._is_valid_range(
+                chain[: assumed_until + 1], 1, defaultdict(float)
+            ):
+                raise ValueError("Cadeia sem o bloco do checkpoint e invalida")
+        self.chain = chain
+        self.reindex()
+        self.pending_transactions = [
+            tx for tx in self.pending_transactions if tx.id not in self._tx_index
+        ]
+        self._blocks_accepted.inc(len(chain) - 1)
+        if self.subscriptions:
+            self._publish_tip()
+        self._maybe_prune()
+        return len(chain) - 1
+
     def replace_chain(self, new_chain: list[Block]) -> bool:
-        # Consenso simples: cadeia mais longa e valida vence.
-        if len(new_chain) <= len(self.chain):
-            return False
-        if not self.is_valid_chain(new_chain):
+        # Consenso: vence a cadeia valida com mais trabalho acumulado (sem
+        # reajuste de dificuldade, a mais longa).
+        fork = 0
+        for old, new in zip(self.chain, new_chain):
+            if old.hash != new.hash:
+                break
+            fork += 1
+        if fork == len(new_chain) or self.work_after(new_chain, fork) <= self.chain_work:
             return False
-        self.chain = new_chain
+        if fork == 0:
+            if self.pruned_height or not self.is_valid_chain(new_chain):
+                return False
+        else:
+            # Prefixo comum ja validado: so o sufixo e conferido, a partir dos
+            # saldos locais no ponto de divergencia. Um fork abaixo da altura
+            # podada nao pode ser validado (os corpos nao existem mais).
+            if fork <= self.pruned_height:
+                return False
+            if not self._is_valid_range(new_chain, fork, self._balances_at(fork - 1)):
+                return False
+        # Desfaz no indice os blocos abandonados e indexa os novos.
+        disconnected = self.chain[fork:]
+        for block in reversed(disconnected):
+            self._unindex_block(block)
+        self.analytics.truncate(fork)
+        old_tip = self.chain[-1]
+        # O prefixo local e mantido (pode conter blocos podados).
+        self.chain = self.chain[:fork] + new_chain[fork:]
+        self._target_cache.clear()
+        for block in new_chain[fork:]:
+            self._index_block(block)
+        # Transacoes dos blocos abandonados voltam ao mempool (se ainda validas).
+        self._reconcile_mempool(disconnected, new_chain[fork:])
+        self._reorgs.inc()
+        if self.subscriptions:
+            if disconnected:
+                self.subscriptions.publish(
+                    "reorg",
+                    {
+                        "fork_height": fork - 1,
+                        "old_tip": old_tip.hash,
+                        "new_tip": new_chain[-1].hash,
+                        "height": len(new_chain) - 1,
+                        "disconnected": [block.hash for block in disconnected],
+                    },
+                )
+            for block in new_chain[fork:]:
+                self._publish_block(block)
+            self._publish_tip()
+        self._maybe_prune()
         return True
 
+    def work_after(self, chain: Sequence[Block], fork: int) -> int:
+        """Trabalho acumulado de `chain`, que repete a cadeia local ate `fork - 1`."""
+        work = self._chain_work[fork - 1] if fork else 0
+        cache: dict[int, int] = {}
+        for i in range(fork, len(chain)):
+            work += target_work(self.difficulty.target_for(chain, i, cache))
+        return work
+
+    def get_block(self, block_hash: str) -> Block | None:
+        """Bloco da cadeia atual com o hash dado (via indice)."""
+        height = self._hash_index.get(block_hash)
+        return None if height is None else self.chain[height]
+
+    def find_transaction(self, tx_id: str) -> tuple[Transaction, int | None] | None:
+        """(transacao, altura) de uma transacao confirmada ou (transacao, None) se pendente."""
+        entry = self._tx_index.get(tx_id)
+        if entry is not None and entry[0] > self.pruned_height:
+            height, position = entry
+            return self.chain[height].transactions[position], height
+        tx = self._pending_by_id.get(tx_id)
+        return None if tx is None else (tx, None)
+
+    ## arvore de Merkle e cabecalhos (clientes leves)
+    def _merkle_tree(self, block: Block) -> MerkleTree:
+        tree = self._merkle_trees.get(block.hash)
+        if tree is None:
+            tree = MerkleTree.from_transactions(block.transactions)
+            self._merkle_trees[block.hash] = tree
+            while len(self._merkle_trees) > MERKLE_TREE_CACHE:
+                self._merkle_trees.popitem(last=False)
+        else:
+            self._merkle_trees.move_to_end(block.hash)
+        return tree
+
+    def _merkle_root(self, height: int) -> str:
+        root = self._merkle_roots[height]
+        if root is None:
+            root = self._merkle_roots[height] = self._merkle_tree(self.chain[height]).root
+        return root
+
+    def header(self, height: int) -> BlockHeader:
+        block = self.chain[height]
+        return BlockHeader(
+            index=block.index,
+            previous_hash=block.previous_hash,
+            timestamp=block.timestamp,
+            nonce=block.nonce,
+            hash=block.hash,
+            merkle_root=self._merkle_root(height),
+            tx_count=self._pruned_tx_counts[height - 1]
+            if 0 < height <= self.pruned_height
+            else len(block.transactions),
+        )
+
+    def merkle_proof(self, tx_id: str) -> TxProof | None:
+        """Prova de inclusao de uma transacao confirmada (None se nao confirmada)."""
+        entry = self._tx_index.get(tx_id)
+        if entry is None or entry[0] <= self.pruned_height:
+            return None
+        height, position = entry
+        block = self.chain[height]
+        tree = self._merkle_tree(block)
+        return TxProof(
+            transaction=block.transactions[position],
+            height=height,
+            position=position,
+            block_hash=block.hash,
+            merkle_root=tree.root,
+            path=tree.proof(position),
+        )
+
+    def find_recent_block(self, block_hash: str, depth: int = 100) -> Block | None:
+        """Procura um bloco pelo hash entre os `depth` blocos mais recentes."""
+        for block in reversed(self.chain[-depth:]):
+            if block.hash == block_hash:
+                return block
+        return None
+
+    ## sincronizacao
+    def locator(self) -> list[list[Any]]:
+        """Pares [altura, hash] do topo ate o genesis, com passo crescente.
+
+        Permite que um peer encontre o ponto de divergencia entre as cadeias
+        sem transferir a cadeia inteira (mesma ideia do block locator do Bitcoin).
+        """
+        return build_locator(self.chain)
+
+    def find_fork_height(self, locator: list[list[Any]]) -> int:
+        """Maior altura do locator que tambem existe nesta cadeia (0 = genesis)."""
+        for entry in locator:
+            try:
+                height, block_hash = int(entry[0]), str(entry[1])
+            except (TypeError, ValueError, IndexError):
+                continue
+            if 0 <= height < len(self.chain) and self.chain[height].hash == block_hash:
+                return height
+        return 0
+
     def to_dict(self) -> dict[str, Any]:
-        return {
+        data = {
             "chain": [block.to_dict() for block in self.chain],
             "pending_transactions": [tx.to_dict() for tx in self.pending_transactions],
         }
+        if self.snapshot is not None:
+            # Dados dos blocos podados que nao podem ser recalculados.
+            data["pruned"] = {
+                "height": self.pruned_height,
+                "snapshot": self.snapshot.to_dict(),
+                "merkle_roots": self._merkle_roots[: self.pruned_height + 1],
+                "tx_counts": self._pruned_tx_counts,
+                "tx_ids": [
+                    tx_id
+                    for tx_id, (height, _) in self._tx_index.items()
+                    if height <= self.pruned_height
+                ],
+            }
+        return data
 
     @classmethod
-    def from_dict(cls, data: dict[str, Any]) -> "Blockchain":
-        instance = cls()
+    def from_dict(
+        cls, data: dict[str, Any], difficulty: Difficulty | None = None
+    ) -> "Blockchain":
+        instance = cls(difficulty)
         instance.chain = [Block.from_dict(b) for b in data["chain"]]
+        pruned = data.get("pruned")
+        if pruned:
+            instance.pruned_height = int(pruned["height"])
+            instance.snapshot = LedgerSnapshot.from_dict(pruned["snapshot"])
+            instance._merkle_roots = list(pruned["merkle_roots"])
+            instance._pruned_tx_counts = [int(n) for n in pruned["tx_counts"]]
+        instance.reindex()
+        if pruned:
+            for tx_id in pruned.get("tx_ids", []):
+                # Posicao desconhecida: so serve para recusar reenvios.
+                instance._tx_index.setdefault(tx_id, (0, -1))
         instance.pending_transactions = [
             Transaction.from_dict(tx) for tx in data["pending_transactions"]
         ]
@@ -0,0 +1,141 @@
+"""Dificuldade do Proof of Work representada como alvo numerico (target)."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Sequence
+
+if TYPE_CHECKING:
+    from .block import Block
+
+HASH_BITS = 256
+# Alvo maximo: qualquer hash de 256 bits e aceito.
+MAX_TARGET = 1 << HASH_BITS
+DEFAULT_PREFIX = "000"
+
+
+def prefix_to_target(prefix: str) -> int:
+    """Converte um prefixo de zeros hex no alvo equivalente.
+
+    `hash.startswith("0" * n)` equivale a `int(hash, 16) < 2 ** (256 - 4n)`,
+    entao o modo padrao "000" continua identico ao do padrao do trabalho.
+    """
+    if prefix.strip("0"):
+        raise ValueError("Prefixo de dificuldade deve conter apenas zeros")
+    if len(prefix) > HASH_BITS // 4:
+        raise ValueError("Prefixo de dificuldade maior que o hash")
+    return 1 << (HASH_BITS - 4 * len(prefix))
+
+
+def bits_to_target(bits: int) -> int:
+    """Alvo que exige `bits` bits iniciais zerados (passo de 2x, nao 16x)."""
+    if not 0 <= bits <= HASH_BITS:
+        raise ValueError("Bits de dificuldade devem estar entre 0 e 256")
+    return 1 << (HASH_BITS - bits)
+
+
+def target_work(target: int) -> int:
+    """Trabalho esperado (hashes) para achar um bloco abaixo do alvo."""
+    return (1 << HASH_BITS) // target
+
+
+def hash_meets_target(block_hash: str, target: int) -> bool:
+    """Mesma comparacao para o hash hex armazenado no bloco."""
+    if len(block_hash) != HASH_BITS // 4:
+        return False
+    try:
+        return int(block_hash, 16) < target
+    except ValueError:
+        return False
+
+
+@dataclass(frozen=True)
+class RetargetPolicy:
+    """Reajuste periodico do alvo a partir dos timestamps dos blocos."""
+
+    # Quantidade de blocos por janela de ajuste.
+    interval: int = 10
+    # Tempo desejado entre blocos, em segundos.
+    block_time: float = 10.0
+    # Limita o ajuste por janela (no maximo 4x mais facil ou mais dificil).
+    max_factor: float = 4.0
+
+    def __post_init__(self) -> None:
+        if self.interval < 2:
+            raise ValueError("Intervalo de reajuste deve ser >= 2")
+        if self.block_time <= 0 or self.max_factor < 1:
+            raise ValueError("Parametros de reajuste invalidos")
+
+
+@dataclass(frozen=True)
+class Difficulty:
+    """Configuracao de dificuldade de uma rede (alvo base + reajuste opcional)."""
+
+    target: int = field(default_factory=lambda: prefix_to_target(DEFAULT_PREFIX))
+    retarget: RetargetPolicy | None = None
+
+    def __post_init__(self) -> None:
+        if not 1 <= self.target <= MAX_TARGET:
+            raise ValueError("Alvo de dificuldade fora do intervalo")
+
+    @classmethod
+    def from_prefix(
+        cls, prefix: str, retarget: RetargetPolicy | None = None
+    ) -> "Difficulty":
+        return cls(target=prefix_to_target(prefix), retarget=retarget)
+
+    @classmethod
+    def from_bits(
+        cls, bits: int, retarget: RetargetPolicy | None = None
+    ) -> "Difficulty":
+        return cls(target=bits_to_target(bits), retarget=retarget)
+
+    def target_for(
+        self,
+        chain: Sequence["Block"],
+        index: int,
+        cache: dict[int, int] | None = None,
+    ) -> int:
+        """Alvo exigido para o bloco `index`, lendo apenas `chain[:index]`.
+
+        Com reajuste, o alvo de cada janela depende da anterior; `cache`
+        guarda o alvo por janela para evitar recalcular a cadeia toda.
+        """
+        policy = self.retarget
+        if policy is None or index < policy.interval:
+            return self.target
+
+        epoch = index // policy.interval
+        target = self.target
+        first_epoch = 1
+        if cache:
+            if epoch in cache:
+                return cache[epoch]
+            for known in range(epoch - 1, 0, -1):
+                if known in cache:
+                    target = cache[known]
+                    first_epoch = known + 1
+                    break
+
+        for current in range(first_epoch, epoch + 1):
+            target = self._retarget(chain, current, target)
+            if cache is not None:
+                cache[current] = target
+        return target
+
+    def _retarget(self, chain: Sequence["Block"], epoch: int, previous: int) -> int:
+        policy = self.retarget
+        assert policy is not None
+        # Ignora o genesis (timestamp 0) ao medir a primeira janela.
+        first = max(1, (epoch - 1) * policy.interval)
+        last = epoch * policy.interval - 1
+        if last <= first:
+            return previous
+
+        expected = (last - first) * policy.block_time
+        actual = chain[last].timestamp - chain[first].timestamp
+        actual = min(max(actual, expected / policy.max_factor), expected * policy.max_factor)
+
+        # Aritmetica inteira (em milissegundos) para manter o alvo exato.
+        adjusted = previous * int(actual * 1000) // int(expected * 1000)
+        return min(max(adjusted, 1), MAX_TARGET)
@@ -0,0 +1,208 @@
+"""Assinaturas de eventos da blockchain (topo, blocos, reorganizacoes, mempool).
+
+A `Blockchain` publica em um `EventHub` cada mudanca de estado; quem quer
+acompanhar a cadeia assina em vez de consultar o estado inteiro:
+
+    sub = node.subscribe(kinds=("block", "reorg"), addresses={"10.0.0.1:5000"})
+    for event in sub:              # bloqueante; ou `async for event in sub`
+        print(event.kind, event.data)
+
+    node.subscribe(callback)       # callback chamado em uma thread propria
+
+Sem assinantes, publicar custa apenas um teste. Cada assinatura tem uma
+fila limitada: um consumidor lento perde os eventos mais antigos (contados
+em `dropped`) e nunca atrasa o no.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator
+
+EVENT_KINDS = ("tip", "block", "reorg", "transaction")
+DEFAULT_MAX_PENDING = 1000
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ChainEvent:
+    """Evento publicado pela blockchain."""
+
+    kind: str
+    sequence: int
+    data: dict[str, Any]
+    # Enderecos envolvidos (blocos e transacoes); vazio para topo/reorg.
+    addresses: frozenset[str] = field(default_factory=frozenset)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"kind": self.kind, "sequence": self.sequence, **self.data}
+
+
+def _wake(waiter: "asyncio.Future[None]") -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class Subscription:
+    """Fila de eventos filtrada por tipo e por endereco."""
+
+    def __init__(
+        self,
+        hub: "EventHub",
+        kinds: Iterable[str] | None = None,
+        addresses: Iterable[str] | None = None,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ) -> None:
+        self.kinds = frozenset(kinds) if kinds else frozenset(EVENT_KINDS)
+        unknown = self.kinds.difference(EVENT_KINDS)
+        if unknown:
+            raise ValueError(f"Tipos de evento desconhecidos: {sorted(unknown)}")
+        # Filtro de enderecos: vale para blocos e transacoes; topo e reorg
+        # sempre passam (uma reorg pode desfazer confirmacoes de qualquer um).
+        self.addresses = frozenset(addresses) if addresses else None
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._hub = hub
+        self._events: deque[ChainEvent] = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._waiter: asyncio.Future[None] | None = None
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def matches(self, event: ChainEvent) -> bool:
+        if event.kind not in self.kinds:
+            return False
+        if self.addresses is None or event.kind in ("tip", "reorg"):
+            return True
+        return not self.addresses.isdisjoint(event.addresses)
+
+    def _push(self, event: ChainEvent) -> None:
+        with self._condition:
+            if self._closed:
+                return
+            if len(self._events) >= self.max_pending:
+                self._events.popleft()
+                self.dropped += 1
+            self._events.append(event)
+            self._condition.notify()
+            self._wake_async()
+
+    def _wake_async(self) -> None:
+        # Chamado com o lock: acorda um `async for` em outro loop/thread.
+        if self._waiter is not None and self._loop is not None:
+            try:
+                self._loop.call_soon_threadsafe(_wake, self._waiter)
+            except RuntimeError:  # loop ja encerrado
+                pass
+            self._waiter = None
+
+    def get(self, timeout: float | None = None) -> ChainEvent | None:
+        """Proximo evento; None se o tempo acabar ou a assinatura for encerrada."""
+        with self._condition:
+            if not self._events and not self._closed:
+                self._condition.wait(timeout)
+            if self._events:
+                return self._events.popleft()
+            return None
+
+    def close(self) -> None:
+        """Cancela a assinatura; iteradores terminam apos os eventos ja na fila."""
+        self._hub.unsubscribe(self)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            self._wake_async()
+
+    def __iter__(self) -> Iterator[ChainEvent]:
+        while True:
+            event = self.get()
+            if event is None:
+                if self._closed:
+                    return
+                continue
+            yield event
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> ChainEvent:
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                if self._events:
+                    return self._events.popleft()
+                if self._closed:
+                    raise StopAsyncIteration
+                self._loop = loop
+                self._waiter = waiter = loop.create_future()
+            await waiter
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class EventHub:
+    """Distribui os eventos da blockchain para as assinaturas ativas."""
+
+    def __init__(self) -> None:
+        # Tupla substituida a cada (des)assinatura: publicar nao precisa de lock.
+        self._subscriptions: tuple[Subscription, ...] = ()
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+
+    def __bool__(self) -> bool:
+        return bool(self._subscriptions)
+
+    def subscribe(
+        self,
+        callback: Callable[[ChainEvent], None] | None = None,
+        kinds: Iterable[str] | None = None,
+        addresses: Iterable[str] | None = None,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ) -> Subscription:
+        """Nova assinatura; com `callback`, os eventos sao entregues em uma thread propria."""
+        subscription = Subscription(self, kinds, addresses, max_pending)
+        with self._lock:
+            self._subscriptions = self._subscriptions + (subscription,)
+        if callback is not None:
+            threading.Thread(
+                target=self._dispatch, args=(subscription, callback), daemon=True
+            ).start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions = tuple(s for s in self._subscriptions if s is not subscription)
+
+    def publish(
+        self, kind: str, data: dict[str, Any], addresses: Iterable[str] = ()
+    ) -> ChainEvent | None:
+        subscriptions = self._subscriptions
+        if not subscriptions:
+            return None
+        event = ChainEvent(kind, next(self._sequence), data, frozenset(addresses))
+        for subscription in subscriptions:
+            if subscription.matches(event):
+                subscription._push(event)
+        return event
+
+    @staticmethod
+    def _dispatch(subscription: Subscription, callback: Callable[[ChainEvent], None]) -> None:
+        for event in subscription:
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("Erro no callback de assinatura (%s)", event.kind)
@@ -0,0 +1,125 @@
+"""Arvore de Merkle sobre as transacoes de um bloco e provas de inclusao.
+
+A arvore e uma estrutura lateral: `Block.calculate_hash` (padrao do
+trabalho) nao muda, e a raiz e calculada e indexada pela `Blockchain`. Uma
+prova de inclusao tem log2(n) hashes, entao um cliente leve confirma uma
+transacao com o cabecalho do bloco e algumas centenas de bytes, sem baixar
+o bloco.
+
+Folhas e nos internos usam prefixos diferentes (0x00 e 0x01), e um no sem
+par sobe sem ser duplicado: duas listas de transacoes diferentes nunca tem
+a mesma raiz.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+from .transaction import Transaction
+
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+# Raiz de um bloco sem transacoes (genesis).
+EMPTY_ROOT = hashlib.sha256(b"").hexdigest()
+
+
+def leaf_hash(transaction: Transaction) -> bytes:
+    encoded = json.dumps(transaction.to_dict(), sort_keys=True).encode()
+    return hashlib.sha256(LEAF_PREFIX + encoded).digest()
+
+
+def _node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+class MerkleTree:
+    """Niveis da arvore, das folhas (nivel 0) ate a raiz."""
+
+    def __init__(self, leaves: Sequence[bytes]) -> None:
+        self.levels: list[list[bytes]] = [list(leaves)]
+        level = self.levels[0]
+        while len(level) > 1:
+            parent = [_node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                parent.append(level[-1])
+            self.levels.append(parent)
+            level = parent
+
+    @classmethod
+    def from_transactions(cls, transactions: Sequence[Transaction]) -> "MerkleTree":
+        return cls([leaf_hash(tx) for tx in transactions])
+
+    @property
+    def root(self) -> str:
+        if not self.levels[0]:
+            return EMPTY_ROOT
+        return self.levels[-1][0].hex()
+
+    def proof(self, position: int) -> list[tuple[str, str]]:
+        """Irmaos da folha ate a raiz: (hash, lado do irmao "L" ou "R")."""
+        path: list[tuple[str, str]] = []
+        for level in self.levels[:-1]:
+            sibling = position ^ 1
+            if sibling < len(level):
+                path.append((level[sibling].hex(), "L" if sibling < position else "R"))
+            position //= 2
+        return path
+
+
+def merkle_root(transactions: Sequence[Transaction]) -> str:
+    return MerkleTree.from_transactions(transactions).root
+
+
+def verify_proof(leaf: bytes, path: Sequence[Sequence[str]], root: str) -> bool:
+    current = leaf
+    try:
+        for sibling_hex, side in path:
+            sibling = bytes.fromhex(sibling_hex)
+            if side == "L":
+                current = _node_hash(sibling, current)
+            elif side == "R":
+                current = _node_hash(current, sibling)
+            else:
+                return False
+    except (TypeError, ValueError):
+        return False
+    return current.hex() == root
+
+
+@dataclass
+class TxProof:
+    """Prova de que `transaction` esta no bloco `block_hash` (altura `height`)."""
+
+    transaction: Transaction
+    height: int
+    position: int
+    block_hash: str
+    merkle_root: str
+    path: list[tuple[str, str]]
+
+    def verify(self) -> bool:
+        return verify_proof(leaf_hash(self.transaction), self.path, self.merkle_root)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "transaction": self.transaction.to_dict(),
+            "height": self.height,
+            "position": self.position,
+            "block_hash": self.block_hash,
+            "merkle_root": self.merkle_root,
+            "path": [list(step) for step in self.path],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TxProof":
+        return cls(
+            transaction=Transaction.from_dict(data["transaction"]),
+            height=int(data["height"]),
+            position=int(data["position"]),
+            block_hash=str(data["block_hash"]),
+            merkle_root=str(data["merkle_root"]),
+            path=[(str(sibling), str(side)) for sibling, side in data["path"]],
+        )
@@ -2,20 +2,36 @@
 
 from __future__ import annotations
 
+import hashlib
 import time
 from typing import Callable
 
+from ..observability.metrics import MetricsRegistry
 from .block import Block
-from .blockchain import Blockchain, COINBASE_REWARD, COINBASE_SENDER, DIFFICULTY_PREFIX
+from .blockchain import Blockchain, COINBASE_REWARD, COINBASE_SENDER
 from .transaction import Transaction
 
 
 class Miner:
-    """Minerador que procura um nonce com hash iniciando em '000'."""
+    """Minerador que procura um nonce cujo hash fique abaixo do alvo (padrao '000')."""
 
-    def __init__(self, blockchain: Blockchain, miner_address: str) -> None:
+    def __init__(
+        self,
+        blockchain: Blockchain,
+        miner_address: str,
+        clock: Callable[[], float] = time.time,
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
         self.blockchain = blockchain
         self.miner_address = miner_address
+        # Relogio dos timestamps (a simulacao usa tempo virtual).
+        self.clock = clock
+        metrics = metrics or blockchain.metrics
+        self._hashes = metrics.counter("lsdchain_miner_hashes_total", "Hashes calculados")
+        self._mined = metrics.counter("lsdchain_miner_blocks_total", "Blocos minerados")
+        self._hashrate = metrics.gauge(
+            "lsdchain_miner_hashrate", "Hashes por segundo da ultima mineracao"
+        )
         self._mining = False
 
     def mine_block(
@@ -27,7 +43,7 @@ class Miner:
             transactions = list(self.blockchain.pending_transactions)
 
         # Coinbase: primeira transacao do bloco, cria novas moedas.
-        block_timestamp = time.time()
+        block_timestamp = self.clock()
         reward_tx = Transaction(
             origem=COINBASE_SENDER,
             destino=self.miner_address,
@@ -45,16 +61,45 @@ class Miner:
             timestamp=block_timestamp,
         )
 
+        target = self.blockchain.next_target()
+        # O JSON do bloco so muda no nonce: o SHA-256 do prefixo e calculado
+        # uma vez e copiado a cada tentativa; o digest bruto e comparado
+        # com o alvo sem passar por hexdigest.
+        prefix, suffix = block.hash_template()
+        base = hashlib.sha256(prefix)
+        nonce = 0
+        started = time.perf_counter()
+
         self._mining = True
         while self._mining:
-            block.hash = block.calculate_hash()
-            if block.is_valid_pow(DIFFICULTY_PREFIX):
+            attempt = base.copy()
+            attempt.update(b"%d" % nonce)
+            attempt.update(suffix)
+            digest = attempt.digest()
+            if int.from_bytes(digest, "big") < target:
                 self._mining = False
+                block.nonce = nonce
+                block.hash = digest.hex()
+                self._record(nonce + 1, started)
+                self._mined.inc()
                 return block
-            block.nonce += 1
-            if on_progress and block.nonce % 10000 == 0:
-                on_progress(block.nonce)
+            nonce += 1
+            if on_progress and nonce % 10000 == 0:
+                on_progress(nonce)
+        block.nonce = nonce
+        self._record(nonce, started)
         return None
 
+    def _record(self, hashes: int, started: float) -> None:
+        # Registrado uma vez por mineracao, fora do laco de nonces.
+        elapsed = time.perf_counter() - started
+        self._hashes.inc(hashes)
+        if elapsed > 0:
+            self._hashrate.set(hashes / elapsed)
+
     def stop(self) -> None:
         self._mining = False
+
+    @property
+    def mining(self) -> bool:
+        return self._mining
@@ -7,6 +7,9 @@ from typing import Any
 import time
 import uuid
 
+# Remetente das transacoes de recompensa (nao e um endereco de usuario).
+COINBASE_SENDER = "coinbase"
+
 
 @dataclass
 class Transaction:
@@ -1,16 +1,86 @@
-"""Interface grafica (Tkinter) para o no da blockchain."""
+"""Interface grafica (Tkinter) para o no da blockchain.
+
+A thread do Tk nunca chama operacoes do no que possam bloquear (rede,
+mineracao, lock da cadeia): elas entram em uma `TaskQueue` e o resultado
+volta para a interface pelo laco `_poll`, que tambem escreve o log e
+atualiza a barra de status. A mineracao tem fila (e thread) propria, para
+nao atrasar as operacoes curtas de rede e de cadeia.
+"""
 
 from __future__ import annotations
 
+import queue
 import threading
 import time
 import tkinter as tk
 from tkinter import ttk
+from typing import Any, Callable
 
+from ..core.events import ChainEvent, Subscription
 from ..core.transaction import Transaction
 from ..core.validation import is_host_port_address
 from ..network.node import Node
 
+# Intervalo do laco da interface (log e resultados) e da barra de status.
+POLL_MS = 100
+STATUS_INTERVAL = 1.0
+# Linhas mantidas no painel de log e linhas escritas por ciclo.
+MAX_LOG_LINES = 2000
+MAX_LOG_BATCH = 500
+# Transacoes pendentes listadas no log.
+MAX_PENDING_LINES = 50
+
+TaskCallback = Callable[[Any], None]
+ErrorCallback = Callable[[Exception], None]
+_Task = tuple[str, Callable[[], Any], "TaskCallback | None", "ErrorCallback | None"]
+_Result = tuple[str, "TaskCallback | None", "ErrorCallback | None", Any, "Exception | None"]
+
+
+class TaskQueue:
+    """Executa as operacoes do no em uma thread de trabalho, em ordem.
+
+    O resultado (ou a excecao) de cada tarefa vai para `results`, que a
+    interface esvazia na propria thread; filas diferentes podem compartilhar
+    o mesmo `results`.
+    """
+
+    def __init__(self, results: queue.Queue[_Result] | None = None) -> None:
+        self._tasks: queue.Queue[_Task | None] = queue.Queue()
+        self.results: queue.Queue[_Result] = results or queue.Queue()
+        # Tarefa em execucao (para a barra de status).
+        self.current: str | None = None
+        threading.Thread(target=self._run, daemon=True).start()
+
+    @property
+    def waiting(self) -> int:
+        return self._tasks.qsize()
+
+    def submit(
+        self,
+        label: str,
+        function: Callable[[], Any],
+        on_done: TaskCallback | None = None,
+        on_error: ErrorCallback | None = None,
+    ) -> None:
+        self._tasks.put((label, function, on_done, on_error))
+
+    def close(self) -> None:
+        self._tasks.put(None)
+
+    def _run(self) -> None:
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            label, function, on_done, on_error = task
+            self.current = label
+            try:
+                self.results.put((label, on_done, on_error, function(), None))
+            except Exception as exc:
+                self.results.put((label, on_done, on_error, None, exc))
+            finally:
+                self.current = None
+
 
 class BlockchainApp:
     """Aplicacao Tkinter para operar o no."""
@@ -19,6 +89,14 @@ class BlockchainApp:
         self.root = root
         self.root.title("Blockchain LSD 2025")
         self.node: Node | None = None
+        self._subscription: Subscription | None = None
+        self.tasks = TaskQueue()
+        # Mineracao (longa) em fila propria; resultados no mesmo laco.
+        self.mining_tasks = TaskQueue(self.tasks.results)
+        # Linhas de log vindas de qualquer thread; escritas por `_poll`.
+        self._log_queue: queue.Queue[str] = queue.Queue()
+        self._last_status = 0.0
+        self._chain_window: ChainWindow | None = None
 
         self.host_var = tk.StringVar(value="127.0.0.1")
         self.port_var = tk.StringVar(value="5000")
@@ -30,12 +108,15 @@ class BlockchainApp:
         self.balance_addr_var = tk.StringVar()
         self.peer_var = tk.StringVar()
 
+        self.status_var = tk.StringVar(value="No parado")
+
         self._build_layout()
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.root.after(POLL_MS, self._poll)
 
     def _build_layout(self) -> None:
         self.root.columnconfigure(0, weight=1)
-        self.root.rowconfigure(3, weight=1)
+        self.root.rowconfigure(5, weight=1)
 
         config_frame = ttk.LabelFrame(self.root, text="Configuracao do No")
         config_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=6)
@@ -145,6 +226,9 @@ class BlockchainApp:
         ttk.Button(balance_frame, text="Consultar", command=self._show_balance).grid(
             row=0, column=2, padx=4, pady=4
         )
+        ttk.Button(balance_frame, text="Historico", command=self._show_history).grid(
+            row=0, column=3, padx=4, pady=4
+        )
 
         log_frame = ttk.LabelFrame(self.root, text="Log")
         log_frame.grid(row=5, column=0, sticky="nsew", padx=10, pady=6)
@@ -157,6 +241,11 @@ class BlockchainApp:
         scrollbar.grid(row=0, column=1, sticky="ns")
         self.log_text.configure(yscrollcommand=scrollbar.set)
 
+        status_bar = ttk.Label(
+            self.root, textvariable=self.status_var, relief="sunken", anchor="w"
+        )
+        status_bar.grid(row=6, column=0, sticky="ew", padx=10, pady=(0, 6))
+
     def _set_actions_state(self, enabled: bool) -> None:
         state = "normal" if enabled else "disabled"
         self.mine_button.configure(state=state)
@@ -167,12 +256,72 @@ class BlockchainApp:
         self.connect_button.configure(state=state)
 
     def _log(self, message: str) -> None:
-        def append() -> None:
-            self.log_text.insert("end", message + "\n")
+        # Pode ser chamado de qualquer thread.
+        self._log_queue.put(message)
+
+    ## laco da interface
+    def _poll(self) -> None:
+        lines = []
+        while len(lines) < MAX_LOG_BATCH:
+            try:
+                lines.append(self._log_queue.get_nowait())
+            except queue.Empty:
+                break
+        if lines:
+            self.log_text.insert("end", "\n".join(lines) + "\n")
+            excess = int(self.log_text.index("end-1c").split(".")[0]) - MAX_LOG_LINES
+            if excess > 0:
+                self.log_text.delete("1.0", f"{excess + 1}.0")
             self.log_text.see("end")
 
-        self.root.after(0, append)
+        while True:
+            try:
+                label, on_done, on_error, result, error = self.tasks.results.get_nowait()
+            except queue.Empty:
+                break
+            if error is not None:
+                self._log(f"{label}: erro: {error}")
+                if on_error is not None:
+                    on_error(error)
+            elif on_done is not None:
+                on_done(result)
+
+        now = time.monotonic()
+        if now - self._last_status >= STATUS_INTERVAL:
+            self._last_status = now
+            self.status_var.set(self._status_text())
+        self.root.after(POLL_MS, self._poll)
+
+    def _status_text(self) -> str:
+        # Leituras baratas (sem lock): tamanho das listas e gauges.
+        task = self.tasks.current
+        waiting = self.tasks.waiting
+        busy = f"{task}..." if task else "Ocioso"
+        if waiting:
+            busy += f" (+{waiting} na fila)"
+        node = self.node
+        if node is None:
+            return f"No parado | {busy}"
+        blockchain = node.blockchain
+        hashrate = node.metrics.gauge("lsdchain_miner_hashrate").get()
+        mining = " (minerando)" if node.miner.mining else ""
+        return (
+            f"{node.address} | Altura {len(blockchain.chain) - 1} | "
+            f"Mempool {len(blockchain.pending_transactions)} | Peers {len(node.peers)} | "
+            f"Hashrate {_format_rate(hashrate)}{mining} | {busy}"
+        )
 
+    def _submit(
+        self,
+        label: str,
+        function: Callable[[], Any],
+        on_done: TaskCallback | None = None,
+        on_error: ErrorCallback | None = None,
+    ) -> None:
+        self.tasks.submit(label, function, on_done, on_error)
+        self.status_var.set(self._status_text())
+
+    ## acoes
     def _start_node(self) -> None:
         if self.node:
             self._log("No ja iniciado.")
@@ -183,29 +332,61 @@ class BlockchainApp:
         except ValueError:
             self._log("Porta invalida.")
             return
-
-        # Cria o no local e inicia o servidor TCP.
-        self.node = Node(host=host, port=port)
-        self.node.start()
-        self._log(f"No iniciado em {host}:{port}")
+        bootstrap = []
+        for peer in self._parse_peers(self.bootstrap_var.get().strip()):
+            if is_host_port_address(peer):
+                bootstrap.append(peer)
+            else:
+                self._log(f"Bootstrap invalido: {peer}")
         self.start_button.configure(state="disabled")
-        self._set_actions_state(True)
-
-        # Conecta em bootstrap(s) para descobrir/sincronizar a blockchain.
-        bootstrap_raw = self.bootstrap_var.get().strip()
-        if bootstrap_raw:
-            for peer in self._parse_peers(bootstrap_raw):
-                if not is_host_port_address(peer):
-                    self._log(f"Bootstrap invalido: {peer}")
-                    continue
-                if self.node.connect_to_peer(peer):
+
+        def start() -> Node:
+            # Cria o no local e inicia o servidor TCP.
+            node = Node(host=host, port=port)
+            node.start()
+            self._log(f"No iniciado em {host}:{port}")
+            # Conecta em bootstrap(s) para descobrir/sincronizar a blockchain.
+            for peer in bootstrap:
+                if node.connect_to_peer(peer, sync=False):
                     self._log(f"Conectado ao bootstrap {peer}")
+                else:
+                    self._log(f"Bootstrap indisponivel: {peer}")
+            # Se houver peers, pede a cadeia e sincroniza.
+            if node.peers:
+                self._log("Sincronizando blockchain...")
+                node.sync_blockchain()
+                self._log(f"Blockchain com {len(node.blockchain.chain)} blocos")
+            return node
+
+        def started(node: Node) -> None:
+            self.node = node
+            self._set_actions_state(True)
+            # Depois da sincronizacao inicial, o log recebe os eventos da cadeia
+            # (blocos da rede, reorganizacoes, transacoes novas) assim que ocorrem.
+            self._subscription = node.subscribe(
+                self._on_chain_event, kinds=("block", "reorg", "transaction")
+            )
 
-        # Se houver peers, pede a cadeia e sincroniza.
-        if self.node.peers:
-            self._log("Sincronizando blockchain...")
-            self.node.sync_blockchain()
-            self._log(f"Blockchain com {len(self.node.blockchain.chain)} blocos")
+        def failed(_error: Exception) -> None:
+            self.start_button.configure(state="normal")
+
+        self._submit("Iniciando no", start, started, failed)
+
+    def _on_chain_event(self, event: ChainEvent) -> None:
+        data = event.data
+        if event.kind == "block":
+            self._log(
+                f"Novo bloco #{data['index']} {data['hash'][:12]}... "
+                f"({len(data['transactions'])} transacoes)"
+            )
+        elif event.kind == "reorg":
+            self._log(
+                f"Reorganizacao: {len(data['disconnected'])} bloco(s) desfeito(s) "
+                f"apos a altura {data['fork_height']}; nova altura {data['height']}"
+            )
+        elif event.kind == "transaction":
+            tx = data["transaction"]
+            self._log(f"Transacao pendente {tx['id'][:8]} {tx['origem']} -> {tx['destino']}: {tx['valor']}")
 
     def _parse_peers(self, raw: str) -> list[str]:
         parts = [item.strip() for item in raw.replace(";", ",").split(",")]
@@ -235,11 +416,16 @@ class BlockchainApp:
             if saldo < valor:
                 self._log(f"Saldo insuficiente: {saldo} < {valor}")
                 return
-        # Adiciona no pool local e propaga para os peers.
-        if self.node.broadcast_transaction(tx):
-            self._log(f"Transacao enviada: {tx.id}")
-        else:
-            self._log("Transacao rejeitada (duplicada ou invalida).")
+        node = self.node
+
+        def sent(accepted: bool) -> None:
+            if accepted:
+                self._log(f"Transacao enviada: {tx.id}")
+            else:
+                self._log("Transacao rejeitada (duplicada ou invalida).")
+
+        # Adiciona no pool local e propaga para os peers (envio pela rede).
+        self._submit("Enviando transacao", lambda: node.broadcast_transaction(tx), sent)
 
     def _show_pending(self) -> None:
         if not self.node:
@@ -249,20 +435,25 @@ class BlockchainApp:
         if not pending:
             self._log("Nenhuma transacao pendente.")
             return
-        self._log("Transacoes pendentes:")
-        for tx in pending:
+        # Mempool grande: so as primeiras (a lista completa fica em /mempool).
+        shown = pending[:MAX_PENDING_LINES]
+        self._log(f"Transacoes pendentes ({len(pending)}):")
+        for tx in shown:
             self._log(f"- {tx.id[:8]} {tx.origem} -> {tx.destino}: {tx.valor}")
+        if len(pending) > len(shown):
+            self._log(f"... e mais {len(pending) - len(shown)}")
 
     def _mine_block(self) -> None:
         if not self.node:
             self._log("Inicie o no primeiro.")
             return
 
+        node = self.node
+
         def run_mine() -> None:
-            # Mineracao em thread separada para nao travar a GUI.
             self._log("Mineracao iniciada...")
             start = time.time()
-            block = self.node.mine()
+            block = node.mine()
             elapsed = time.time() - start
             if block:
                 self._log(
@@ -271,17 +462,18 @@ class BlockchainApp:
             else:
                 self._log("Mineracao interrompida.")
 
-        threading.Thread(target=run_mine, daemon=True).start()
+        self.mining_tasks.submit("Minerando", run_mine)
+        self.status_var.set(self._status_text())
 
     def _show_blockchain(self) -> None:
         if not self.node:
             self._log("Inicie o no primeiro.")
             return
-        self._log("Blockchain:")
-        for block in self.node.blockchain.chain:
-            self._log(
-                f"Bloco #{block.index} | hash {block.hash[:16]}... | txs {len(block.transactions)}"
-            )
+        # Uma janela so; a lista e paginada (cadeias longas nao travam a GUI).
+        if self._chain_window is not None and self._chain_window.window.winfo_exists():
+            self._chain_window.window.lift()
+            return
+        self._chain_window = ChainWindow(self.root, self.node)
 
     def _show_balance(self) -> None:
         if not self.node:
@@ -298,6 +490,16 @@ class BlockchainApp:
         balance = self.node.blockchain.get_balance(address)
         self._log(f"Saldo de {address}: {balance}")
 
+    def _show_history(self) -> None:
+        if not self.node:
+            self._log("Inicie o no primeiro.")
+            return
+        address = self.balance_addr_var.get().strip()
+        if not is_host_port_address(address):
+            self._log("Endereco invalido. Use o formato host:porta.")
+            return
+        HistoryWindow(self.root, self.node, address)
+
     def _show_peers(self) -> None:
         if not self.node:
             self._log("Inicie o no primeiro.")
@@ -306,8 +508,9 @@ class BlockchainApp:
             self._log("Nenhum peer conectado.")
             return
         self._log("Peers:")
-        for peer in sorted(self.node.peers):
-            self._log(f"- {peer}")
+        for info in sorted(self.node.peer_manager.snapshot(), key=lambda item: item.score):
+            rtt = f"{info.rtt * 1000:.1f} ms" if info.rtt is not None else "?"
+            self._log(f"- {info.address} (rtt {rtt}, falhas {info.failures})")
 
     def _connect_peer(self) -> None:
         if not self.node:
@@ -320,27 +523,224 @@ class BlockchainApp:
         if not is_host_port_address(peer):
             self._log("Endereco invalido. Use o formato host:porta.")
             return
-        # Conexao manual a um peer especifico.
-        if self.node.connect_to_peer(peer):
-            self._log(f"Conectado ao peer {peer}")
-        else:
-            self._log("Falha ao conectar ao peer.")
+        node = self.node
+
+        def connected(ok: bool) -> None:
+            self._log(f"Conectado ao peer {peer}" if ok else "Falha ao conectar ao peer.")
+
+        # Conexao manual a um peer especifico (inclui a sincronizacao).
+        self._submit(f"Conectando a {peer}", lambda: node.connect_to_peer(peer), connected)
 
     def _sync_chain(self) -> None:
         if not self.node:
             self._log("Inicie o no primeiro.")
             return
-        # Solicita a cadeia aos peers e substitui se houver uma maior.
-        self._log("Sincronizando blockchain...")
-        self.node.sync_blockchain()
-        self._log(f"Blockchain com {len(self.node.blockchain.chain)} blocos")
+        node = self.node
+
+        def sync() -> None:
+            # Solicita a cadeia aos peers e substitui se houver uma maior.
+            self._log("Sincronizando blockchain...")
+            node.sync_blockchain()
+            self._log(f"Blockchain com {len(node.blockchain.chain)} blocos")
+
+        self._submit("Sincronizando", sync)
 
     def _on_close(self) -> None:
+        # Tarefas em andamento nao seguram o fechamento (thread daemon).
+        self.tasks.close()
+        self.mining_tasks.close()
+        if self._subscription:
+            self._subscription.close()
         if self.node:
             self.node.stop()
         self.root.destroy()
 
 
+class HistoryWindow:
+    """Janela com o historico paginado de um endereco."""
+
+    PAGE_SIZE = 50
+
+    def __init__(self, master: tk.Misc, node: Node, address: str) -> None:
+        self.node = node
+        self.address = address
+        self.page = 0
+
+        self.window = tk.Toplevel(master)
+        self.window.title(f"Historico de {address}")
+        self.window.columnconfigure(0, weight=1)
+        self.window.rowconfigure(0, weight=1)
+
+        columns = ("altura", "origem", "destino", "valor", "id")
+        self.tree = ttk.Treeview(self.window, columns=columns, show="headings", height=20)
+        for column, width in zip(columns, (70, 180, 180, 90, 110)):
+            self.tree.heading(column, text=column.capitalize())
+            self.tree.column(column, width=width, anchor="w")
+        self.tree.grid(row=0, column=0, columnspan=3, sticky="nsew", padx=6, pady=6)
+
+        self.prev_button = ttk.Button(self.window, text="< Anterior", command=self._previous)
+        self.prev_button.grid(row=1, column=0, sticky="w", padx=6, pady=4)
+        self.status = ttk.Label(self.window, text="")
+        self.status.grid(row=1, column=1)
+        self.next_button = ttk.Button(self.window, text="Proxima >", command=self._next)
+        self.next_button.grid(row=1, column=2, sticky="e", padx=6, pady=4)
+        self._render()
+
+    def _render(self) -> None:
+        result = self.node.blockchain.get_history(self.address, self.page, self.PAGE_SIZE)
+        self.tree.delete(*self.tree.get_children())
+        for entry in result.entries:
+            tx = entry.transaction
+            signal = "-" if tx.origem == self.address else "+"
+            self.tree.insert(
+                "",
+                "end",
+                values=(entry.height, tx.origem, tx.destino, f"{signal}{tx.valor}", tx.id[:8]),
+            )
+        self.status.configure(
+            text=f"Pagina {self.page + 1}/{result.pages} ({result.total} transacoes)"
+        )
+        self.prev_button.configure(state="normal" if self.page > 0 else "disabled")
+        self.next_button.configure(
+            state="normal" if self.page + 1 < result.pages else "disabled"
+        )
+
+    def _previous(self) -> None:
+        self.page = max(0, self.page - 1)
+        self._render()
+
+    def _next(self) -> None:
+        self.page += 1
+        self._render()
+
+
+class ChainWindow:
+    """Janela com os blocos da cadeia, do topo para o genesis, por pagina.
+
+    So os blocos da pagina visivel viram linhas da lista; na primeira
+    pagina a lista acompanha o topo da cadeia.
+    """
+
+    PAGE_SIZE = 100
+    REFRESH_MS = 1000
+
+    def __init__(self, master: tk.Misc, node: Node) -> None:
+        self.node = node
+        self.page = 0
+        self._shown_tip: str | None = None
+
+        self.window = tk.Toplevel(master)
+        self.window.title(f"Blockchain de {node.address}")
+        self.window.columnconfigure(0, weight=1)
+        self.window.rowconfigure(0, weight=1)
+
+        columns = ("altura", "hash", "horario", "transacoes")
+        self.tree = ttk.Treeview(self.window, columns=columns, show="headings", height=20)
+        for column, width in zip(columns, (80, 180, 150, 90)):
+            self.tree.heading(column, text=column.capitalize())
+            self.tree.column(column, width=width, anchor="w")
+        self.tree.grid(row=0, column=0, sticky="nsew", padx=6, pady=6)
+
+        controls = ttk.Frame(self.window)
+        controls.grid(row=1, column=0, sticky="ew", padx=6, pady=4)
+        self.first_button = ttk.Button(controls, text="<< Topo", command=lambda: self._go(0))
+        self.first_button.grid(row=0, column=0)
+        self.prev_button = ttk.Button(
+            controls, text="< Mais novos", command=lambda: self._go(self.page - 1)
+        )
+        self.prev_button.grid(row=0, column=1, padx=4)
+        self.next_button = ttk.Button(
+            controls, text="Mais antigos >", command=lambda: self._go(self.page + 1)
+        )
+        self.next_button.grid(row=0, column=2, padx=4)
+        self.last_button = ttk.Button(
+            controls, text="Genesis >>", command=lambda: self._go(self._pages() - 1)
+        )
+        self.last_button.grid(row=0, column=3)
+        ttk.Label(controls, text="Altura").grid(row=0, column=4, padx=(12, 4))
+        self.height_var = tk.StringVar()
+        height_entry = ttk.Entry(controls, textvariable=self.height_var, width=10)
+        height_entry.grid(row=0, column=5)
+        height_entry.bind("<Return>", lambda _event: self._go_to_height())
+        ttk.Button(controls, text="Ir", command=self._go_to_height).grid(row=0, column=6, padx=4)
+        self.status = ttk.Label(controls, text="")
+        self.status.grid(row=0, column=7, padx=(12, 0))
+
+        self._render()
+        self.window.after(self.REFRESH_MS, self._refresh)
+
+    def _pages(self) -> int:
+        return max(1, -(-len(self.node.blockchain.chain) // self.PAGE_SIZE))
+
+    def _render(self) -> None:
+        blockchain = self.node.blockchain
+        # Copia da lista (a cadeia pode ser trocada durante a leitura).
+        chain = list(blockchain.chain)
+        pruned = blockchain.pruned_height
+        top = len(chain) - 1 - self.page * self.PAGE_SIZE
+        bottom = max(-1, top - self.PAGE_SIZE)
+        self.tree.delete(*self.tree.get_children())
+        for height in range(top, bottom, -1):
+            block = chain[height]
+            if 0 < height <= pruned:
+                transactions = "podado"
+            else:
+                transactions = len(block.transactions)
+            self.tree.insert(
+                "",
+                "end",
+                values=(
+                    height,
+                    block.hash[:16],
+                    time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(block.timestamp)),
+                    transactions,
+                ),
+            )
+        self._shown_tip = chain[-1].hash
+        pages = self._pages()
+        self.status.configure(text=f"Pagina {self.page + 1}/{pages} ({len(chain)} blocos)")
+        first = "normal" if self.page > 0 else "disabled"
+        last = "normal" if self.page + 1 < pages else "disabled"
+        self.first_button.configure(state=first)
+        self.prev_button.configure(state=first)
+        self.next_button.configure(state=last)
+        self.last_button.configure(state=last)
+
+    def _go(self, page: int) -> None:
+        self.page = min(max(0, page), self._pages() - 1)
+        self._render()
+
+    def _go_to_height(self) -> None:
+        try:
+            height = int(self.height_var.get().strip())
+        except ValueError:
+            return
+        tip = len(self.node.blockchain.chain) - 1
+        height = min(max(0, height), tip)
+        self._go((tip - height) // self.PAGE_SIZE)
+        for item in self.tree.get_children():
+            if self.tree.item(item, "values")[0] == str(height):
+                self.tree.selection_set(item)
+                self.tree.see(item)
+                break
+
+    def _refresh(self) -> None:
+        if not self.window.winfo_exists():
+            return
+        # Na primeira pagina a lista segue o topo; nas outras nao muda de lugar.
+        if self.page == 0 and self.node.blockchain.chain[-1].hash != self._shown_tip:
+            self._render()
+        self.window.after(self.REFRESH_MS, self._refresh)
+
+
+def _format_rate(hashes_per_second: float) -> str:
+    for unit in ("H/s", "kH/s", "MH/s"):
+        if hashes_per_second < 1000:
+            return f"{hashes_per_second:.0f} {unit}"
+        hashes_per_second /= 1000
+    return f"{hashes_per_second:.0f} GH/s"
+
+
 def run() -> None:
     root = tk.Tk()
     app = BlockchainApp(root)
@@ -0,0 +1,109 @@
+"""Compact blocks: cabecalho + IDs das transacoes que o peer ja tem no mempool."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Mapping
+
+from ..core.block import Block
+from ..core.transaction import Transaction
+
+
+@dataclass
+class CompactBlock:
+    """Bloco anunciado apenas com IDs; so a coinbase vai completa.
+
+    O receptor remonta o bloco a partir do proprio mempool e pede ao
+    remetente apenas as transacoes que faltarem (REQUEST_BLOCK_TXN).
+    """
+
+    index: int
+    previous_hash: str
+    nonce: int
+    timestamp: float
+    hash: str
+    tx_ids: list[str]
+    # Posicao no bloco -> transacao enviada completa (coinbase e afins).
+    prefilled: dict[int, Transaction] = field(default_factory=dict)
+
+    @classmethod
+    def from_block(cls, block: Block, prefill: Iterable[int] = (0,)) -> "CompactBlock":
+        prefilled = {
+            position: block.transactions[position]
+            for position in prefill
+            if 0 <= position < len(block.transactions)
+        }
+        return cls(
+            index=block.index,
+            previous_hash=block.previous_hash,
+            nonce=block.nonce,
+            timestamp=block.timestamp,
+            hash=block.hash,
+            tx_ids=[tx.id for tx in block.transactions],
+            prefilled=prefilled,
+        )
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "header": {
+                "index": self.index,
+                "previous_hash": self.previous_hash,
+                "nonce": self.nonce,
+                "timestamp": self.timestamp,
+                "hash": self.hash,
+            },
+            "tx_ids": self.tx_ids,
+            "prefilled": [
+                {"index": position, "transaction": tx.to_dict()}
+                for position, tx in sorted(self.prefilled.items())
+            ],
+        }
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> "CompactBlock":
+        header = payload["header"]
+        tx_ids = [str(tx_id) for tx_id in payload["tx_ids"]]
+        prefilled = {}
+        for entry in payload.get("prefilled", []):
+            position = int(entry["index"])
+            if not 0 <= position < len(tx_ids):
+                raise ValueError("Transacao pre-preenchida fora do bloco")
+            prefilled[position] = Transaction.from_dict(entry["transaction"])
+        return cls(
+            index=int(header["index"]),
+            previous_hash=str(header["previous_hash"]),
+            nonce=int(header["nonce"]),
+            timestamp=float(header["timestamp"]),
+            hash=str(header["hash"]),
+            tx_ids=tx_ids,
+            prefilled=prefilled,
+        )
+
+    def missing(self, known: Mapping[str, Transaction]) -> list[str]:
+        """IDs que nao estao nem pre-preenchidos nem em `known`."""
+        return [
+            tx_id
+            for position, tx_id in enumerate(self.tx_ids)
+            if position not in self.prefilled and tx_id not in known
+        ]
+
+    def reconstruct(self, known: Mapping[str, Transaction]) -> Block | None:
+        """Remonta o bloco; None se faltar alguma transacao.
+
+        O hash informado e mantido: a validacao normal do bloco confere que
+        ele bate com as transacoes remontadas.
+        """
+        transactions = []
+        for position, tx_id in enumerate(self.tx_ids):
+            tx = self.prefilled.get(position) or known.get(tx_id)
+            if tx is None or tx.id != tx_id:
+                return None
+            transactions.append(tx)
+        return Block(
+            index=self.index,
+            previous_hash=self.previous_hash,
+            transactions=transactions,
+            nonce=self.nonce,
+            timestamp=self.timestamp,
+            hash=self.hash,
+        )
@@ -0,0 +1,278 @@
+"""Cliente leve: confirma pagamentos com cabecalhos e provas de Merkle.
+
+Em vez de baixar a cadeia inteira (REQUEST_CHAIN), o cliente:
+
+1. Sincroniza apenas os cabecalhos (REQUEST_TIP + REQUEST_HEADERS), checando
+   encadeamento (`previous_hash`), timestamp e prova de trabalho de cada
+   hash, e fica com a cadeia de maior trabalho acumulado. O
+   cliente nao recalcula o hash (depende das transacoes): o PoW cobre so
+   o hash anunciado, nao os demais campos do cabecalho.
+2. Pede a prova de inclusao da transacao (REQUEST_TX_PROOF) e confere o
+   caminho de Merkle contra a raiz do cabecalho daquela altura.
+
+O hash do bloco segue o padrao e nao inclui a raiz de Merkle, entao a raiz
+de um cabecalho vale o quanto valem os peers que a informam:
+`verify_transaction(..., min_agreement=N)` exige que N peers distintos
+anunciem a mesma raiz para o mesmo bloco (padrao 2: um unico peer poderia
+inventar a raiz de um cabecalho real e "provar" qualquer transacao).
+
+Uso:
+    python -m lsdchain.network.light --peer 127.0.0.1:5000 --tx <id>
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Sequence
+
+from ..core.block import GENESIS_BLOCK, BlockHeader
+from ..core.blockchain import MEDIAN_TIME_SPAN, build_locator, timestamp_error
+from ..core.difficulty import Difficulty, target_work
+from ..core.merkle import EMPTY_ROOT, TxProof
+from .protocol import Message, MessageType, Protocol
+from .sync import MAX_HEADERS_PER_REQUEST, PeerTip
+from .transport import IO_TIMEOUT, TcpTransport, Transport
+
+# Peers distintos que devem anunciar a mesma raiz de Merkle para o bloco.
+DEFAULT_MIN_AGREEMENT = 2
+
+
+@dataclass
+class VerifiedPayment:
+    """Transacao confirmada por prova de Merkle contra a cadeia de cabecalhos."""
+
+    proof: TxProof
+    confirmations: int
+    # Peers que anunciaram o mesmo bloco e a mesma raiz de Merkle.
+    peers: list[str] = field(default_factory=list)
+
+
+def _genesis_header() -> BlockHeader:
+    return BlockHeader(
+        index=0,
+        previous_hash=GENESIS_BLOCK.previous_hash,
+        timestamp=GENESIS_BLOCK.timestamp,
+        nonce=GENESIS_BLOCK.nonce,
+        hash=GENESIS_BLOCK.hash,
+        merkle_root=EMPTY_ROOT,
+        tx_count=0,
+    )
+
+
+class LightClient:
+    """Mantem so a cadeia de cabecalhos e verifica provas de inclusao."""
+
+    def __init__(
+        self,
+        peers: list[str],
+        difficulty: Difficulty | None = None,
+        transport: Transport | None = None,
+        timeout: float = IO_TIMEOUT,
+    ) -> None:
+        self.peers = list(peers)
+        # Mesma dificuldade dos nos completos da rede.
+        self.difficulty = difficulty or Difficulty()
+        # So envia requisicoes (nao escuta): nenhuma porta e aberta.
+        self.transport = transport or TcpTransport("127.0.0.1", 0, send_workers=1)
+        self.timeout = timeout
+        self.headers: list[BlockHeader] = [_genesis_header()]
+        # Bytes recebidos (corpo JSON das respostas).
+        self.bytes_received = 0
+
+    @property
+    def height(self) -> int:
+        return len(self.headers) - 1
+
+    def _request(self, peer: str, message: Message, expected: MessageType) -> Message | None:
+        try:
+            response, _rtt = self.transport.request(peer, message, True, self.timeout)
+        except OSError:
+            return None
+        if response is None or response.type != expected:
+            return None
+        self.bytes_received += len(response.to_json())
+        return response
+
+    ## cabecalhos
+    def _best_tip(self) -> PeerTip | None:
+        locator = build_locator(self.headers)
+        best: PeerTip | None = None
+        for peer in self.peers:
+            response = self._request(peer, Protocol.request_tip(locator), MessageType.RESPONSE_TIP)
+            if response is None:
+                continue
+            try:
+                tip = PeerTip(
+                    peer,
+                    int(response.payload["height"]),
+                    str(response.payload["hash"]),
+                    int(response.payload.get("fork_height", 0)),
+                    work=int(str(response.payload.get("work", "0")), 16),
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+            if best is None or (tip.work, tip.height) > (best.work, best.height):
+                best = tip
+        return best
+
+    def sync_headers(self) -> int:
+        """Baixa os cabecalhos ate o maior topo anunciado; retorna a nova altura."""
+        tip = self._best_tip()
+        if tip is None:
+            return self.height
+        if (
+            tip.work <= self._work(self.headers, 0)
+            if tip.work
+            else tip.height <= self.height
+        ):
+            return self.height
+        # Reaproveita os cabecalhos ate o ponto de divergencia.
+        fork = min(tip.fork_height, self.height) + 1
+        candidate = self.headers[:fork]
+        cache: dict[int, int] = {}
+        while candidate[-1].index < tip.height:
+            start = candidate[-1].index + 1
+            end = min(tip.height, start + MAX_HEADERS_PER_REQUEST - 1)
+            response = self._request(
+                tip.peer, Protocol.request_headers(start, end), MessageType.RESPONSE_HEADERS
+            )
+            if response is None:
+                break
+            try:
+                headers = [BlockHeader.from_dict(h) for h in response.payload.get("headers", [])]
+            except (KeyError, TypeError, ValueError):
+                break
+            if not headers:
+                break
+            for header in headers:
+                if not self._is_valid_next(candidate, header, cache):
+                    break
+                candidate.append(header)
+            else:
+                continue
+            break
+        # Cadeia de cabecalhos valida de maior trabalho vence (mesmo consenso
+        # do no); o prefixo comum nao entra na comparacao.
+        if self._work(candidate, fork) > self._work(self.headers, fork):
+            self.headers = candidate
+        return self.height
+
+    def _work(self, chain: Sequence[BlockHeader], start: int) -> int:
+        cache: dict[int, int] = {}
+        return sum(
+            target_work(self.difficulty.target_for(chain, i, cache))
+            for i in range(start, len(chain))
+        )
+
+    def _is_valid_next(
+        self, chain: list[BlockHeader], header: BlockHeader, cache: dict[int, int]
+    ) -> bool:
+        previous = chain[-1]
+        return (
+            header.index == previous.index + 1
+            and header.previous_hash == previous.hash
+            and header.meets_target(self.difficulty.target_for(chain, header.index, cache))
+            and timestamp_error(chain[-MEDIAN_TIME_SPAN:], header, time.time()) is None
+        )
+
+    ## provas
+    def verify_transaction(
+        self, tx_id: str, min_agreement: int = DEFAULT_MIN_AGREEMENT
+    ) -> VerifiedPayment | None:
+        """Confirma `tx_id` com uma prova de Merkle; None se nenhum peer provar.
+
+        A raiz da prova precisa ser anunciada por `min_agreement` peers
+        distintos: o hash do bloco nao a inclui e o PoW conferido e o do hash
+        anunciado.
+        """
+        for peer in self.peers:
+            response = self._request(
+                peer, Protocol.request_tx_proof(tx_id), MessageType.RESPONSE_TX_PROOF
+            )
+            if response is None or not response.payload.get("proof"):
+                continue
+            try:
+                proof = TxProof.from_dict(response.payload["proof"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if proof.transaction.id != tx_id or not proof.verify():
+                continue
+            if proof.height > self.height:
+                self.sync_headers()
+            if proof.height > self.height:
+                continue
+            header = self.headers[proof.height]
+            if header.hash != proof.block_hash or header.merkle_root != proof.merkle_root:
+                continue
+            agreeing = self._agreeing_peers(header, min_agreement)
+            if len(agreeing) < min_agreement:
+                continue
+            return VerifiedPayment(proof, self.height - proof.height + 1, agreeing)
+        return None
+
+    def _agreeing_peers(self, header: BlockHeader, wanted: int) -> list[str]:
+        """Peers que anunciam o mesmo hash e a mesma raiz na altura do cabecalho."""
+        agreeing: list[str] = []
+        for peer in dict.fromkeys(self.peers):
+            if len(agreeing) >= wanted:
+                break
+            response = self._request(
+                peer,
+                Protocol.request_headers(header.index, header.index),
+                MessageType.RESPONSE_HEADERS,
+            )
+            headers = response.payload.get("headers", []) if response else []
+            if (
+                headers
+                and headers[0].get("hash") == header.hash
+                and headers[0].get("merkle_root") == header.merkle_root
+            ):
+                agreeing.append(peer)
+        return agreeing
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Cliente leve (cabecalhos + provas de Merkle)")
+    parser.add_argument("--peer", action="append", required=True, help="host:porta (repetivel)")
+    parser.add_argument("--tx", required=True, help="ID da transacao a confirmar")
+    parser.add_argument("--difficulty-bits", type=int, default=None)
+    parser.add_argument(
+        "--min-agreement",
+        type=int,
+        default=DEFAULT_MIN_AGREEMENT,
+        help="Peers distintos que devem anunciar a mesma raiz",
+    )
+    args = parser.parse_args()
+    if args.min_agreement < 1 or len(set(args.peer)) < args.min_agreement:
+        parser.error(f"--min-agreement {args.min_agreement} exige esse numero de --peer distintos")
+    return args
+
+
+def main() -> None:
+    args = _parse_args()
+    difficulty = (
+        Difficulty.from_bits(args.difficulty_bits) if args.difficulty_bits is not None else None
+    )
+    client = LightClient(args.peer, difficulty)
+    client.sync_headers()
+    payment = client.verify_transaction(args.tx, args.min_agreement)
+    result = {
+        "headers": client.height + 1,
+        "bytes_received": client.bytes_received,
+        "confirmed": payment is not None,
+    }
+    if payment is not None:
+        result.update(
+            height=payment.proof.height,
+            block_hash=payment.proof.block_hash,
+            confirmations=payment.confirmations,
+            peers=payment.peers,
+        )
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,39 @@
-"""No da rede P2P, comunicacao via sockets (TCP)."""
+"""No da rede P2P; comunicacao via transporte plugavel (TCP por padrao)."""
 
 from __future__ import annotations
 
 import logging
-import socket
 import threading
-from typing import Any
-
-from ..core.block import Block
-from ..core.blockchain import Blockchain
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable
+
+from ..core.block import Block, LazyBlock
+from ..core.blockchain import AssumeValid, Blockchain
+from ..core.difficulty import Difficulty
+from ..core.events import ChainEvent, Subscription
 from ..core.mining import Miner
 from ..core.transaction import Transaction
-from .protocol import Message, MessageType, Protocol
-
-
-LOGGER_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-
-
-def _read_exact(sock: socket.socket, size: int) -> bytes:
-    """Le exatamente `size` bytes do socket ou encerra se a conexao fechar."""
-    data = b""
-    # recv() pode retornar menos bytes do que o pedido, por isso acumulamos.
-    while len(data) < size:
-        # sock.recv(n) bloqueia ate receber dados ou a conexao fechar.
-        chunk = sock.recv(size - len(data))
-        # Se recv retornar vazio, a outra ponta encerrou a conexao.
-        if not chunk:
-            break
-        data += chunk
-    return data
+from ..core.validation import is_host_port_address
+from ..observability.logs import EventLogger, configure_logging
+from ..observability.metrics import MetricsRegistry, MetricsServer
+from .compact import CompactBlock
+from .peers import PeerManager
+from .protocol import STANDARD_TYPES, Message, MessageType, Protocol
+from .query import QueryServer
+from .ratelimit import InboundLimits
+from .reconcile import MempoolSync, Wanted, answer as answer_mempool_sketch
+from .sync import MAX_BLOCKS_PER_REQUEST, MAX_HEADERS_PER_REQUEST, InitialSync
+from .transport import CONNECT_TIMEOUT, IO_TIMEOUT, TcpTransport, Transport
+
+
+# Intervalo entre rodadas de PING aos peers.
+PING_INTERVAL = 15.0
+# Peers (de menor latencia) com quem o mempool e reconciliado apos sincronizar.
+MEMPOOL_SYNC_PEERS = 3
+# Threads para buscas disparadas por mensagens recebidas (transacoes de
+# compact blocks, bloco completo, catch-up): nao ocupam os workers de entrada.
+FETCH_WORKERS = 4
 
 
 class Node:
@@ -36,98 +41,207 @@ class Node:
 
     BUFFER_SIZE = 64 * 1024
 
-    def __init__(self, host: str, port: int) -> None:
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        difficulty: Difficulty | None = None,
+        max_peers: int = 32,
+        limits: InboundLimits | None = None,
+        compact_relay: bool = True,
+        transport: Transport | None = None,
+        prune: int | None = None,
+        assume_valid: AssumeValid | None = None,
+    ) -> None:
         """Inicializa o no com endereco local e estruturas internas."""
         self.host = host
         self.port = port
         self.address = f"{host}:{port}"
 
         # Cada no possui sua propria blockchain e minerador local.
-        self.blockchain = Blockchain()
+        # A dificuldade deve ser a mesma em todos os nos da rede.
+        # Metricas do no (blockchain e minerador registram no mesmo registro).
+        self.metrics = MetricsRegistry()
+        self.blockchain = Blockchain(
+            difficulty, metrics=self.metrics, assume_valid=assume_valid
+        )
         self.miner = Miner(self.blockchain, self.address)
-
-        # Lista de peers conhecidos e estado do servidor.
-        self.peers: set[str] = set()
-        self._server: socket.socket | None = None
-        self._running = False
-
-        # Logger para acompanhar eventos do no.
-        logging.basicConfig(level=logging.INFO, format=LOGGER_FORMAT)
+        # No podado: guarda so os `prune` corpos de bloco mais recentes.
+        if prune is not None:
+            self.blockchain.enable_pruning(prune)
+
+        # Blocos sao anunciados como compact blocks aos peers que entendem
+        # extensoes; os demais recebem NEW_BLOCK completo.
+        self.compact_relay = compact_relay
+
+        # Envio/recebimento de mensagens: TCP por padrao; a simulacao
+        # (network/simulation.py) injeta um transporte em memoria.
+        self.transport = transport or TcpTransport(host, port, limits)
+        # Peers conhecidos (com latencia/falhas), no relogio do transporte.
+        self.peer_manager = PeerManager(
+            self.address, max_peers=max_peers, clock=self.transport.clock
+        )
+        self._stop_event = threading.Event()
+        # Serializa alteracoes na blockchain (handlers e sincronizacao rodam
+        # em threads diferentes).
+        self._chain_lock = threading.RLock()
+        # Evita sincronizacoes simultaneas disparadas por blocos orfaos.
+        self._catch_up_lock = threading.Lock()
+        # IDs curtos pedidos a cada peer na reconciliacao de mempool: so
+        # eles sao aceitos em MEMPOOL_TXN.
+        self._mempool_wanted = Wanted(clock=self.transport.clock)
+        # Criado em `start` (transportes com threads); sem ele as buscas
+        # rodam na propria chamada (simulacao).
+        self._fetch_pool: ThreadPoolExecutor | None = None
+
+        self._metrics_server: MetricsServer | None = None
+        self._query_server: QueryServer | None = None
+        self._init_metrics()
+
+        # Logger para acompanhar eventos do no: a escrita acontece em uma
+        # thread de fundo (fila) e eventos frequentes sao amostrados.
+        configure_logging()
         self.logger = logging.getLogger(f"Node:{self.port}")
+        self.events = EventLogger(self.logger)
+
+    def _init_metrics(self) -> None:
+        metrics = self.metrics
+        received = metrics.counter(
+            "lsdchain_messages_received_total", "Mensagens processadas, por tipo", ("type",)
+        )
+        processing = metrics.histogram(
+            "lsdchain_message_processing_seconds",
+            "Tempo de tratamento das mensagens, por tipo",
+            ("type",),
+        )
+        sent = metrics.counter(
+            "lsdchain_messages_sent_total", "Mensagens enviadas, por tipo", ("type",)
+        )
+        latency = metrics.histogram(
+            "lsdchain_send_seconds",
+            "Duracao dos envios (com resposta, quando esperada), por tipo",
+            ("type",),
+        )
+        failures = metrics.counter(
+            "lsdchain_send_failures_total", "Envios com erro de conexao, por tipo", ("type",)
+        )
+        # Series resolvidas uma vez: no caminho quente so ha soma/observe.
+        self._received_metrics = {
+            kind: (received.labels(kind.value), processing.labels(kind.value))
+            for kind in MessageType
+        }
+        self._sent_metrics = {
+            kind: (sent.labels(kind.value), latency.labels(kind.value), failures.labels(kind.value))
+            for kind in MessageType
+        }
+        self._mempool_syncs = metrics.counter(
+            "lsdchain_mempool_sync_total",
+            "Rodadas de reconciliacao de mempool iniciadas, por resultado",
+            ("result",),
+        )
+        metrics.gauge("lsdchain_peers", "Peers conhecidos").set_function(
+            lambda: len(self.peer_manager)
+        )
+        metrics.gauge(
+            "lsdchain_inbound_dropped_messages", "Mensagens descartadas por backpressure"
+        ).set_function(lambda: self.dropped_messages)
+
+    def start_metrics_server(self, port: int, host: str = "127.0.0.1") -> MetricsServer:
+        """Expoe as metricas em http://host:port/metrics (formato Prometheus)."""
+        server = MetricsServer(self.metrics, host, port)
+        server.start()
+        self._metrics_server = server
+        self.events.info("metrics.listening", url=f"http://{host}:{server.port}/metrics")
+        return server
+
+    def start_query_server(self, port: int, host: str = "127.0.0.1") -> QueryServer:
+        """Consultas JSON somente leitura em http://host:port (ver network/query.py)."""
+        server = QueryServer(self, host, port)
+        server.start()
+        self._query_server = server
+        self.events.info("query.listening", url=f"http://{host}:{server.port}/")
+        return server
+
+    def subscribe(
+        self,
+        callback: Callable[[ChainEvent], None] | None = None,
+        kinds: Iterable[str] | None = None,
+        addresses: Iterable[str] | None = None,
+    ) -> Subscription:
+        """Assina eventos da cadeia: "tip", "block", "reorg" e "transaction".
+
+        Sem `callback`, itere sobre a assinatura (`for`/`async for`);
+        `close()` encerra. Ver core/events.py.
+        """
+        return self.blockchain.subscriptions.subscribe(callback, kinds, addresses)
+
+    @property
+    def peers(self) -> set[str]:
+        """Enderecos dos peers ativos."""
+        return set(self.peer_manager)
+
+    @property
+    def limits(self) -> InboundLimits | None:
+        """Limites de entrada do transporte TCP (None em outros transportes)."""
+        return getattr(self.transport, "limits", None)
+
+    @property
+    def dropped_messages(self) -> int:
+        """Mensagens descartadas pelo backpressure do transporte."""
+        return getattr(self.transport, "dropped_messages", 0)
 
     def start(self) -> None:
-        """Inicia o servidor TCP e a thread de aceitacao de conexoes."""
-        # socket(AF_INET, SOCK_STREAM) => TCP/IPv4.
-        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        # SO_REUSEADDR permite reutilizar a porta rapidamente apos fechar.
-        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        # bind() associa o socket ao endereco local (host:porta).
-        self._server.bind((self.host, self.port))
-        # listen() coloca o socket em modo servidor (fila/backlog = 20).
-        self._server.listen(20)
-        self._running = True
-        self.logger.info("No iniciado em %s", self.address)
-
-        # Thread separada para aceitar conexoes sem travar o processo.
-        thread = threading.Thread(target=self._accept_loop, daemon=True)
-        thread.start()
+        """Inicia o transporte (servidor TCP) e a thread de manutencao."""
+        self.transport.start(self)
+        self.events.info("node.started", address=self.address)
+        # Thread de manutencao: PING periodico para medir latencia e
+        # detectar peers mortos.
+        self._stop_event.clear()
+        if self.transport.threaded:
+            self._fetch_pool = ThreadPoolExecutor(
+                max_workers=FETCH_WORKERS, thread_name_prefix=f"fetch-{self.port}"
+            )
+            threading.Thread(target=self._maintenance_loop, daemon=True).start()
 
     def stop(self) -> None:
-        """Encerra o servidor TCP e interrompe a mineracao."""
-        # Encerra loop e mineracao; fecha o socket servidor.
-        self._running = False
+        """Encerra o transporte e interrompe a mineracao."""
+        self._stop_event.set()
         self.miner.stop()
-        if self._server:
-            self._server.close()
-        self.logger.info("No encerrado")
-
-    def _accept_loop(self) -> None:
-        """Loop interno que aceita conexoes de clientes."""
-        while self._running:
-            try:
-                # accept() bloqueia ate chegar uma conexao; retorna o socket do cliente.
-                client_socket, _ = self._server.accept()
-                # Trata cada cliente em thread separada para nao bloquear novas conexoes.
-                thread = threading.Thread(
-                    target=self._handle_client, args=(client_socket,), daemon=True
-                )
-                thread.start()
-            except Exception as exc:
-                if self._running:
-                    self.logger.error("Erro ao aceitar conexao: %s", exc)
+        self.transport.stop()
+        if self._fetch_pool:
+            self._fetch_pool.shutdown(wait=False, cancel_futures=True)
+            self._fetch_pool = None
+        if self._metrics_server:
+            self._metrics_server.stop()
+            self._metrics_server = None
+        if self._query_server:
+            self._query_server.stop()
+            self._query_server = None
+        self.events.info("node.stopped", address=self.address)
 
-    def _handle_client(self, client_socket: socket.socket) -> None:
-        """Processa uma conexao: le mensagem, trata e responde."""
+    def _process_message(self, message: Message) -> Message | None:
+        """Trata uma mensagem recebida, registrando contagem e duracao por tipo."""
+        received, processing = self._received_metrics[message.type]
+        received.inc()
+        started = time.perf_counter()
         try:
-            # Le o tamanho (4 bytes) e depois o JSON da mensagem.
-            length_raw = _read_exact(client_socket, 4)
-            if not length_raw:
-                return
-            length = int.from_bytes(length_raw, "big")
-            # sock.recv dentro de _read_exact garante leitura completa do corpo.
-            body = _read_exact(client_socket, length)
-            if not body:
-                return
-
-            # Processa a mensagem e gera resposta (quando necessario).
-            message = Message.from_bytes(body)
-            response = self._process_message(message)
-            if response:
-                response.sender = self.address
-                # sendall() envia todos os bytes da resposta.
-                client_socket.sendall(response.to_bytes())
-        except Exception as exc:
-            self.logger.error("Erro ao processar cliente: %s", exc)
+            return self._handle_message(message)
         finally:
-            # close() encerra a conexao com o cliente.
-            client_socket.close()
+            processing.observe(time.perf_counter() - started)
 
-    def _process_message(self, message: Message) -> Message | None:
+    def _handle_message(self, message: Message) -> Message | None:
         """Roteia o tratamento conforme o tipo de mensagem do protocolo."""
         # Centraliza o tratamento de mensagens do protocolo.
-        self.logger.info("Mensagem %s de %s", message.type.value, message.sender)
-        if message.sender and message.sender != self.address:
-            self.peers.add(message.sender)
+        self.events.info("message.received", type=message.type.value, sender=message.sender)
+        if (
+            message.sender
+            and message.sender != self.address
+            and is_host_port_address(message.sender)
+        ):
+            self.peer_manager.add(message.sender)
+            self.peer_manager.record_seen(message.sender)
+            if message.type not in STANDARD_TYPES:
+                self.peer_manager.mark_extended(message.sender)
 
         if message.type == MessageType.NEW_TRANSACTION:
             # Transacao recebida: valida, adiciona e propaga.
@@ -135,10 +249,12 @@ class Node:
             try:
                 transaction = Transaction.from_dict(tx_data)
             except Exception as exc:
-                self.logger.warning("Transacao invalida recebida: %s", exc)
+                self.events.warning("transaction.invalid", sender=message.sender, error=exc)
                 return None
-            if self.blockchain.add_transaction(transaction):
-                self.logger.info("Transacao adicionada: %s", transaction.id)
+            with self._chain_lock:
+                added = self.blockchain.add_transaction(transaction)
+            if added:
+                self.events.info("transaction.added", id=transaction.id)
                 # _broadcast cria threads para enviar aos peers.
                 self._broadcast(
                     Protocol.new_transaction(transaction.to_dict()),
@@ -146,129 +262,468 @@ class Node:
                 )
 
         elif message.type == MessageType.NEW_BLOCK:
-            # Bloco recebido: valida, adiciona e propaga.
+            # Bloco recebido: valida, adiciona e propaga. As transacoes so
+            # viram objetos se o cabecalho encaixar no topo (LazyBlock).
             block_data = message.payload.get("block", {})
             try:
-                block = Block.from_dict(block_data)
+                block = LazyBlock.from_dict(block_data)
             except Exception as exc:
-                self.logger.warning("Bloco invalido recebido: %s", exc)
+                self.events.warning("block.invalid", sender=message.sender, error=exc)
                 return None
-            if self.blockchain.add_block(block):
-                self.logger.info("Bloco #%s adicionado", block.index)
+            with self._chain_lock:
+                added = self.blockchain.add_block(block)
+            if added:
+                self.events.info("block.added", height=block.index, hash=block.hash)
                 self.miner.stop()
-                self._broadcast(
-                    Protocol.new_block(block.to_dict()),
-                    exclude=message.sender,
+                self._announce_block(block, exclude=message.sender)
+            elif block.index >= len(self.blockchain.chain):
+                # Bloco a frente que nao encaixa no topo: estamos atras ou
+                # em outro fork; baixa o que falta do remetente.
+                self._schedule_catch_up(message.sender)
+
+        elif message.type == MessageType.COMPACT_BLOCK:
+            # Bloco compacto: remonta a partir do mempool local.
+            self._handle_compact_block(message)
+
+        elif message.type == MessageType.REQUEST_BLOCK_TXN:
+            # Devolve as transacoes que o peer nao tinha para remontar o bloco.
+            block_hash = str(message.payload.get("hash", ""))
+            wanted = set(message.payload.get("ids", []))
+            block = self.blockchain.find_recent_block(block_hash)
+            if block is None:
+                return None
+            return Protocol.response_block_txn(
+                block_hash,
+                [tx.to_dict() for tx in block.transactions if tx.id in wanted],
+            )
+
+        elif message.type == MessageType.REQUEST_MEMPOOL_SKETCH:
+            # Diferenca entre o sketch do peer e o mempool local.
+            try:
+                result = answer_mempool_sketch(
+                    message.payload, list(self.blockchain.pending_transactions)
+                )
+            except (KeyError, TypeError, ValueError) as exc:
+                self.events.warning("mempool.sync_invalid", sender=message.sender, error=exc)
+                return None
+            if result["decoded"]:
+                self._mempool_wanted.record(
+                    message.sender, bytes.fromhex(message.payload["salt"]), result["want"]
+                )
+            return Protocol.response_mempool_sketch(result)
+
+        elif message.type == MessageType.MEMPOOL_TXN:
+            # Transacoes pedidas na reconciliacao: entram validadas, sem
+            # repropagar (cada peer reconcilia diretamente com os vizinhos).
+            # As que nao foram pedidas a este peer sao ignoradas.
+            try:
+                transactions = [
+                    Transaction.from_dict(tx)
+                    for tx in message.payload.get("transactions", [])
+                ]
+            except Exception as exc:
+                self.events.warning("transaction.invalid", sender=message.sender, error=exc)
+                return None
+            requested = self._mempool_wanted.take(message.sender, transactions)
+            if len(requested) < len(transactions):
+                self.events.warning(
+                    "mempool.unsolicited",
+                    sender=message.sender,
+                    count=len(transactions) - len(requested),
                 )
+            transactions = requested
+            if not transactions:
+                return None
+            with self._chain_lock:
+                self.blockchain.add_transactions(transactions)
 
         elif message.type == MessageType.REQUEST_CHAIN:
-            # Envia a cadeia completa para sincronizacao.
+            # Envia a cadeia completa para sincronizacao (um no podado nao a tem).
+            if self.blockchain.pruned_height:
+                return None
             return Protocol.response_chain(self.blockchain.to_dict())
 
         elif message.type == MessageType.RESPONSE_CHAIN:
-            # Recebe cadeia de outro no e troca se for maior e valida.
+            # Recebe cadeia de outro no e troca se for valida e tiver mais trabalho.
             chain_data = message.payload.get("blockchain", {})
-            new_chain = [Block.from_dict(b) for b in chain_data.get("chain", [])]
-            new_pending = [
-                Transaction.from_dict(tx)
-                for tx in chain_data.get("pending_transactions", [])
-            ]
-            if self.blockchain.replace_chain(new_chain):
-                self.blockchain.pending_transactions = new_pending
-                self.logger.info(
-                    "Blockchain atualizada (%s blocos)", len(self.blockchain.chain)
-                )
+            # Blocos do prefixo comum (e cadeias recusadas) nao materializam
+            # as transacoes.
+            try:
+                new_chain = [LazyBlock.from_dict(b) for b in chain_data.get("chain", [])]
+                new_pending = [
+                    Transaction.from_dict(tx)
+                    for tx in chain_data.get("pending_transactions", [])
+                ]
+            except Exception as exc:
+                self.events.warning("chain.invalid", sender=message.sender, error=exc)
+                return None
+            with self._chain_lock:
+                # A troca ja devolve ao mempool as transacoes dos blocos
+                # desfeitos; as pendentes do peer entram validadas, sem
+                # substituir as locais.
+                replaced = self.blockchain.replace_chain(new_chain)
+                if replaced:
+                    self.blockchain.add_transactions(new_pending)
+            if replaced:
+                self.events.info("chain.replaced", height=len(self.blockchain.chain) - 1)
+
+        elif message.type == MessageType.PING:
+            return Protocol.pong()
+
+        elif message.type == MessageType.REQUEST_TIP:
+            # Topo local + ponto de divergencia em relacao ao locator recebido.
+            chain = self.blockchain.chain
+            locator = message.payload.get("locator", [])
+            return Protocol.response_tip(
+                height=len(chain) - 1,
+                tip_hash=chain[-1].hash,
+                fork_height=self.blockchain.find_fork_height(locator),
+                pruned_height=self.blockchain.pruned_height,
+                work=self.blockchain.chain_work,
+            )
+
+        elif message.type == MessageType.REQUEST_BLOCKS:
+            # Envia um intervalo limitado de blocos para a sincronizacao paralela.
+            try:
+                start = max(0, int(message.payload.get("start", 0)))
+                end = int(message.payload.get("end", start))
+            except (TypeError, ValueError):
+                return None
+            end = min(end, start + MAX_BLOCKS_PER_REQUEST - 1)
+            if 0 < start <= self.blockchain.pruned_height:
+                # Corpos descartados: o cliente pede a outra fonte.
+                return Protocol.response_blocks([])
+            blocks = self.blockchain.chain[start : end + 1]
+            return Protocol.response_blocks([block.to_dict() for block in blocks])
+
+        elif message.type == MessageType.REQUEST_HEADERS:
+            # Cabecalhos com raiz de Merkle para clientes leves.
+            try:
+                start = max(0, int(message.payload.get("start", 0)))
+                end = int(message.payload.get("end", start))
+            except (TypeError, ValueError):
+                return None
+            with self._chain_lock:
+                end = min(end, start + MAX_HEADERS_PER_REQUEST - 1, len(self.blockchain.chain) - 1)
+                headers = [self.blockchain.header(h).to_dict() for h in range(start, end + 1)]
+            return Protocol.response_headers(headers)
+
+        elif message.type == MessageType.REQUEST_TX_PROOF:
+            with self._chain_lock:
+                proof = self.blockchain.merkle_proof(str(message.payload.get("id", "")))
+                header = self.blockchain.header(proof.height) if proof else None
+                height = len(self.blockchain.chain) - 1
+            return Protocol.response_tx_proof(
+                proof.to_dict() if proof else None,
+                header.to_dict() if header else None,
+                height,
+            )
 
         return None
 
     def _send_message(
-        self, peer: str, message: Message, expect_response: bool = False
+        self,
+        peer: str,
+        message: Message,
+        expect_response: bool = False,
+        timeout: float = IO_TIMEOUT,
     ) -> Message | None:
-        """Envia mensagem a um peer e (opcionalmente) aguarda resposta."""
+        """Envia mensagem a um peer e (opcionalmente) aguarda resposta.
+
+        O RTT medido pelo transporte alimenta o `PeerManager`; erros de
+        conexao (OSError) contam como falha e colocam o peer em backoff.
+        """
+        message.sender = self.address
+        sent, latency, failures = self._sent_metrics[message.type]
+        started = time.perf_counter()
         try:
-            host, port = peer.split(":")
-            # Cria socket cliente TCP e conecta no peer.
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                # settimeout() evita bloqueio infinito em rede.
-                sock.settimeout(10)
-                # connect() abre conexao TCP com o peer.
-                sock.connect((host, int(port)))
-                message.sender = self.address
-                # sendall() envia mensagem completa com framing.
-                sock.sendall(message.to_bytes())
-
-                if not expect_response:
-                    return None
-                # Se esperado, le a resposta com o mesmo framing.
-                length_raw = _read_exact(sock, 4)
-                if not length_raw:
-                    return None
-                length = int.from_bytes(length_raw, "big")
-                # recv() dentro de _read_exact le o corpo completo.
-                body = _read_exact(sock, length)
-                if not body:
-                    return None
-                return Message.from_bytes(body)
+            response, rtt = self.transport.request(
+                peer, message, expect_response, timeout
+            )
+        except OSError as exc:
+            failures.inc()
+            self.peer_manager.record_failure(peer)
+            self.events.error("send.failed", peer=peer, type=message.type.value, error=exc)
+            return None
         except Exception as exc:
-            self.logger.error("Erro ao enviar para %s: %s", peer, exc)
+            failures.inc()
+            self.events.error("send.failed", peer=peer, type=message.type.value, error=exc)
             return None
+        sent.inc()
+        latency.observe(time.perf_counter() - started)
+        self.peer_manager.record_success(peer, rtt)
+        if response is not None and response.type not in STANDARD_TYPES:
+            self.peer_manager.mark_extended(peer)
+        return response
 
     def _broadcast(self, message: Message, exclude: str | None = None) -> None:
         """Propaga uma mensagem para todos os peers conhecidos."""
-        # Envia para todos os peers conhecidos, exceto o remetente.
-        for peer in list(self.peers):
+        # Envia apenas para peers fora de backoff, exceto o remetente.
+        for peer in self.peer_manager.available():
             if exclude and peer == exclude:
                 continue
-            # Cada envio roda em thread para nao bloquear.
-            thread = threading.Thread(
-                target=self._send_message,
-                args=(peer, message, False),
-                daemon=True,
+            self._send_async(peer, message)
+
+    def _send_async(self, peer: str, message: Message) -> None:
+        # Envio pelo transporte sem bloquear o chamador.
+        self.transport.post(peer, message)
+
+    def _announce_block(self, block: Block, exclude: str | None = None) -> None:
+        """Propaga um bloco: compacto para peers com extensoes, completo para os demais."""
+        compact: Message | None = None
+        full: Message | None = None
+        for peer in self.peer_manager.available():
+            if exclude and peer == exclude:
+                continue
+            if self.compact_relay and self.peer_manager.supports_extensions(peer):
+                if compact is None:
+                    compact = Protocol.compact_block(
+                        CompactBlock.from_block(block).to_payload()
+                    )
+                self._send_async(peer, compact)
+            else:
+                if full is None:
+                    full = Protocol.new_block(block.to_dict())
+                self._send_async(peer, full)
+
+    def _handle_compact_block(self, message: Message) -> None:
+        """Remonta um COMPACT_BLOCK com o mempool e pede so o que faltar."""
+        try:
+            compact = CompactBlock.from_payload(message.payload)
+        except Exception as exc:
+            self.events.warning("block.invalid", sender=message.sender, error=exc, compact=True)
+            return
+
+        chain = self.blockchain.chain
+        if compact.index < len(chain):
+            return
+        if compact.index > len(chain) or compact.previous_hash != chain[-1].hash:
+            self._schedule_catch_up(message.sender)
+            return
+
+        known = {tx.id: tx for tx in self.blockchain.pending_transactions}
+        missing = compact.missing(known)
+        if not missing:
+            block = compact.reconstruct(known)
+            with self._chain_lock:
+                added = block is not None and self.blockchain.add_block(block)
+            if added:
+                self._compact_block_added(block, message.sender)
+                return
+            if block is not None and block.hash == block.calculate_hash():
+                # Remontado mas recusado pela validacao: nada a buscar.
+                return
+        if message.sender:
+            # Transacoes faltantes (ou o bloco completo) vem do remetente
+            # fora do worker de entrada.
+            self._run_fetch(self._complete_compact_block, compact, known, message.sender)
+
+    def _complete_compact_block(
+        self, compact: CompactBlock, known: dict[str, Transaction], peer: str
+    ) -> None:
+        """Busca no remetente o que faltou para remontar o bloco e o adiciona."""
+        missing = compact.missing(known)
+        block: Block | None = None
+        if missing:
+            response = self._send_message(
+                peer, Protocol.request_block_txn(compact.hash, missing), True
             )
-            thread.start()
+            if (
+                response
+                and response.type == MessageType.RESPONSE_BLOCK_TXN
+                and response.payload.get("hash") == compact.hash
+            ):
+                for tx_data in response.payload.get("transactions", []):
+                    try:
+                        tx = Transaction.from_dict(tx_data)
+                    except Exception:
+                        continue
+                    known[tx.id] = tx
+            block = compact.reconstruct(known)
+            with self._chain_lock:
+                added = block is not None and self.blockchain.add_block(block)
+            if added:
+                self._compact_block_added(block, peer)
+                return
+        if block is None or block.hash != block.calculate_hash():
+            # Remontagem falhou: pede o bloco completo ao remetente.
+            block = self._fetch_block(peer, compact.index)
+            with self._chain_lock:
+                added = block is not None and self.blockchain.add_block(block)
+            if added:
+                self._compact_block_added(block, peer)
+
+    def _compact_block_added(self, block: Block, sender: str) -> None:
+        self.events.info("block.added", height=block.index, hash=block.hash, compact=True)
+        self.miner.stop()
+        self._announce_block(block, exclude=sender)
+
+    def _run_fetch(self, function: Callable[..., object], *args: object) -> None:
+        """Executa uma busca na rede sem bloquear o worker que trata a mensagem."""
+        pool = self._fetch_pool
+        if pool is None:
+            function(*args)
+            return
+        try:
+            pool.submit(function, *args)
+        except RuntimeError:
+            # Pool encerrado (no parando).
+            pass
+
+    def _schedule_catch_up(self, peer: str) -> None:
+        # Com uma sincronizacao em andamento, `_catch_up` descartaria a chamada.
+        if not self._catch_up_lock.locked():
+            self._run_fetch(self._catch_up, peer)
+
+    def _catch_up(self, peer: str) -> None:
+        """Sincroniza a partir de `peer` ao receber um bloco que nao encaixa.
+
+        Se o topo mudar, anuncia o novo topo: vizinhos no fork antigo
+        tambem passam a sincronizar (convergencia apos forks).
+        """
+        if not peer or peer not in self.peer_manager:
+            return
+        if not self._catch_up_lock.acquire(blocking=False):
+            return
+        try:
+            previous_tip = self.blockchain.last_block.hash
+            if not InitialSync(self, [peer]).run():
+                # Peer so implementa o padrao: pede a cadeia completa.
+                response = self._send_message(peer, Protocol.request_chain(), True)
+                if response and response.type == MessageType.RESPONSE_CHAIN:
+                    self._process_message(response)
+            tip = self.blockchain.last_block
+            if tip.hash != previous_tip:
+                self.miner.stop()
+                self._announce_block(tip, exclude=peer)
+        finally:
+            self._catch_up_lock.release()
+
+    def _fetch_block(self, peer: str, index: int) -> Block | None:
+        if not peer:
+            return None
+        response = self._send_message(peer, Protocol.request_blocks(index, index), True)
+        if not response or response.type != MessageType.RESPONSE_BLOCKS:
+            return None
+        try:
+            blocks = [LazyBlock.from_dict(data) for data in response.payload["blocks"]]
+        except Exception:
+            return None
+        return blocks[0] if len(blocks) == 1 and blocks[0].index == index else None
 
-    def connect_to_peer(self, peer: str) -> bool:
-        """Conecta a um peer e sincroniza a blockchain a partir dele."""
+    def _maintenance_loop(self) -> None:
+        """PING periodico: mede RTT e detecta peers mortos (backoff/remocao)."""
+        while not self._stop_event.wait(PING_INTERVAL):
+            peers = self.peer_manager.available()
+            if not peers:
+                continue
+            with ThreadPoolExecutor(max_workers=min(len(peers), 16)) as pool:
+                for peer in peers:
+                    pool.submit(
+                        self._send_message, peer, Protocol.ping(), True, CONNECT_TIMEOUT
+                    )
+
+    def connect_to_peer(self, peer: str, sync: bool = True) -> bool:
+        """Conecta a um peer e (opcionalmente) sincroniza a blockchain a partir dele.
+
+        Com `sync=False` apenas registra o peer; usado no bootstrap, quando
+        `sync_blockchain` e chamado depois para baixar de todos em paralelo.
+        """
         if peer == self.address:
             return False
-        # Conecta e solicita a cadeia para sincronizar.
+        # Handshake barato: pergunta apenas o topo do peer.
+        response = self._send_message(
+            peer, Protocol.request_tip(self.blockchain.locator()), True
+        )
+        if response and response.type == MessageType.RESPONSE_TIP:
+            self.peer_manager.add(peer)
+            if sync:
+                InitialSync(self, [peer]).run()
+                self.reconcile_mempool(peer)
+            return True
+        # Peer que so implementa o padrao: solicita a cadeia completa.
         response = self._send_message(peer, Protocol.request_chain(), True)
         if response and response.type == MessageType.RESPONSE_CHAIN:
-            self.peers.add(peer)
+            self.peer_manager.add(peer)
             self._process_message(response)
             return True
         return False
 
     def sync_blockchain(self) -> None:
-        """Solicita a blockchain aos peers para sincronizar."""
-        # Pede cadeia a cada peer e aplica a maior valida.
-        for peer in list(self.peers):
+        """Sincroniza a blockchain com os peers conhecidos."""
+        # Download paralelo por faixas de altura a partir de varios peers.
+        if InitialSync(self).run():
+            # Mempool por sketch com os peers mais proximos que entendem extensoes.
+            peers = [
+                peer
+                for peer in self.peer_manager.ranked()
+                if self.peer_manager.supports_extensions(peer)
+            ]
+            for peer in peers[:MEMPOOL_SYNC_PEERS]:
+                self.reconcile_mempool(peer)
+            return
+        # Nenhum peer entende REQUEST_TIP: pede a cadeia a cada peer e
+        # aplica a maior valida (fluxo original do padrao).
+        for peer in self.peer_manager.ranked():
             response = self._send_message(peer, Protocol.request_chain(), True)
             if response and response.type == MessageType.RESPONSE_CHAIN:
                 self._process_message(response)
 
+    def reconcile_mempool(self, peer: str) -> int | None:
+        """Troca com `peer` so as transacoes pendentes que faltam a cada lado.
+
+        Retorna quantas transacoes entraram no mempool local (None se o peer
+        nao respondeu).
+        """
+        received = MempoolSync(self, peer).run()
+        if received:
+            self.events.info("mempool.synced", peer=peer, received=received)
+        return received
+
     def broadcast_transaction(self, transaction: Transaction) -> bool:
         """Adiciona transacao local e propaga para os peers."""
         # Adiciona no pool local e propaga.
-        if not self.blockchain.add_transaction(transaction):
+        with self._chain_lock:
+            added = self.blockchain.add_transaction(transaction)
+        if not added:
             return False
         self._broadcast(Protocol.new_transaction(transaction.to_dict()))
         return True
 
+    def broadcast_transactions(self, transactions: list[Transaction]) -> list[str | None]:
+        """Versao em lote de `broadcast_transaction`: um unico lock para o lote.
+
+        Retorna o motivo da recusa de cada transacao (None = aceita e propagada).
+        """
+        with self._chain_lock:
+            errors = self.blockchain.add_transactions(transactions)
+        # Peers saudaveis consultados uma vez por lote (como em `_broadcast`).
+        peers = self.peer_manager.available()
+        if not peers:
+            return errors
+        for transaction, error in zip(transactions, errors):
+            if error is None:
+                message = Protocol.new_transaction(transaction.to_dict())
+                for peer in peers:
+                    self._send_async(peer, message)
+        return errors
+
     def broadcast_block(self, block: Block) -> bool:
         """Adiciona bloco local e propaga para os peers."""
         # Adiciona o bloco localmente e propaga.
-        if not self.blockchain.add_block(block):
+        with self._chain_lock:
+            added = self.blockchain.add_block(block)
+        if not added:
             return False
-        self._broadcast(Protocol.new_block(block.to_dict()))
+        self._announce_block(block)
         return True
 
     def mine(self) -> Block | None:
         """Executa a mineracao e propaga o bloco se for valido."""
-        self.logger.info("Mineracao iniciada")
+        self.events.info("mining.started", height=len(self.blockchain.chain))
         # Minera um novo bloco com as pendentes atuais.
         block = self.miner.mine_block()
         if block:
-            self.logger.info("Bloco minerado #%s", block.index)
+            self.events.info("block.mined", height=block.index, hash=block.hash)
             self.broadcast_block(block)
         return block
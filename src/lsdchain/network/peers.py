@@ -0,0 +1,156 @@
+"""Gerenciamento de peers: latencia, falhas, backoff e remocao de peers mortos."""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Iterator
+
+# Peso da amostra mais recente na media movel do RTT.
+RTT_ALPHA = 0.3
+# RTT assumido para peers ainda nao medidos (ficam atras dos medidos).
+UNKNOWN_RTT = 1.0
+
+
+@dataclass
+class PeerInfo:
+    """Estado de saude de um peer."""
+
+    address: str
+    # Media movel exponencial do RTT (segundos); None ate a primeira medicao.
+    rtt: float | None = None
+    # Falhas consecutivas (zera a cada sucesso).
+    failures: int = 0
+    last_seen: float = 0.0
+    # Enquanto now < retry_at, o peer esta em backoff e nao recebe envios.
+    retry_at: float = 0.0
+    # Peer ja respondeu/enviou mensagens de extensao (alem do padrao).
+    extended: bool = False
+
+    def is_available(self, now: float) -> bool:
+        return now >= self.retry_at
+
+    @property
+    def score(self) -> float:
+        # Menor e melhor: latencia penalizada pelas falhas recentes.
+        rtt = UNKNOWN_RTT if self.rtt is None else self.rtt
+        return rtt * (1 + self.failures)
+
+
+class PeerManager:
+    """Conjunto limitado de peers com metricas de saude.
+
+    - `record_success`/`record_failure` sao chamados a cada envio.
+    - Falhas consecutivas colocam o peer em backoff exponencial; apos
+      `max_failures` o peer e removido.
+    - `ranked` ordena os peers disponiveis por latencia (usado na sincronizacao).
+    """
+
+    def __init__(
+        self,
+        self_address: str,
+        max_peers: int = 32,
+        max_failures: int = 5,
+        base_backoff: float = 2.0,
+        max_backoff: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.self_address = self_address
+        self.max_peers = max_peers
+        self.max_failures = max_failures
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._clock = clock
+        self._peers: dict[str, PeerInfo] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, address: object) -> bool:
+        return address in self._peers
+
+    def __len__(self) -> int:
+        return len(self._peers)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._peers))
+
+    def add(self, address: str) -> bool:
+        """Registra um peer; com o limite atingido, substitui o pior em backoff."""
+        if not address or address == self.self_address:
+            return False
+        with self._lock:
+            if address in self._peers:
+                return True
+            if len(self._peers) >= self.max_peers:
+                unhealthy = [info for info in self._peers.values() if info.failures]
+                if not unhealthy:
+                    return False
+                worst = max(unhealthy, key=lambda info: info.failures)
+                del self._peers[worst.address]
+            self._peers[address] = PeerInfo(address=address, last_seen=self._clock())
+            return True
+
+    def remove(self, address: str) -> None:
+        with self._lock:
+            self._peers.pop(address, None)
+
+    def record_seen(self, address: str) -> None:
+        """Atualiza o ultimo contato (mensagem recebida do peer)."""
+        info = self._peers.get(address)
+        if info:
+            info.last_seen = self._clock()
+
+    def mark_extended(self, address: str) -> None:
+        """Registra que o peer entende as mensagens de extensao."""
+        info = self._peers.get(address)
+        if info:
+            info.extended = True
+
+    def supports_extensions(self, address: str) -> bool:
+        info = self._peers.get(address)
+        return bool(info and info.extended)
+
+    def record_success(self, address: str, rtt: float | None = None) -> None:
+        with self._lock:
+            info = self._peers.get(address)
+            if not info:
+                return
+            info.failures = 0
+            info.retry_at = 0.0
+            info.last_seen = self._clock()
+            if rtt is not None:
+                if info.rtt is None:
+                    info.rtt = rtt
+                else:
+                    info.rtt = RTT_ALPHA * rtt + (1 - RTT_ALPHA) * info.rtt
+
+    def record_failure(self, address: str) -> None:
+        """Conta uma falha; aplica backoff exponencial ou remove o peer."""
+        with self._lock:
+            info = self._peers.get(address)
+            if not info:
+                return
+            info.failures += 1
+            if info.failures >= self.max_failures:
+                del self._peers[address]
+                return
+            delay = min(self.base_backoff * 2 ** (info.failures - 1), self.max_backoff)
+            info.retry_at = self._clock() + delay
+
+    def available(self) -> list[str]:
+        """Peers fora de backoff (alvos de broadcast)."""
+        now = self._clock()
+        return [info.address for info in list(self._peers.values()) if info.is_available(now)]
+
+    def ranked(self, limit: int | None = None) -> list[str]:
+        """Peers disponiveis do menor para o maior score (latencia)."""
+        now = self._clock()
+        infos = [info for info in list(self._peers.values()) if info.is_available(now)]
+        infos.sort(key=lambda info: info.score)
+        addresses = [info.address for info in infos]
+        return addresses if limit is None else addresses[:limit]
+
+    def snapshot(self) -> list[PeerInfo]:
+        """Copia do estado de todos os peers (para exibicao)."""
+        with self._lock:
+            return [replace(info) for info in self._peers.values()]
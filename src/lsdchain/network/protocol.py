@@ -18,6 +18,47 @@ class MessageType(str, Enum):
     REQUEST_CHAIN = "REQUEST_CHAIN"
     # Responde com a blockchain (cadeia + pendentes).
     RESPONSE_CHAIN = "RESPONSE_CHAIN"
+    # Extensoes para sincronizacao inicial paralela (fora do padrao).
+    # Pergunta o topo do peer enviando o locator da cadeia local.
+    REQUEST_TIP = "REQUEST_TIP"
+    # Responde com altura/hash do topo e o ponto de divergencia.
+    RESPONSE_TIP = "RESPONSE_TIP"
+    # Solicita um intervalo de blocos [start, end].
+    REQUEST_BLOCKS = "REQUEST_BLOCKS"
+    # Responde com os blocos do intervalo solicitado.
+    RESPONSE_BLOCKS = "RESPONSE_BLOCKS"
+    # Verificacao leve de atividade/latencia dos peers.
+    PING = "PING"
+    PONG = "PONG"
+    # Bloco compacto: cabecalho + IDs das transacoes (coinbase completa).
+    COMPACT_BLOCK = "COMPACT_BLOCK"
+    # Pede/entrega as transacoes que faltaram para remontar um bloco compacto.
+    REQUEST_BLOCK_TXN = "REQUEST_BLOCK_TXN"
+    RESPONSE_BLOCK_TXN = "RESPONSE_BLOCK_TXN"
+    # Cliente leve: cabecalhos (com raiz de Merkle) de um intervalo [start, end].
+    REQUEST_HEADERS = "REQUEST_HEADERS"
+    RESPONSE_HEADERS = "RESPONSE_HEADERS"
+    # Cliente leve: prova de inclusao de uma transacao pelo ID.
+    REQUEST_TX_PROOF = "REQUEST_TX_PROOF"
+    RESPONSE_TX_PROOF = "RESPONSE_TX_PROOF"
+    # Reconciliacao de mempool: sketch (ou lista) de IDs curtos das pendentes.
+    REQUEST_MEMPOOL_SKETCH = "REQUEST_MEMPOOL_SKETCH"
+    # Transacoes que faltam ao iniciador + IDs curtos que faltam ao peer.
+    RESPONSE_MEMPOOL_SKETCH = "RESPONSE_MEMPOOL_SKETCH"
+    # Entrega as transacoes pedidas na reconciliacao (sem resposta).
+    MEMPOOL_TXN = "MEMPOOL_TXN"
+
+
+# Tipos definidos no Padrao_blockchain.pdf; os demais sao extensoes deste
+# projeto e so sao enviados a peers que ja demonstraram entende-las.
+STANDARD_TYPES = frozenset(
+    {
+        MessageType.NEW_TRANSACTION,
+        MessageType.NEW_BLOCK,
+        MessageType.REQUEST_CHAIN,
+        MessageType.RESPONSE_CHAIN,
+    }
+)
 
 
 @dataclass
@@ -90,3 +131,141 @@ class Protocol:
             type=MessageType.RESPONSE_CHAIN,
             payload={"blockchain": blockchain_dict},
         )
+
+    @staticmethod
+    def request_tip(locator: list[list[Any]]) -> Message:
+        """Cria mensagem REQUEST_TIP com o locator da cadeia local."""
+        return Message(
+            type=MessageType.REQUEST_TIP,
+            payload={"locator": locator},
+        )
+
+    @staticmethod
+    def response_tip(
+        height: int, tip_hash: str, fork_height: int, pruned_height: int = 0, work: int = 0
+    ) -> Message:
+        """Cria mensagem RESPONSE_TIP.
+
+        `pruned_height`: corpos ate ali descartados; `work`: trabalho
+        acumulado da cadeia (em hex, cabe em qualquer parser JSON).
+        """
+        return Message(
+            type=MessageType.RESPONSE_TIP,
+            payload={
+                "height": height,
+                "hash": tip_hash,
+                "fork_height": fork_height,
+                "pruned_height": pruned_height,
+                "work": format(work, "x"),
+            },
+        )
+
+    @staticmethod
+    def request_blocks(start: int, end: int) -> Message:
+        """Cria mensagem REQUEST_BLOCKS para o intervalo [start, end]."""
+        return Message(
+            type=MessageType.REQUEST_BLOCKS,
+            payload={"start": start, "end": end},
+        )
+
+    @staticmethod
+    def response_blocks(blocks: list[dict[str, Any]]) -> Message:
+        """Cria mensagem RESPONSE_BLOCKS."""
+        return Message(
+            type=MessageType.RESPONSE_BLOCKS,
+            payload={"blocks": blocks},
+        )
+
+    @staticmethod
+    def ping() -> Message:
+        """Cria mensagem PING."""
+        return Message(type=MessageType.PING, payload={})
+
+    @staticmethod
+    def pong() -> Message:
+        """Cria mensagem PONG."""
+        return Message(type=MessageType.PONG, payload={})
+
+    @staticmethod
+    def compact_block(compact_payload: dict[str, Any]) -> Message:
+        """Cria mensagem COMPACT_BLOCK."""
+        return Message(type=MessageType.COMPACT_BLOCK, payload=compact_payload)
+
+    @staticmethod
+    def request_block_txn(block_hash: str, tx_ids: list[str]) -> Message:
+        """Cria mensagem REQUEST_BLOCK_TXN."""
+        return Message(
+            type=MessageType.REQUEST_BLOCK_TXN,
+            payload={"hash": block_hash, "ids": tx_ids},
+        )
+
+    @staticmethod
+    def response_block_txn(
+        block_hash: str, transactions: list[dict[str, Any]]
+    ) -> Message:
+        """Cria mensagem RESPONSE_BLOCK_TXN."""
+        return Message(
+            type=MessageType.RESPONSE_BLOCK_TXN,
+            payload={"hash": block_hash, "transactions": transactions},
+        )
+
+    @staticmethod
+    def request_headers(start: int, end: int) -> Message:
+        """Cria mensagem REQUEST_HEADERS para o intervalo [start, end]."""
+        return Message(
+            type=MessageType.REQUEST_HEADERS,
+            payload={"start": start, "end": end},
+        )
+
+    @staticmethod
+    def response_headers(headers: list[dict[str, Any]]) -> Message:
+        """Cria mensagem RESPONSE_HEADERS."""
+        return Message(
+            type=MessageType.RESPONSE_HEADERS,
+            payload={"headers": headers},
+        )
+
+    @staticmethod
+    def request_tx_proof(tx_id: str) -> Message:
+        """Cria mensagem REQUEST_TX_PROOF."""
+        return Message(
+            type=MessageType.REQUEST_TX_PROOF,
+            payload={"id": tx_id},
+        )
+
+    @staticmethod
+    def response_tx_proof(
+        proof: dict[str, Any] | None, header: dict[str, Any] | None, height: int
+    ) -> Message:
+        """Cria mensagem RESPONSE_TX_PROOF (proof/header nulos se nao confirmada)."""
+        return Message(
+            type=MessageType.RESPONSE_TX_PROOF,
+            payload={"proof": proof, "header": header, "height": height},
+        )
+
+    @staticmethod
+    def request_mempool_sketch(
+        salt: str,
+        sketch: dict[str, Any] | None = None,
+        ids: list[int] | None = None,
+    ) -> Message:
+        """Cria mensagem REQUEST_MEMPOOL_SKETCH (com `sketch` ou com a lista `ids`)."""
+        payload: dict[str, Any] = {"salt": salt}
+        if sketch is not None:
+            payload["sketch"] = sketch
+        else:
+            payload["ids"] = ids or []
+        return Message(type=MessageType.REQUEST_MEMPOOL_SKETCH, payload=payload)
+
+    @staticmethod
+    def response_mempool_sketch(result: dict[str, Any]) -> Message:
+        """Cria mensagem RESPONSE_MEMPOOL_SKETCH."""
+        return Message(type=MessageType.RESPONSE_MEMPOOL_SKETCH, payload=result)
+
+    @staticmethod
+    def mempool_txn(transactions: list[dict[str, Any]]) -> Message:
+        """Cria mensagem MEMPOOL_TXN."""
+        return Message(
+            type=MessageType.MEMPOOL_TXN,
+            payload={"transactions": transactions},
+        )
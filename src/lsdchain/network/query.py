@@ -0,0 +1,317 @@
+"""Servidor HTTP local, somente leitura, para consultas de carteiras e exploradores.
+
+Rotas (GET, respostas JSON):
+    /tip                          altura, hash do topo e tamanho do mempool
+    /balance/<endereco>           saldo (confirmado + pendentes)
+    /block/<altura ou hash>       bloco da cadeia atual
+    /tx/<id>                      transacao confirmada ou pendente
+    /proof/<id>                   prova de Merkle + cabecalho (transacao confirmada)
+    /mempool?page=0&page_size=50  pagina das transacoes pendentes
+    /events?kinds=block,tip&address=<endereco>
+                                  eventos em tempo real (Server-Sent Events)
+
+Cada resposta depende do hash do topo, da versao do mempool ou de ambos.
+Essas versoes formam o ETag: uma requisicao com `If-None-Match` igual
+recebe 304 sem que nada seja calculado, e respostas ja calculadas ficam em
+cache (LRU) ate a versao mudar. Clientes que fazem polling custam quase
+nada enquanto a cadeia e o mempool nao mudam. Quem precisa acompanhar a
+cadeia sem polling usa `/events` (assinatura de core/events.py).
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, Callable
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from ..core.events import Subscription
+
+if TYPE_CHECKING:
+    from .node import Node
+
+DEFAULT_CACHE_SIZE = 1024
+MAX_PAGE_SIZE = 500
+# Comentario enviado em conexoes de eventos ociosas (mantem proxies abertos).
+KEEPALIVE_INTERVAL = 15.0
+
+# Do que cada rota depende: "chain" (hash do topo), "mempool" ou ambos.
+_CHAIN = "chain"
+_MEMPOOL = "mempool"
+_BOTH = "both"
+
+
+class QueryError(Exception):
+    """Erro da consulta, com o status HTTP correspondente."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class QueryServer:
+    """Responde consultas JSON sobre a blockchain de um `Node`."""
+
+    def __init__(
+        self,
+        node: "Node",
+        host: str = "127.0.0.1",
+        port: int = 8545,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        self.node = node
+        self.host = host
+        self.port = port
+        self.cache_size = cache_size
+        # caminho -> (etag, corpo)
+        self._cache: OrderedDict[str, tuple[str, bytes]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Distingue execucoes do processo (a versao do mempool recomeca do zero).
+        self._epoch = uuid.uuid4().hex[:8]
+        self._routes: dict[str, tuple[str, Callable[[str, dict[str, list[str]]], Any]]] = {
+            "tip": (_BOTH, self._tip),
+            "balance": (_BOTH, self._balance),
+            "block": (_CHAIN, self._block),
+            "tx": (_BOTH, self._transaction),
+            "proof": (_CHAIN, self._proof),
+            "mempool": (_MEMPOOL, self._mempool),
+        }
+        self._server: ThreadingHTTPServer | None = None
+        self._streams: set[Subscription] = set()
+
+        self._requests = node.metrics.counter(
+            "lsdchain_query_requests_total", "Consultas HTTP, por rota e status", ("route", "status")
+        )
+        results = node.metrics.counter(
+            "lsdchain_query_cache_total",
+            "Consultas respondidas por 304, pelo cache ou calculadas",
+            ("result",),
+        )
+        self._not_modified = results.labels("not_modified")
+        self._hits = results.labels("hit")
+        self._misses = results.labels("miss")
+
+    ## versoes e ETag
+    def _etag(self, scope: str) -> str:
+        blockchain = self.node.blockchain
+        parts = [self._epoch]
+        if scope in (_CHAIN, _BOTH):
+            parts.append(blockchain.chain[-1].hash[:16])
+        if scope in (_MEMPOOL, _BOTH):
+            parts.append(str(blockchain.mempool_version))
+        return '"' + "-".join(parts) + '"'
+
+    def handle(self, target: str, if_none_match: str | None = None) -> tuple[int, str | None, bytes]:
+        """Trata `GET target`; retorna (status, etag, corpo)."""
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip("/").split("/", 1)]
+        route = self._routes.get(parts[0])
+        if route is None:
+            return self._error("unknown", 404, "Rota desconhecida")
+        scope, handler = route
+        name = parts[0]
+        argument = parts[1] if len(parts) > 1 else ""
+        key = f"{url.path}?{url.query}"
+
+        etag = self._etag(scope)
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            self._not_modified.inc()
+            self._requests.labels(name, 304).inc()
+            return 304, etag, b""
+
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == etag:
+                self._cache.move_to_end(key)
+                self._hits.inc()
+                self._requests.labels(name, 200).inc()
+                return 200, etag, cached[1]
+
+        self._misses.inc()
+        # Versao e corpo lidos juntos: o ETag sempre descreve o corpo.
+        with self.node._chain_lock:
+            etag = self._etag(scope)
+            try:
+                payload = handler(argument, parse_qs(url.query))
+            except QueryError as exc:
+                return self._error(name, exc.status, str(exc))
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        with self._cache_lock:
+            self._cache[key] = (etag, body)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        self._requests.labels(name, 200).inc()
+        return 200, etag, body
+
+    def _error(self, route: str, status: int, message: str) -> tuple[int, None, bytes]:
+        self._requests.labels(route, status).inc()
+        return status, None, json.dumps({"error": message}).encode("utf-8")
+
+    ## rotas
+    def _tip(self, _argument: str, _query: dict[str, list[str]]) -> dict[str, Any]:
+        blockchain = self.node.blockchain
+        tip = blockchain.chain[-1]
+        return {
+            "height": tip.index,
+            "hash": tip.hash,
+            "timestamp": tip.timestamp,
+            "mempool_size": len(blockchain.pending_transactions),
+            "mempool_version": blockchain.mempool_version,
+        }
+
+    def _balance(self, address: str, _query: dict[str, list[str]]) -> dict[str, Any]:
+        if not address:
+            raise QueryError(400, "Informe o endereco: /balance/<endereco>")
+        blockchain = self.node.blockchain
+        return {
+            "address": address,
+            "balance": blockchain.get_balance(address),
+            "height": len(blockchain.chain) - 1,
+        }
+
+    def _block(self, key: str, _query: dict[str, list[str]]) -> dict[str, Any]:
+        blockchain = self.node.blockchain
+        if key.isascii() and key.isdigit():
+            height = int(key)
+            block = blockchain.chain[height] if height < len(blockchain.chain) else None
+        else:
+            block = blockchain.get_block(key)
+        if block is None:
+            raise QueryError(404, "Bloco nao encontrado")
+        if 0 < block.index <= blockchain.pruned_height:
+            # Corpo descartado pela poda: so o cabecalho.
+            return {**blockchain.header(block.index).to_dict(), "pruned": True}
+        return block.to_dict()
+
+    def _transaction(self, tx_id: str, _query: dict[str, list[str]]) -> dict[str, Any]:
+        found = self.node.blockchain.find_transaction(tx_id)
+        if found is None:
+            raise QueryError(404, "Transacao nao encontrada")
+        tx, height = found
+        return {
+            "transaction": tx.to_dict(),
+            "confirmed": height is not None,
+            "height": height,
+            "block_hash": None if height is None else self.node.blockchain.chain[height].hash,
+        }
+
+    def _proof(self, tx_id: str, _query: dict[str, list[str]]) -> dict[str, Any]:
+        blockchain = self.node.blockchain
+        proof = blockchain.merkle_proof(tx_id)
+        if proof is None:
+            raise QueryError(404, "Transacao nao confirmada")
+        return {"proof": proof.to_dict(), "header": blockchain.header(proof.height).to_dict()}
+
+    def _mempool(self, _argument: str, query: dict[str, list[str]]) -> dict[str, Any]:
+        try:
+            page = max(0, int(query.get("page", ["0"])[0]))
+            page_size = min(MAX_PAGE_SIZE, max(1, int(query.get("page_size", ["50"])[0])))
+        except ValueError:
+            raise QueryError(400, "page e page_size devem ser inteiros") from None
+        pending = self.node.blockchain.pending_transactions
+        start = page * page_size
+        return {
+            "page": page,
+            "page_size": page_size,
+            "total": len(pending),
+            "transactions": [tx.to_dict() for tx in pending[start : start + page_size]],
+        }
+
+    ## eventos (SSE)
+    def open_stream(self, target: str) -> Subscription:
+        """Assinatura para `/events?kinds=a,b&address=x&address=y`."""
+        query = parse_qs(urlsplit(target).query)
+        kinds = [kind for value in query.get("kinds", []) for kind in value.split(",") if kind]
+        try:
+            subscription = self.node.subscribe(
+                kinds=kinds or None, addresses=query.get("address") or None
+            )
+        except ValueError as exc:
+            raise QueryError(400, str(exc)) from None
+        self._streams.add(subscription)
+        self._requests.labels("events", 200).inc()
+        return subscription
+
+    def close_stream(self, subscription: Subscription) -> None:
+        subscription.close()
+        self._streams.discard(subscription)
+
+    ## servidor HTTP
+    def start(self) -> None:
+        query = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 (nome exigido pelo http.server)
+                if urlsplit(self.path).path.rstrip("/") == "/events":
+                    self._stream()
+                    return
+                status, etag, body = query.handle(self.path, self.headers.get("If-None-Match"))
+                self.send_response(status)
+                if etag:
+                    self.send_header("ETag", etag)
+                    # Pode guardar, mas deve revalidar (barato: 304).
+                    self.send_header("Cache-Control", "no-cache")
+                if status != 304:
+                    self.send_header("Content-Type", "application/json; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if status != 304:
+                    self.wfile.write(body)
+
+            def _stream(self) -> None:
+                try:
+                    subscription = query.open_stream(self.path)
+                except QueryError as exc:
+                    body = json.dumps({"error": str(exc)}).encode("utf-8")
+                    self.send_response(exc.status)
+                    self.send_header("Content-Type", "application/json; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                try:
+                    while True:
+                        event = subscription.get(KEEPALIVE_INTERVAL)
+                        if event is None:
+                            if subscription.closed:
+                                break
+                            self.wfile.write(b": keepalive\n\n")
+                        else:
+                            data = json.dumps(event.to_dict(), separators=(",", ":"))
+                            self.wfile.write(
+                                f"id: {event.sequence}\nevent: {event.kind}\ndata: {data}\n\n".encode(
+                                    "utf-8"
+                                )
+                            )
+                        self.wfile.flush()
+                except OSError:
+                    # Cliente desconectou.
+                    pass
+                finally:
+                    query.close_stream(subscription)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                # Polling frequente: sem log por requisicao.
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        # Porta 0: o sistema escolhe; a porta real fica disponivel aqui.
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        for subscription in list(self._streams):
+            self.close_stream(subscription)
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,136 @@
+"""Limites de entrada do servidor: token bucket por peer e por tipo de mensagem."""
+
+from __future__ import annotations
+
+import ipaddress
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable
+
+from .protocol import MessageType
+
+
+class TokenBucket:
+    """Balde de fichas: `rate` fichas por segundo, acumulando ate `burst`."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated", "_clock")
+
+    def __init__(
+        self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self._clock = clock
+        self.updated = clock()
+
+    def consume(self, amount: float = 1.0) -> bool:
+        now = self._clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < amount:
+            return False
+        self.tokens -= amount
+        return True
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Taxa sustentada (mensagens/s) e rajada maxima."""
+
+    rate: float
+    burst: float
+
+
+def _default_message_limits() -> dict[MessageType, RateLimit]:
+    limits = {
+        MessageType.NEW_TRANSACTION: RateLimit(1000, 2000),
+        MessageType.NEW_BLOCK: RateLimit(20, 40),
+        MessageType.COMPACT_BLOCK: RateLimit(20, 40),
+        # Respostas grandes: poucas por segundo por peer.
+        MessageType.REQUEST_CHAIN: RateLimit(1, 3),
+        MessageType.REQUEST_BLOCKS: RateLimit(50, 100),
+        MessageType.REQUEST_BLOCK_TXN: RateLimit(20, 40),
+        MessageType.REQUEST_TIP: RateLimit(10, 20),
+        MessageType.REQUEST_HEADERS: RateLimit(20, 40),
+        MessageType.REQUEST_TX_PROOF: RateLimit(100, 200),
+        MessageType.REQUEST_MEMPOOL_SKETCH: RateLimit(5, 10),
+        MessageType.MEMPOOL_TXN: RateLimit(5, 20),
+        MessageType.PING: RateLimit(5, 10),
+    }
+    # Respostas chegam na conexao da requisicao; pelo servidor sao
+    # descartadas, mas ainda assim limitadas (o parse ja aconteceu).
+    for kind in MessageType:
+        if kind.value.startswith("RESPONSE_") or kind == MessageType.PONG:
+            limits[kind] = RateLimit(1, 5)
+    return limits
+
+
+@dataclass
+class InboundLimits:
+    """Configuracao de backpressure do servidor do no."""
+
+    # Conexoes simultaneas (total e por IP).
+    max_connections: int = 64
+    max_connections_per_ip: int = 8
+    # Maior frame aceito (o cabecalho de 4 bytes e lido antes do corpo).
+    max_message_size: int = 16 * 1024 * 1024
+    # Fila de processamento e threads que a consomem.
+    queue_size: int = 256
+    workers: int = 4
+    # Acima desta fracao da fila, transacoes sao descartadas primeiro.
+    shed_threshold: float = 0.75
+    # Frames por segundo por IP (antes de decodificar o JSON).
+    frame_limit: RateLimit = field(default_factory=lambda: RateLimit(2000, 4000))
+    # Limites por tipo de mensagem; tipos ausentes nao sao limitados.
+    message_limits: dict[MessageType, RateLimit] = field(
+        default_factory=_default_message_limits
+    )
+    # Nos locais (varios nos na mesma maquina) nao tem limites por IP.
+    exempt_loopback: bool = True
+
+
+class PeerRateLimiter:
+    """Token buckets por (IP, tipo de mensagem), com memoria limitada."""
+
+    def __init__(self, limits: InboundLimits, max_tracked: int = 4096) -> None:
+        self.limits = limits
+        self.max_tracked = max_tracked
+        self._buckets: OrderedDict[tuple[str, str], TokenBucket] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def is_exempt(self, ip: str) -> bool:
+        if not self.limits.exempt_loopback:
+            return False
+        try:
+            return ipaddress.ip_address(ip).is_loopback
+        except ValueError:
+            return ip == "localhost"
+
+    def allow_frame(self, ip: str) -> bool:
+        """Limite geral de frames do IP, aplicado antes do parse."""
+        if self.is_exempt(ip):
+            return True
+        return self._consume(ip, "*", self.limits.frame_limit, 1.0)
+
+    def allow(self, ip: str, message_type: MessageType, cost: float = 1.0) -> bool:
+        limit = self.limits.message_limits.get(message_type)
+        if limit is None or self.is_exempt(ip):
+            return True
+        return self._consume(ip, message_type.value, limit, cost)
+
+    def _consume(self, ip: str, kind: str, limit: RateLimit, cost: float) -> bool:
+        key = (ip, kind)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(limit.rate, limit.burst)
+                self._buckets[key] = bucket
+                # Descarta os baldes menos usados recentemente.
+                while len(self._buckets) > self.max_tracked:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            return bucket.consume(cost)
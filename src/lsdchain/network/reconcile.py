@@ -0,0 +1,299 @@
+"""Reconciliacao de mempool entre peers por sketch (IBLT) de IDs curtos.
+
+O iniciador envia um sketch das proprias pendentes (REQUEST_MEMPOOL_SKETCH).
+O peer subtrai o sketch do proprio mempool e, se a diferenca decodificar,
+responde com as transacoes que faltam ao iniciador e os IDs curtos que
+faltam a ele (RESPONSE_MEMPOOL_SKETCH); o iniciador completa com
+MEMPOOL_TXN. O sketch tem tamanho proporcional a diferenca, nao ao mempool:
+comeca pequeno e dobra quando nao decodifica. Se ficaria maior que a lista
+de IDs curtos (ou na ultima rodada), a propria lista e enviada. O peer so
+aceita MEMPOOL_TXN com os IDs curtos que pediu.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+from ..core.transaction import Transaction
+from .protocol import MessageType, Protocol
+
+if TYPE_CHECKING:
+    from .node import Node
+
+# Celulas de cada ID curto (uma por faixa do sketch).
+HASH_COUNT = 3
+# Primeiro sketch enviado (ate ~5 diferencas) e folga fixa de `sketch_size`.
+MIN_CELLS = 24
+# Celulas por transacao diferente: folga para o peeling terminar.
+CELLS_PER_DIFFERENCE = 1.5
+# Maior sketch aceito (acima disso o iniciador manda a lista de IDs).
+MAX_CELLS = 3 * 2**16
+# Tentativas (sketch maior ou resposta truncada) por reconciliacao.
+MAX_ROUNDS = 6
+# Transacoes completas por mensagem (respostas e MEMPOOL_TXN).
+MAX_TRANSACTIONS = 5000
+# Segundos em que os IDs pedidos a um peer aguardam o MEMPOOL_TXN.
+WANT_TIMEOUT = 60.0
+
+_MASK = 2**64 - 1
+_CHECK_MULTIPLIER = 0x9E3779B97F4A7C15
+
+
+def short_id(tx_id: str, salt: bytes) -> int:
+    """ID curto (64 bits) da transacao; o sal e sorteado a cada reconciliacao."""
+    return int.from_bytes(blake2b(tx_id.encode(), digest_size=8, key=salt).digest(), "big")
+
+
+def short_ids(transactions: Iterable[Transaction], salt: bytes) -> dict[int, Transaction]:
+    return {short_id(tx.id, salt): tx for tx in transactions}
+
+
+def sketch_size(difference: int) -> int:
+    """Celulas para decodificar `difference` IDs diferentes (multiplo de HASH_COUNT)."""
+    cells = MIN_CELLS + math.ceil(difference * CELLS_PER_DIFFERENCE)
+    return min(MAX_CELLS, cells + (-cells) % HASH_COUNT)
+
+
+def _check(key: int) -> int:
+    return ((key * _CHECK_MULTIPLIER) & _MASK) >> 32
+
+
+@dataclass
+class Sketch:
+    """Invertible Bloom lookup table de IDs curtos.
+
+    Cada ID soma em uma celula de cada uma das HASH_COUNT faixas: contagem,
+    XOR dos IDs e XOR de um checksum do ID. Subtraindo o sketch do peer,
+    os IDs em comum se cancelam e sobram so as diferencas, recuperadas
+    celula a celula (peeling).
+    """
+
+    counts: list[int]
+    keys: list[int]
+    checks: list[int]
+
+    @property
+    def size(self) -> int:
+        return len(self.counts)
+
+    @classmethod
+    def build(cls, keys: Iterable[int], size: int) -> "Sketch":
+        if size <= 0 or size % HASH_COUNT:
+            raise ValueError(f"Tamanho do sketch deve ser multiplo de {HASH_COUNT}")
+        sketch = cls([0] * size, [0] * size, [0] * size)
+        counts, cell_keys, checks = sketch.counts, sketch.keys, sketch.checks
+        cells = sketch._cells
+        for key in keys:
+            check = _check(key)
+            for cell in cells(key):
+                counts[cell] += 1
+                cell_keys[cell] ^= key
+                checks[cell] ^= check
+        return sketch
+
+    def _cells(self, key: int) -> tuple[int, ...]:
+        # Faixas disjuntas: o mesmo ID nunca cai duas vezes na mesma celula.
+        width = len(self.counts) // HASH_COUNT
+        return tuple(
+            band * width + (key >> (21 * band)) % width for band in range(HASH_COUNT)
+        )
+
+    def subtract(self, other: "Sketch") -> "Sketch":
+        if other.size != self.size:
+            raise ValueError("Sketches de tamanhos diferentes")
+        return Sketch(
+            [a - b for a, b in zip(self.counts, other.counts)],
+            [a ^ b for a, b in zip(self.keys, other.keys)],
+            [a ^ b for a, b in zip(self.checks, other.checks)],
+        )
+
+    def decode(self) -> tuple[list[int], list[int]] | None:
+        """IDs (so neste sketch, so no subtraido); None se nao decodificar."""
+        counts, keys, checks = list(self.counts), list(self.keys), list(self.checks)
+        ours: list[int] = []
+        theirs: list[int] = []
+        queue = [cell for cell, count in enumerate(counts) if count in (1, -1)]
+        while queue:
+            cell = queue.pop()
+            count = counts[cell]
+            if count not in (1, -1):
+                continue
+            key = keys[cell]
+            check = _check(key)
+            cells = self._cells(key)
+            # Celula com mais de um ID: o checksum (ou a posicao) nao bate.
+            if checks[cell] != check or cell not in cells:
+                continue
+            (ours if count == 1 else theirs).append(key)
+            for other in cells:
+                counts[other] -= count
+                keys[other] ^= key
+                checks[other] ^= check
+                if counts[other] in (1, -1):
+                    queue.append(other)
+        if any(counts) or any(keys) or any(checks):
+            return None
+        return ours, theirs
+
+    def to_payload(self) -> dict[str, Any]:
+        return {"counts": self.counts, "keys": self.keys, "checks": self.checks}
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> "Sketch":
+        counts = [int(value) for value in payload["counts"]]
+        keys = [int(value) & _MASK for value in payload["keys"]]
+        checks = [int(value) & _MASK for value in payload["checks"]]
+        size = len(counts)
+        if not 0 < size <= MAX_CELLS or size % HASH_COUNT:
+            raise ValueError("Tamanho de sketch invalido")
+        if len(keys) != size or len(checks) != size:
+            raise ValueError("Sketch com listas de tamanhos diferentes")
+        return cls(counts, keys, checks)
+
+
+def answer(payload: dict[str, Any], pending: list[Transaction]) -> dict[str, Any]:
+    """Resposta a REQUEST_MEMPOOL_SKETCH a partir das pendentes locais.
+
+    `decoded` falso (com o tamanho do mempool local) pede um sketch maior.
+    """
+    salt = bytes.fromhex(str(payload["salt"]))
+    local = short_ids(pending, salt)
+    if "ids" in payload:
+        remote = {int(value) & _MASK for value in payload["ids"]}
+        missing = [key for key in local if key not in remote]
+        wanted = [key for key in remote if key not in local]
+    else:
+        sketch = Sketch.from_payload(payload["sketch"])
+        difference = sketch.subtract(Sketch.build(local, sketch.size)).decode()
+        # IDs "so aqui" que nao existem no mempool local: decodificacao falsa.
+        if difference is None or any(key not in local for key in difference[1]):
+            return {"decoded": False, "count": len(local)}
+        wanted, missing = difference
+    return {
+        "decoded": True,
+        "count": len(local),
+        "transactions": [local[key].to_dict() for key in missing[:MAX_TRANSACTIONS]],
+        "truncated": len(missing) > MAX_TRANSACTIONS,
+        "want": wanted,
+    }
+
+
+class Wanted:
+    """IDs curtos pedidos a cada peer (`want`), a espera do MEMPOOL_TXN.
+
+    Cada rodada guarda o proprio sal; as entradas expiram apos `timeout`.
+    """
+
+    def __init__(
+        self, clock: Callable[[], float] = time.monotonic, timeout: float = WANT_TIMEOUT
+    ) -> None:
+        self._clock = clock
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._rounds: dict[str, list[tuple[float, bytes, set[int]]]] = {}
+
+    def record(self, peer: str, salt: bytes, keys: Iterable[int]) -> None:
+        keys = set(keys)
+        if not keys:
+            return
+        with self._lock:
+            rounds = self._live(peer)
+            rounds.append((self._clock() + self.timeout, salt, keys))
+            # Uma reconciliacao tem no maximo MAX_ROUNDS rodadas.
+            self._rounds[peer] = rounds[-MAX_ROUNDS:]
+
+    def take(self, peer: str, transactions: Iterable[Transaction]) -> list[Transaction]:
+        """So as transacoes pedidas a `peer`; cada ID curto vale uma vez."""
+        accepted = []
+        with self._lock:
+            rounds = self._live(peer)
+            for tx in transactions:
+                for _, salt, keys in rounds:
+                    key = short_id(tx.id, salt)
+                    if key in keys:
+                        keys.discard(key)
+                        accepted.append(tx)
+                        break
+            rounds = [entry for entry in rounds if entry[2]]
+            if rounds:
+                self._rounds[peer] = rounds
+            else:
+                self._rounds.pop(peer, None)
+        return accepted
+
+    def _live(self, peer: str) -> list[tuple[float, bytes, set[int]]]:
+        now = self._clock()
+        return [entry for entry in self._rounds.get(peer, []) if entry[0] > now]
+
+
+class MempoolSync:
+    """Reconcilia o mempool local com o de um peer que entende extensoes."""
+
+    def __init__(self, node: "Node", peer: str) -> None:
+        self.node = node
+        self.peer = peer
+
+    def run(self) -> int | None:
+        """Executa a reconciliacao; retorna quantas transacoes entraram no mempool.
+
+        None quando o peer nao respondeu (ou nao entende a extensao).
+        """
+        node = self.node
+        received = 0
+        size = MIN_CELLS
+        for round_number in range(MAX_ROUNDS):
+            salt = os.urandom(16)
+            local = short_ids(list(node.blockchain.pending_transactions), salt)
+            if (
+                HASH_COUNT * size >= len(local)
+                or size >= MAX_CELLS
+                or round_number == MAX_ROUNDS - 1
+            ):
+                # Sketch (3 inteiros por celula) nao compensa, ou a diferenca
+                # nao decodificou ate a ultima rodada: manda os IDs curtos.
+                request = Protocol.request_mempool_sketch(salt.hex(), ids=list(local))
+            else:
+                request = Protocol.request_mempool_sketch(
+                    salt.hex(), sketch=Sketch.build(local, size).to_payload()
+                )
+            response = node._send_message(self.peer, request, True)
+            if not response or response.type != MessageType.RESPONSE_MEMPOOL_SKETCH:
+                node._mempool_syncs.labels("failed").inc()
+                return None
+            payload = response.payload
+            try:
+                if not payload.get("decoded"):
+                    node._mempool_syncs.labels("retry").inc()
+                    # Diferenca maior que o sketch: ao menos a diferenca de tamanho.
+                    gap = abs(int(payload.get("count", 0)) - len(local))
+                    size = max(size * 2, sketch_size(gap))
+                    continue
+                transactions = [
+                    Transaction.from_dict(data) for data in payload.get("transactions", [])
+                ]
+                wanted = [local[int(key)] for key in payload.get("want", []) if int(key) in local]
+            except (KeyError, TypeError, ValueError) as exc:
+                node.events.warning("mempool.sync_invalid", peer=self.peer, error=exc)
+                node._mempool_syncs.labels("failed").inc()
+                return None
+            with node._chain_lock:
+                errors = node.blockchain.add_transactions(transactions)
+            received += errors.count(None)
+            for start in range(0, len(wanted), MAX_TRANSACTIONS):
+                node._send_async(
+                    self.peer,
+                    Protocol.mempool_txn(
+                        [tx.to_dict() for tx in wanted[start : start + MAX_TRANSACTIONS]]
+                    ),
+                )
+            node._mempool_syncs.labels("decoded").inc()
+            if not payload.get("truncated"):
+                return received
+            # Resposta truncada: outra rodada (mesmo tamanho) traz o restante.
+        return received
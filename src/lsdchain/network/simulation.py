@@ -0,0 +1,477 @@
+"""Simulacao da rede em memoria: transporte simulado, relogio virtual e metricas.
+
+Centenas de nos rodam em um unico processo, sem sockets: as mensagens sao
+serializadas como no TCP e entregues apos latencia + tempo de transmissao
+(banda de upload por no), com perda opcional. O tempo e virtual, entao a
+simulacao e rapida e deterministica para a mesma seed.
+
+Exemplo:
+    PYTHONPATH=src python -m lsdchain.network.simulation --nodes 200 \
+        --degree 6 --blocks 100 --latency 0.08 --loss 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+from ..core.difficulty import Difficulty
+from .node import Node
+from .protocol import Message
+from .transport import Transport
+
+
+class VirtualClock:
+    """Fila de eventos ordenada pelo tempo virtual."""
+
+    def __init__(self, start: float = 0.0) -> None:
+        self.now = start
+        self._events: list[tuple[float, int, Callable[..., None], tuple[Any, ...]]] = []
+        # Desempate por ordem de agendamento: eventos simultaneos sao
+        # processados sempre na mesma ordem.
+        self._seq = itertools.count()
+
+    def __call__(self) -> float:
+        return self.now
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def schedule_at(self, when: float, callback: Callable[..., None], *args: Any) -> None:
+        heapq.heappush(self._events, (max(when, self.now), next(self._seq), callback, args))
+
+    def schedule(self, delay: float, callback: Callable[..., None], *args: Any) -> None:
+        self.schedule_at(self.now + delay, callback, *args)
+
+    def run(self, until: float | None = None) -> int:
+        """Processa eventos ate `until` (ou ate esvaziar); retorna quantos."""
+        processed = 0
+        while self._events:
+            if until is not None and self._events[0][0] > until:
+                break
+            when, _, callback, args = heapq.heappop(self._events)
+            self.now = when
+            callback(*args)
+            processed += 1
+        if until is not None and self.now < until:
+            self.now = until
+        return processed
+
+
+class SimulatedNetwork:
+    """Meio de transmissao compartilhado pelos `SimulatedTransport`.
+
+    - Envios sem resposta (broadcast) ocupam o upload do remetente por
+      `tamanho / bandwidth` e chegam `latency` (+ jitter) depois.
+    - Requisicoes com resposta sao processadas na hora pelo destino; o
+      tempo de ida e volta e somado ao atraso do handler em execucao, de
+      modo que os envios feitos depois dele saem mais tarde.
+    - Com `loss`, broadcasts somem e requisicoes falham por timeout.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.0,
+        bandwidth: float | None = None,
+        loss: float = 0.0,
+        seed: int = 0,
+        clock: VirtualClock | None = None,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        # Bytes por segundo de upload de cada no; None = ilimitado.
+        self.bandwidth = bandwidth
+        self.loss = loss
+        self.clock = clock or VirtualClock()
+        self._rng = random.Random(seed)
+        self._nodes: dict[str, Node] = {}
+        self._uplink_free: dict[str, float] = {}
+        # Tempo ja gasto pelo evento em execucao (requisicoes sincronas).
+        self._delay = 0.0
+        self._lock = threading.RLock()
+        self.messages = 0
+        self.bytes = 0
+        self.lost = 0
+        # Chamado apos cada entrega (a `Simulation` registra os topos).
+        self.on_delivery: Callable[[Node], None] | None = None
+
+    def now(self) -> float:
+        return self.clock.now + self._delay
+
+    def transport(self) -> "SimulatedTransport":
+        return SimulatedTransport(self)
+
+    def attach(self, node: Node) -> None:
+        self._nodes[node.address] = node
+
+    def detach(self, address: str) -> None:
+        self._nodes.pop(address, None)
+
+    def call_at(self, when: float, callback: Callable[..., None], *args: Any) -> None:
+        """Agenda um evento externo (ex.: mineracao) no tempo virtual."""
+        self.clock.schedule_at(when, self._run_event, callback, args)
+
+    def request(
+        self,
+        sender: Node,
+        peer: str,
+        message: Message,
+        expect_response: bool,
+        timeout: float,
+    ) -> tuple[Message | None, float | None]:
+        with self._lock:
+            target = self._nodes.get(peer)
+            if target is None:
+                raise ConnectionRefusedError(f"{peer} fora da rede simulada")
+            raw = message.to_bytes()
+            self._count(raw)
+            if not expect_response:
+                self._post(sender.address, target.address, raw)
+                return None, None
+
+            if self._rng.random() < self.loss:
+                self.lost += 1
+                self._delay += timeout
+                raise TimeoutError(f"Requisicao para {peer} perdida")
+            self._delay += self._transit(len(raw))
+            try:
+                response = target._process_message(Message.from_bytes(raw[4:]))
+            except Exception as exc:
+                target.events.error("message.failed", error=exc)
+                response = None
+            rtt = 2 * self.latency
+            if response is None:
+                self._delay += self.latency
+                return None, rtt
+            response.sender = target.address
+            raw_response = response.to_bytes()
+            self._count(raw_response)
+            self._delay += self._transit(len(raw_response))
+            return Message.from_bytes(raw_response[4:]), rtt
+
+    def _post(self, sender: str, target: str, raw: bytes) -> None:
+        start = max(self.now(), self._uplink_free.get(sender, 0.0))
+        done = start + (len(raw) / self.bandwidth if self.bandwidth else 0.0)
+        self._uplink_free[sender] = done
+        if self._rng.random() < self.loss:
+            self.lost += 1
+            return
+        arrival = done + self.latency + self._jitter()
+        self.clock.schedule_at(arrival, self._run_event, self._deliver, (target, raw))
+
+    def _transit(self, size: int) -> float:
+        transmission = size / self.bandwidth if self.bandwidth else 0.0
+        return transmission + self.latency + self._jitter()
+
+    def _jitter(self) -> float:
+        return self._rng.uniform(0.0, self.jitter) if self.jitter else 0.0
+
+    def _count(self, raw: bytes) -> None:
+        self.messages += 1
+        self.bytes += len(raw)
+
+    def _run_event(self, callback: Callable[..., None], args: tuple[Any, ...]) -> None:
+        self._delay = 0.0
+        try:
+            callback(*args)
+        finally:
+            self._delay = 0.0
+
+    def _deliver(self, address: str, raw: bytes) -> None:
+        node = self._nodes.get(address)
+        if node is None:
+            return
+        try:
+            node._process_message(Message.from_bytes(raw[4:]))
+        except Exception as exc:
+            node.events.error("message.failed", error=exc)
+        if self.on_delivery:
+            self.on_delivery(node)
+
+
+class SimulatedTransport(Transport):
+    """Transporte de um no na `SimulatedNetwork` (sem sockets nem threads)."""
+
+    threaded = False
+
+    def __init__(self, network: SimulatedNetwork) -> None:
+        super().__init__()
+        self.network = network
+
+    def clock(self) -> float:
+        return self.network.now()
+
+    def start(self, node: Node) -> None:
+        super().start(node)
+        self.network.attach(node)
+
+    def stop(self) -> None:
+        if self.node is not None:
+            self.network.detach(self.node.address)
+
+    def request(
+        self, peer: str, message: Message, expect_response: bool, timeout: float
+    ) -> tuple[Message | None, float | None]:
+        return self.network.request(self.node, peer, message, expect_response, timeout)
+
+    def post(self, peer: str, message: Message) -> None:
+        # Passa por _send_message para registrar sucesso/falha do peer.
+        self.node._send_message(peer, message, False)
+
+
+@dataclass
+class SimulationConfig:
+    """Topologia, rede e carga de mineracao da simulacao."""
+
+    nodes: int = 100
+    # Conexoes por no (anel + ligacoes aleatorias ate atingir o grau).
+    degree: int = 4
+    # Blocos minerados, em nos sorteados, com intervalo exponencial.
+    blocks: int = 50
+    block_interval: float = 10.0
+    latency: float = 0.05
+    jitter: float = 0.02
+    # Upload por no em bytes/s (10 Mbit/s); None = ilimitado.
+    bandwidth: float | None = 1_250_000.0
+    loss: float = 0.0
+    compact_relay: bool = True
+    # Tempo simulado apos o ultimo bloco para a rede convergir.
+    drain: float = 120.0
+    seed: int = 0
+    # Falhas de envio sao esperadas com perda; o log dos nos fica quieto.
+    log_level: int = logging.CRITICAL
+
+
+@dataclass
+class SimulationReport:
+    """Resultado da simulacao (tempos em segundos virtuais)."""
+
+    nodes: int
+    blocks_mined: int
+    final_height: int
+    # Fracao dos blocos minerados que ficou fora da cadeia final.
+    fork_rate: float
+    # Atraso entre a mineracao e a chegada em cada no (percentis).
+    propagation_p50: float | None
+    propagation_p90: float | None
+    propagation_max: float | None
+    # Media, por bloco, do tempo ate chegar a todos os nos.
+    full_propagation_mean: float | None
+    converged: bool
+    # Do ultimo bloco minerado ate a ultima troca de topo.
+    convergence_time: float | None
+    messages: int
+    bytes: int
+    lost: int
+    simulated_time: float
+    wall_time: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _percentile(values: list[float], fraction: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Simulation:
+    """Monta N nos na rede simulada, minera blocos e mede a propagacao."""
+
+    def __init__(self, config: SimulationConfig | None = None) -> None:
+        self.config = config or SimulationConfig()
+        cfg = self.config
+        self._rng = random.Random(cfg.seed)
+        self.network = SimulatedNetwork(
+            latency=cfg.latency,
+            jitter=cfg.jitter,
+            bandwidth=cfg.bandwidth,
+            loss=cfg.loss,
+            seed=cfg.seed + 1,
+        )
+        self.network.on_delivery = self._observe
+        # Sem PoW: o custo da simulacao fica na rede e na validacao.
+        difficulty = Difficulty.from_bits(0)
+        self.nodes: list[Node] = []
+        for i in range(cfg.nodes):
+            node = Node(
+                f"sim{i}",
+                5000,
+                difficulty=difficulty,
+                compact_relay=cfg.compact_relay,
+                transport=self.network.transport(),
+            )
+            node.miner.clock = self.network.now
+            node.blockchain.clock = self.network.now
+            self.nodes.append(node)
+        logging.getLogger("Node:5000").setLevel(cfg.log_level)
+
+        # Hash do bloco -> (tempo de mineracao, minerador).
+        self.mined: dict[str, tuple[float, str]] = {}
+        # Por no: hash -> primeiro instante em que o bloco esteve na cadeia.
+        self.arrivals: dict[str, dict[str, float]] = {}
+        self._tips: dict[str, str] = {}
+        self._last_tip_change = 0.0
+
+    def _connect(self) -> None:
+        count = len(self.nodes)
+        links: set[tuple[int, int]] = set()
+        if count > 1:
+            for i in range(count):
+                links.add(tuple(sorted((i, (i + 1) % count))))
+        degree: dict[int, int] = {i: 0 for i in range(count)}
+        for a, b in links:
+            degree[a] += 1
+            degree[b] += 1
+        for i in range(count):
+            candidates = [j for j in range(count) if j != i]
+            self._rng.shuffle(candidates)
+            for j in candidates:
+                if degree[i] >= self.config.degree:
+                    break
+                link = tuple(sorted((i, j)))
+                if link in links:
+                    continue
+                links.add(link)
+                degree[i] += 1
+                degree[j] += 1
+        for a, b in sorted(links):
+            # Handshake REQUEST_TIP: registra o peer nos dois lados e marca
+            # o suporte a extensoes (compact blocks).
+            self.nodes[a].connect_to_peer(self.nodes[b].address, sync=False)
+
+    def _observe(self, node: Node) -> None:
+        chain = node.blockchain.chain
+        tip = chain[-1].hash
+        if self._tips.get(node.address) == tip:
+            return
+        now = self.network.now()
+        self._tips[node.address] = tip
+        self._last_tip_change = now
+        seen = self.arrivals.setdefault(node.address, {})
+        for block in reversed(chain):
+            if block.hash in seen:
+                break
+            seen[block.hash] = now
+
+    def _mine(self) -> None:
+        node = self._rng.choice(self.nodes)
+        block = node.mine()
+        if block is not None:
+            self.mined[block.hash] = (self.network.now(), node.address)
+            self._observe(node)
+
+    def run(self) -> SimulationReport:
+        cfg = self.config
+        started = time.perf_counter()
+        for node in self.nodes:
+            node.start()
+        self._connect()
+        for node in self.nodes:
+            self._observe(node)
+
+        when = self.network.clock.now
+        for _ in range(cfg.blocks):
+            when += self._rng.expovariate(1.0 / cfg.block_interval)
+            self.network.call_at(when, self._mine)
+        self.network.clock.run(until=when + cfg.drain)
+        report = self._report(last_mined=when, wall_time=time.perf_counter() - started)
+        for node in self.nodes:
+            node.stop()
+        return report
+
+    def _report(self, last_mined: float, wall_time: float) -> SimulationReport:
+        best = max(self.nodes, key=lambda node: len(node.blockchain.chain))
+        final_chain = {block.hash for block in best.blockchain.chain}
+        orphaned = sum(1 for block_hash in self.mined if block_hash not in final_chain)
+
+        delays: list[float] = []
+        full: list[float] = []
+        for block_hash, (mined_at, miner) in self.mined.items():
+            reached = [
+                seen[block_hash] - mined_at
+                for address, seen in self.arrivals.items()
+                if address != miner and block_hash in seen
+            ]
+            delays.extend(reached)
+            if len(reached) == len(self.nodes) - 1 and reached:
+                full.append(max(reached))
+
+        converged = len({node.blockchain.last_block.hash for node in self.nodes}) == 1
+        return SimulationReport(
+            nodes=len(self.nodes),
+            blocks_mined=len(self.mined),
+            final_height=len(best.blockchain.chain) - 1,
+            fork_rate=orphaned / len(self.mined) if self.mined else 0.0,
+            propagation_p50=_percentile(delays, 0.5),
+            propagation_p90=_percentile(delays, 0.9),
+            propagation_max=max(delays) if delays else None,
+            full_propagation_mean=sum(full) / len(full) if full else None,
+            converged=converged,
+            convergence_time=(
+                max(0.0, self._last_tip_change - last_mined) if converged else None
+            ),
+            messages=self.network.messages,
+            bytes=self.network.bytes,
+            lost=self.network.lost,
+            simulated_time=self.network.clock.now,
+            wall_time=wall_time,
+        )
+
+
+def _parse_args() -> argparse.Namespace:
+    defaults = SimulationConfig()
+    parser = argparse.ArgumentParser(description="Simulacao da rede LSDChain em memoria")
+    parser.add_argument("--nodes", type=int, default=defaults.nodes)
+    parser.add_argument("--degree", type=int, default=defaults.degree)
+    parser.add_argument("--blocks", type=int, default=defaults.blocks)
+    parser.add_argument("--block-interval", type=float, default=defaults.block_interval)
+    parser.add_argument("--latency", type=float, default=defaults.latency)
+    parser.add_argument("--jitter", type=float, default=defaults.jitter)
+    parser.add_argument(
+        "--bandwidth",
+        type=float,
+        default=defaults.bandwidth,
+        help="Upload por no em bytes/s (0 = ilimitado)",
+    )
+    parser.add_argument("--loss", type=float, default=defaults.loss)
+    parser.add_argument("--drain", type=float, default=defaults.drain)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument(
+        "--no-compact", action="store_true", help="Propaga blocos completos (NEW_BLOCK)"
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    config = SimulationConfig(
+        nodes=args.nodes,
+        degree=args.degree,
+        blocks=args.blocks,
+        block_interval=args.block_interval,
+        latency=args.latency,
+        jitter=args.jitter,
+        bandwidth=args.bandwidth or None,
+        loss=args.loss,
+        compact_relay=not args.no_compact,
+        drain=args.drain,
+        seed=args.seed,
+    )
+    report = Simulation(config).run()
+    print(json.dumps(report.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""Sincronizacao inicial paralela: download de blocos a partir de varios peers."""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from ..core.block import Block, LazyBlock
+from .protocol import MessageType, Protocol
+
+if TYPE_CHECKING:
+    from .node import Node
+
+# Blocos por requisicao REQUEST_BLOCKS.
+CHUNK_SIZE = 200
+# Limite de blocos que um no envia em uma unica resposta.
+MAX_BLOCKS_PER_REQUEST = 500
+# Limite de cabecalhos por resposta REQUEST_HEADERS (clientes leves).
+MAX_HEADERS_PER_REQUEST = 2000
+# Ancestrais do checkpoint (assume-valid) guardados ate o bloco confiavel
+# chegar; os mais distantes dele sao validados por completo, chunk a chunk.
+ASSUME_VALID_WINDOW = 10_000
+
+
+@dataclass
+class PeerTip:
+    """Topo anunciado por um peer em resposta a REQUEST_TIP."""
+
+    peer: str
+    height: int
+    hash: str
+    fork_height: int
+    # Corpos de bloco ate esta altura foram descartados pelo peer (poda).
+    pruned_height: int = 0
+    # Trabalho acumulado anunciado (0 = peer nao informou).
+    work: int = 0
+
+
+@dataclass
+class _Chunk:
+    start: int
+    end: int
+    attempts: int = 0
+    # Fonte da ultima tentativa.
+    source: str = ""
+
+
+class InitialSync:
+    """Agenda o download da faixa de alturas faltante entre varios peers.
+
+    1. Pergunta o topo a todos os peers em paralelo (REQUEST_TIP + locator).
+    2. Escolhe o topo de maior trabalho acumulado; os peers que anunciam o
+       mesmo hash viram fontes.
+    3. Divide [fork_height + 1, topo] em chunks baixados em paralelo, cada
+       um de uma fonte diferente; chunks com falha (ou invalidos) sao
+       refeitos em outra.
+    4. Entrega os blocos em ordem para validacao, conforme ficam contiguos.
+    5. Se o topo nao puder ser baixado, tenta o proximo maior.
+    """
+
+    def __init__(
+        self,
+        node: "Node",
+        peers: list[str] | None = None,
+        chunk_size: int = CHUNK_SIZE,
+        max_workers: int = 8,
+    ) -> None:
+        self.node = node
+        # Peers de menor latencia primeiro: sao as fontes preferidas.
+        self.peers = node.peer_manager.ranked() if peers is None else list(peers)
+        self.chunk_size = max(1, min(chunk_size, MAX_BLOCKS_PER_REQUEST))
+        self.max_workers = max(1, max_workers)
+        if not node.transport.threaded:
+            # Transporte simulado: requisicoes em serie, em ordem fixa
+            # (resultados deterministicos).
+            self.max_workers = 1
+
+    def run(self) -> bool:
+        """Executa a sincronizacao.
+
+        Retorna False quando nenhum peer entende REQUEST_TIP (peers que so
+        implementam o padrao) ou nenhum topo maior pode ser baixado; nesse
+        caso o chamador usa REQUEST_CHAIN.
+        """
+        tips = self._fetch_tips()
+        if not tips:
+            return False
+
+        blockchain = self.node.blockchain
+        while tips:
+            best = max(tips, key=lambda tip: (tip.work, tip.height))
+            if best.work:
+                # O trabalho anunciado e conferido na troca de cadeia.
+                behind = best.work <= blockchain.chain_work
+            else:
+                behind = best.height <= len(blockchain.chain) - 1
+            if behind:
+                return True
+            same_tip = [tip for tip in tips if tip.hash == best.hash]
+            sources = [tip.peer for tip in same_tip]
+            # Peers podados so servem os blocos acima da altura podada.
+            pruned = {tip.peer: tip.pruned_height for tip in same_tip}
+            blocks = self._download(best.fork_height + 1, best.height, sources, pruned)
+            if blocks is not None or blockchain.get_block(best.hash) is not None:
+                # (O topo tambem pode ter chegado por relay durante o download.)
+                return True
+            self.node.events.warning("sync.incomplete", sources=",".join(sources))
+            # Topo que nao baixa (ou invalido): tenta o proximo.
+            tips = [tip for tip in tips if tip.hash != best.hash]
+        return False
+
+    def _fetch_tips(self) -> list[PeerTip]:
+        if not self.peers:
+            return []
+        locator = self.node.blockchain.locator()
+        workers = min(len(self.peers), self.max_workers)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            responses = list(
+                pool.map(
+                    lambda peer: (
+                        peer,
+                        self.node._send_message(peer, Protocol.request_tip(locator), True),
+                    ),
+                    self.peers,
+                )
+            )
+
+        tips = []
+        for peer, response in responses:
+            if not response or response.type != MessageType.RESPONSE_TIP:
+                continue
+            try:
+                tips.append(
+                    PeerTip(
+                        peer=peer,
+                        height=int(response.payload["height"]),
+                        hash=str(response.payload["hash"]),
+                        fork_height=int(response.payload["fork_height"]),
+                        pruned_height=int(response.payload.get("pruned_height", 0)),
+                        work=int(str(response.payload.get("work", "0")), 16),
+                    )
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+        return tips
+
+    def _download(
+        self,
+        start: int,
+        end: int,
+        sources: list[str],
+        pruned: dict[str, int] | None = None,
+    ) -> list[Block] | None:
+        chunks = [
+            _Chunk(first, min(first + self.chunk_size - 1, end))
+            for first in range(start, end + 1, self.chunk_size)
+        ]
+        pruned = pruned or {}
+        # Fontes que entregaram blocos invalidos: nao recebem mais chunks.
+        rejected: set[str] = set()
+        applier = _OrderedApplier(self.node, start)
+        # Janela limitada: evita guardar na memoria chunks muito a frente
+        # do proximo a ser validado.
+        window = self.max_workers * 4
+        workers = min(self.max_workers, max(1, len(sources) * 2))
+
+        ready: dict[int, list[Block]] = {}
+        pending: dict[Future, _Chunk] = {}
+        next_submit = 0
+        next_apply = 0
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+
+            def submit(chunk: _Chunk) -> bool:
+                usable = [peer for peer in sources if peer not in rejected]
+                if not usable or chunk.attempts >= len(sources) + 1:
+                    return False
+                able = [peer for peer in usable if pruned.get(peer, 0) < chunk.start]
+                candidates = able or usable
+                chunk.source = candidates[
+                    (chunk.start // self.chunk_size + chunk.attempts) % len(candidates)
+                ]
+                chunk.attempts += 1
+                pending[pool.submit(self._fetch_chunk, chunk.source, chunk)] = chunk
+                return True
+
+            while next_apply < len(chunks):
+                while next_submit < len(chunks) and next_submit < next_apply + window:
+                    submit(chunks[next_submit])
+                    next_submit += 1
+                if not pending:
+                    return None
+
+                done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk = pending.pop(future)
+                    result = future.result()
+                    if result is not None and chunk.source not in rejected:
+                        ready[chunk.start] = result
+                    elif not submit(chunk):
+                        # Sem outra fonte para refazer o chunk.
+                        return None
+
+                while next_apply < len(chunks) and chunks[next_apply].start in ready:
+                    chunk = chunks[next_apply]
+                    if not applier.feed(ready.pop(chunk.start)):
+                        # Blocos invalidos: o chunk e pedido a outra fonte.
+                        rejected.add(chunk.source)
+                        self.node.events.warning(
+                            "sync.invalid_chunk", peer=chunk.source, start=chunk.start
+                        )
+                        if not submit(chunk):
+                            return None
+                        for other in chunks[next_apply + 1 : next_submit]:
+                            if other.start in ready and other.source == chunk.source:
+                                del ready[other.start]
+                                if not submit(other):
+                                    return None
+                        break
+                    next_apply += 1
+
+        return applier.finish()
+
+    def _fetch_chunk(self, peer: str, chunk: _Chunk) -> list[Block] | None:
+        response = self.node._send_message(
+            peer, Protocol.request_blocks(chunk.start, chunk.end), True
+        )
+        if not response or response.type != MessageType.RESPONSE_BLOCKS:
+            return None
+        try:
+            blocks = [LazyBlock.from_dict(data) for data in response.payload["blocks"]]
+        except Exception:
+            return None
+        expected = list(range(chunk.start, chunk.end + 1))
+        if [block.index for block in blocks] != expected:
+            return None
+        return blocks
+
+
+class _OrderedApplier:
+    """Recebe chunks em ordem de altura e os aplica na blockchain do no."""
+
+    def __init__(self, node: "Node", start: int, window: int = ASSUME_VALID_WINDOW) -> None:
+        self.node = node
+        self.window = window
+        chain = node.blockchain.chain
+        # Se o primeiro bloco faltante estende o topo local, os blocos sao
+        # validados e anexados incrementalmente; senao ha um fork e a cadeia
+        # candidata e validada inteira no final (replace_chain).
+        self.fast_forward = start == len(chain)
+        self.candidate: list[Block] = [] if self.fast_forward else chain[:start]
+        self.applied: list[Block] = []
+        # Ancestrais do checkpoint (assume-valid) aguardando o bloco confiavel
+        # (no maximo `window` blocos mais um chunk).
+        self.held: list[Block] = []
+
+    def feed(self, blocks: list[Block]) -> bool:
+        """Aplica (ou guarda) o proximo chunk; False se ele nao for valido.
+
+        Um chunk refeito depois de uma falha parcial pode repetir blocos ja
+        anexados: esses sao ignorados.
+        """
+        if not self.fast_forward:
+            if not _linked(self.candidate[-1], blocks):
+                return False
+            self.candidate.extend(blocks)
+            return True
+        previous = self.held[-1] if self.held else self.node.blockchain.last_block
+        blocks = [block for block in blocks if block.index > previous.index]
+        if not blocks:
+            return True
+        checkpoint = self.node.blockchain.assume_valid
+        if (
+            checkpoint is not None
+            and blocks[0].index <= checkpoint.height
+            and (self.held or checkpoint.height - blocks[0].index < self.window)
+        ):
+            # Aplicados junto com o bloco do checkpoint, para que o
+            # encadeamento ate ele dispense a validacao das transacoes. Cada
+            # chunk so tem o encadeamento conferido ao chegar.
+            if not _linked(previous, blocks):
+                # Chunk fora do encadeamento: o que ja estava guardado entra
+                # com validacao completa e a sincronizacao para aqui.
+                self._extend_chunks(self.held)
+                self.held = []
+                return False
+            self.held.extend(blocks)
+            if blocks[-1].index < checkpoint.height:
+                return True
+            held, self.held = self.held, []
+            if held[checkpoint.height - held[0].index].hash != checkpoint.block_hash:
+                # Outra cadeia: validacao completa, um chunk por vez.
+                return self._extend_chunks(held)
+            return self._extend(held)
+        return self._extend(blocks)
+
+    def _extend(self, blocks: list[Block]) -> bool:
+        with self.node._chain_lock:
+            added = self.node.blockchain.extend_chain(blocks)
+        self.applied.extend(blocks[:added])
+        return added == len(blocks)
+
+    def _extend_chunks(self, blocks: list[Block]) -> bool:
+        # Libera o lock da cadeia entre os chunks.
+        for start in range(0, len(blocks), CHUNK_SIZE):
+            if not self._extend(blocks[start : start + CHUNK_SIZE]):
+                return False
+        return True
+
+    def finish(self) -> list[Block] | None:
+        if self.fast_forward:
+            # Download terminou antes do checkpoint: validacao completa.
+            if self.held and not self._extend_chunks(self.held):
+                return None
+            return self.applied
+        with self.node._chain_lock:
+            if not self.node.blockchain.replace_chain(self.candidate):
+                return None
+        return self.candidate
+
+
+def _linked(previous: Block, blocks: list[Block]) -> bool:
+    """Indices e `previous_hash` encadeados a partir de `previous`."""
+    for block in blocks:
+        if block.index != previous.index + 1 or block.previous_hash != previous.hash:
+            return False
+        previous = block
+    return True
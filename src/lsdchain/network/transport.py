@@ -0,0 +1,370 @@
+"""Transportes do no: interface comum e implementacao TCP (sockets)."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import socket
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable
+
+from ..observability.logs import EventLogger
+from .protocol import Message, MessageType
+from .ratelimit import InboundLimits, PeerRateLimiter
+
+if TYPE_CHECKING:
+    from .node import Node
+
+# Timeout curto para abrir conexao: peer morto nao deve custar 10 s.
+CONNECT_TIMEOUT = 3.0
+# Timeout de leitura/escrita apos conectado.
+IO_TIMEOUT = 10.0
+# Mensagens cujo remetente aguarda resposta na mesma conexao.
+REQUEST_TYPES = frozenset(
+    {
+        MessageType.REQUEST_CHAIN,
+        MessageType.REQUEST_TIP,
+        MessageType.REQUEST_BLOCKS,
+        MessageType.REQUEST_BLOCK_TXN,
+        MessageType.REQUEST_HEADERS,
+        MessageType.REQUEST_TX_PROOF,
+        MessageType.REQUEST_MEMPOOL_SKETCH,
+        MessageType.PING,
+    }
+)
+# Respostas: chegam na conexao aberta pela requisicao. Recebidas pelo
+# servidor, nao respondem a nada e sao descartadas.
+RESPONSE_TYPES = frozenset(
+    {
+        MessageType.RESPONSE_CHAIN,
+        MessageType.RESPONSE_TIP,
+        MessageType.RESPONSE_BLOCKS,
+        MessageType.RESPONSE_BLOCK_TXN,
+        MessageType.RESPONSE_HEADERS,
+        MessageType.RESPONSE_TX_PROOF,
+        MessageType.RESPONSE_MEMPOOL_SKETCH,
+        MessageType.PONG,
+    }
+)
+
+
+def _read_exact(sock: socket.socket, size: int) -> bytes:
+    """Le exatamente `size` bytes do socket ou encerra se a conexao fechar."""
+    data = b""
+    # recv() pode retornar menos bytes do que o pedido, por isso acumulamos.
+    while len(data) < size:
+        # sock.recv(n) bloqueia ate receber dados ou a conexao fechar.
+        chunk = sock.recv(size - len(data))
+        # Se recv retornar vazio, a outra ponta encerrou a conexao.
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+class Transport(ABC):
+    """Interface de transporte usada pelo `Node`.
+
+    O no nao conhece sockets: envia com `request`/`post` e recebe as
+    mensagens em `Node._process_message`, chamado pelo transporte.
+    Erros de conexao devem ser sinalizados com `OSError` (contam como
+    falha do peer no `PeerManager`).
+    """
+
+    # Transportes com threads proprias permitem ao no iniciar as suas
+    # (ex.: PING periodico); o simulador roda tudo em uma unica thread.
+    threaded = True
+
+    def __init__(self) -> None:
+        self.node: "Node" | None = None
+
+    def clock(self) -> float:
+        """Relogio usado pelo no (monotonico; virtual na simulacao)."""
+        return time.monotonic()
+
+    def start(self, node: "Node") -> None:
+        """Passa a entregar as mensagens recebidas para `node`."""
+        self.node = node
+
+    def stop(self) -> None:
+        """Para de receber mensagens."""
+
+    @abstractmethod
+    def request(
+        self, peer: str, message: Message, expect_response: bool, timeout: float
+    ) -> tuple[Message | None, float | None]:
+        """Envia `message` e devolve (resposta, RTT medido ou None)."""
+
+    @abstractmethod
+    def post(self, peer: str, message: Message) -> None:
+        """Envio sem resposta e sem bloquear o chamador (broadcast)."""
+
+    def flush(self, timeout: float) -> bool:
+        """Espera os envios de `post` em andamento; False se o prazo acabar."""
+        return True
+
+
+class _InboundItem:
+    """Mensagem na fila de processamento (com espaco para a resposta)."""
+
+    __slots__ = ("message", "response", "done")
+
+    def __init__(self, message: Message) -> None:
+        self.message = message
+        self.response: Message | None = None
+        self.done = threading.Event()
+
+
+class TcpTransport(Transport):
+    """Sockets TCP com framing [4 bytes tamanho][JSON] (Padrao_blockchain.pdf).
+
+    Aplica os limites de entrada (`InboundLimits`): conexoes por IP, tamanho
+    de frame, token buckets por tipo de mensagem e fila limitada consumida
+    por um numero fixo de threads.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        limits: InboundLimits | None = None,
+        send_workers: int = 16,
+    ) -> None:
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.limits = limits or InboundLimits()
+        self.logger = logging.getLogger(f"Node:{port}")
+        self.events = EventLogger(self.logger)
+        self._server: socket.socket | None = None
+        self._running = False
+        # Pool limitado para envios de broadcast (em vez de uma thread por envio).
+        self._send_pool = ThreadPoolExecutor(
+            max_workers=send_workers, thread_name_prefix=f"send-{port}"
+        )
+        self._rate_limiter = PeerRateLimiter(self.limits)
+        self._inbound: queue.Queue[_InboundItem] = queue.Queue(self.limits.queue_size)
+        self._connections: dict[str, int] = {}
+        self._connections_lock = threading.Lock()
+        self.dropped_messages = 0
+        self._dropped_lock = threading.Lock()
+        # Envios de `post` ainda no pool (para `flush`).
+        self._posted = 0
+        self._posted_done = threading.Condition()
+
+    def start(self, node: "Node") -> None:
+        super().start(node)
+        # socket(AF_INET, SOCK_STREAM) => TCP/IPv4.
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # SO_REUSEADDR permite reutilizar a porta rapidamente apos fechar.
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # bind() associa o socket ao endereco local (host:porta).
+        self._server.bind((self.host, self.port))
+        # listen() coloca o socket em modo servidor (fila/backlog = 20).
+        self._server.listen(20)
+        self._running = True
+
+        # Thread separada para aceitar conexoes sem travar o processo.
+        thread = threading.Thread(target=self._accept_loop, daemon=True)
+        thread.start()
+        # Threads fixas que processam a fila de mensagens recebidas.
+        for _ in range(self.limits.workers):
+            threading.Thread(target=self._inbound_worker, daemon=True).start()
+
+    def stop(self) -> None:
+        self._running = False
+        if self._server:
+            self._server.close()
+        self._send_pool.shutdown(wait=False)
+
+    def request(
+        self, peer: str, message: Message, expect_response: bool, timeout: float
+    ) -> tuple[Message | None, float | None]:
+        host, port = peer.rsplit(":", 1)
+        # Cria socket cliente TCP e conecta no peer.
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            # settimeout() evita bloqueio infinito em rede.
+            sock.settimeout(min(CONNECT_TIMEOUT, timeout))
+            # connect() abre conexao TCP com o peer; seu tempo estima o RTT.
+            started = time.monotonic()
+            sock.connect((host, int(port)))
+            rtt = time.monotonic() - started
+            sock.settimeout(timeout)
+            # sendall() envia mensagem completa com framing.
+            sock.sendall(message.to_bytes())
+
+            if not expect_response:
+                return None, rtt
+            # Se esperado, le a resposta com o mesmo framing.
+            length_raw = _read_exact(sock, 4)
+            if not length_raw:
+                return None, rtt
+            length = int.from_bytes(length_raw, "big")
+            # recv() dentro de _read_exact le o corpo completo.
+            body = _read_exact(sock, length)
+            if not body:
+                return None, rtt
+            return Message.from_bytes(body), rtt
+
+    def post(self, peer: str, message: Message) -> None:
+        # Envio no pool limitado; o no registra sucesso/falha do peer.
+        send: Callable[..., object] = self.node._send_message
+        with self._posted_done:
+            self._posted += 1
+        try:
+            future = self._send_pool.submit(send, peer, message, False)
+        except RuntimeError:
+            # Pool encerrado (no parando).
+            self._post_finished()
+            return
+        future.add_done_callback(self._post_finished)
+
+    def _post_finished(self, _future: object = None) -> None:
+        with self._posted_done:
+            self._posted -= 1
+            if not self._posted:
+                self._posted_done.notify_all()
+
+    def flush(self, timeout: float) -> bool:
+        with self._posted_done:
+            return self._posted_done.wait_for(lambda: not self._posted, timeout)
+
+    def _accept_loop(self) -> None:
+        """Loop interno que aceita conexoes de clientes."""
+        while self._running:
+            try:
+                # accept() bloqueia ate chegar uma conexao; retorna o socket do cliente.
+                client_socket, client_address = self._server.accept()
+                ip = client_address[0]
+                if not self._acquire_connection(ip):
+                    # Limite de conexoes atingido: recusa sem criar thread.
+                    client_socket.close()
+                    continue
+                # Trata cada cliente em thread separada para nao bloquear novas conexoes.
+                thread = threading.Thread(
+                    target=self._handle_client, args=(client_socket, ip), daemon=True
+                )
+                thread.start()
+            except Exception as exc:
+                if self._running:
+                    self.events.error("connection.accept_failed", error=exc)
+
+    def _acquire_connection(self, ip: str) -> bool:
+        with self._connections_lock:
+            total = sum(self._connections.values())
+            per_ip = self._connections.get(ip, 0)
+            if total >= self.limits.max_connections:
+                return False
+            if (
+                per_ip >= self.limits.max_connections_per_ip
+                and not self._rate_limiter.is_exempt(ip)
+            ):
+                return False
+            self._connections[ip] = per_ip + 1
+            return True
+
+    def _release_connection(self, ip: str) -> None:
+        with self._connections_lock:
+            remaining = self._connections.get(ip, 0) - 1
+            if remaining > 0:
+                self._connections[ip] = remaining
+            else:
+                self._connections.pop(ip, None)
+
+    def _handle_client(self, client_socket: socket.socket, ip: str = "") -> None:
+        """Processa uma conexao: le mensagem, trata e responde."""
+        try:
+            # Evita que um cliente lento prenda a thread indefinidamente.
+            client_socket.settimeout(IO_TIMEOUT)
+            # Le o tamanho (4 bytes) e depois o JSON da mensagem.
+            length_raw = _read_exact(client_socket, 4)
+            if len(length_raw) < 4:
+                return
+            length = int.from_bytes(length_raw, "big")
+            if length > self.limits.max_message_size:
+                self.events.warning("frame.rejected", ip=ip, size=length)
+                return
+            if not self._rate_limiter.allow_frame(ip):
+                self._shed("limite de frames", ip)
+                return
+            # sock.recv dentro de _read_exact garante leitura completa do corpo.
+            body = _read_exact(client_socket, length)
+            if len(body) < length or not body:
+                return
+
+            message = Message.from_bytes(body)
+            if not self._rate_limiter.allow(ip, message.type):
+                self._shed(f"limite de {message.type.value}", ip)
+                return
+            if message.type in RESPONSE_TYPES:
+                self._shed("resposta sem requisicao", ip)
+                return
+
+            # Processa a mensagem na fila limitada e responde (quando necessario).
+            response = self._enqueue(message)
+            if response:
+                response.sender = self.node.address
+                # sendall() envia todos os bytes da resposta.
+                client_socket.sendall(response.to_bytes())
+        except Exception as exc:
+            self.events.error("client.failed", ip=ip, error=exc)
+        finally:
+            # close() encerra a conexao com o cliente.
+            client_socket.close()
+            self._release_connection(ip)
+
+    def _enqueue(self, message: Message) -> Message | None:
+        """Coloca a mensagem na fila de processamento, descartando sob carga.
+
+        Transacoes sao descartadas primeiro (fila acima de `shed_threshold`);
+        os demais tipos so sao descartados com a fila cheia. Apenas
+        requisicoes aguardam o processamento para devolver a resposta.
+        """
+        limits = self.limits
+        if (
+            message.type == MessageType.NEW_TRANSACTION
+            and self._inbound.qsize() >= limits.queue_size * limits.shed_threshold
+        ):
+            self._shed("fila ocupada", message.sender)
+            return None
+        item = _InboundItem(message)
+        try:
+            self._inbound.put_nowait(item)
+        except queue.Full:
+            self._shed("fila cheia", message.sender)
+            return None
+        if message.type not in REQUEST_TYPES:
+            return None
+        if not item.done.wait(IO_TIMEOUT):
+            return None
+        return item.response
+
+    def _inbound_worker(self) -> None:
+        """Consome a fila de mensagens recebidas."""
+        while self._running:
+            try:
+                item = self._inbound.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                item.response = self.node._process_message(item.message)
+            except Exception as exc:
+                self.events.error(
+                    "message.failed",
+                    type=item.message.type.value,
+                    sender=item.message.sender,
+                    error=exc,
+                )
+            finally:
+                item.done.set()
+
+    def _shed(self, reason: str, origin: str) -> None:
+        # Chamado pelas threads de conexao ao mesmo tempo.
+        with self._dropped_lock:
+            self.dropped_messages += 1
+            total = self.dropped_messages
+        # Amostrado pela politica do evento (um registro a cada 100).
+        self.events.warning("message.dropped", reason=reason, origin=origin, total=total)
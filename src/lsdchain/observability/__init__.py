@@ -0,0 +1,20 @@
+"""Observabilidade do no: metricas, tracing e logging estruturado."""
+
+from .logs import EventLogger, EventPolicy, LogPolicy, configure_logging
+from .metrics import Counter, Gauge, Histogram, MetricsRegistry, MetricsServer
+from .tracing import TRACER, Tracer, install_signal_toggle
+
+__all__ = [
+    "Counter",
+    "EventLogger",
+    "EventPolicy",
+    "Gauge",
+    "Histogram",
+    "LogPolicy",
+    "MetricsRegistry",
+    "MetricsServer",
+    "TRACER",
+    "configure_logging",
+    "Tracer",
+    "install_signal_toggle",
+]
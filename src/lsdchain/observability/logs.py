@@ -0,0 +1,226 @@
+"""Logging estruturado e assincrono, com amostragem e limite por evento.
+
+- `configure_logging` instala no logger raiz um handler de fila: as
+  threads do no apenas enfileiram o registro (sem I/O) e uma thread de
+  fundo formata e escreve. Com a fila cheia o registro e descartado, nunca
+  bloqueia quem esta logando.
+- `EventLogger` registra eventos nomeados com campos chave=valor
+  (`event=message.received type=NEW_BLOCK sender=...`). Cada evento pode
+  ser amostrado (1 de cada N) e limitado por segundo; o total suprimido
+  aparece no proximo registro do mesmo evento (`suppressed=N`).
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, TextIO
+
+DEFAULT_QUEUE_SIZE = 10_000
+
+
+@dataclass(frozen=True)
+class EventPolicy:
+    """Amostragem (1 de cada `sample_every`) e teto de registros por segundo."""
+
+    sample_every: int = 1
+    max_per_second: float | None = None
+
+
+def _default_policies() -> dict[str, EventPolicy]:
+    return {
+        # Uma linha por mensagem recebida: so uma amostra limitada.
+        "message.received": EventPolicy(sample_every=10, max_per_second=20),
+        "transaction.added": EventPolicy(max_per_second=20),
+        "send.failed": EventPolicy(max_per_second=5),
+        "message.dropped": EventPolicy(sample_every=100),
+    }
+
+
+@dataclass
+class LogPolicy:
+    """Politicas por nome de evento; eventos sem politica nao sao limitados."""
+
+    events: dict[str, EventPolicy] = field(default_factory=_default_policies)
+
+
+class _EventState:
+    __slots__ = ("calls", "window", "in_window", "suppressed", "lock")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.window = 0
+        self.in_window = 0
+        self.suppressed = 0
+        self.lock = threading.Lock()
+
+
+class EventLogger:
+    """Registra eventos estruturados em um `logging.Logger`."""
+
+    def __init__(self, logger: logging.Logger, policy: LogPolicy | None = None) -> None:
+        self.logger = logger
+        self.policy = policy or LogPolicy()
+        self._states: dict[str, _EventState] = {}
+
+    def debug(self, event: str, **fields: Any) -> None:
+        self.log(logging.DEBUG, event, fields)
+
+    def info(self, event: str, **fields: Any) -> None:
+        self.log(logging.INFO, event, fields)
+
+    def warning(self, event: str, **fields: Any) -> None:
+        self.log(logging.WARNING, event, fields)
+
+    def error(self, event: str, **fields: Any) -> None:
+        self.log(logging.ERROR, event, fields)
+
+    def log(self, level: int, event: str, fields: dict[str, Any]) -> None:
+        # Nivel desligado: sai antes de qualquer outro custo.
+        if not self.logger.isEnabledFor(level):
+            return
+        policy = self.policy.events.get(event)
+        if policy is not None:
+            suppressed = self._admit(event, policy)
+            if suppressed is None:
+                return
+            if suppressed:
+                fields["suppressed"] = suppressed
+        self.logger.log(level, event, extra={"event": event, "fields": fields})
+
+    def _admit(self, event: str, policy: EventPolicy) -> int | None:
+        """None = descartar; senao, quantos registros foram suprimidos antes."""
+        state = self._states.get(event)
+        if state is None:
+            state = self._states.setdefault(event, _EventState())
+        with state.lock:
+            state.calls += 1
+            if policy.sample_every > 1 and state.calls % policy.sample_every:
+                state.suppressed += 1
+                return None
+            if policy.max_per_second is not None:
+                window = int(time.monotonic())
+                if window != state.window:
+                    state.window = window
+                    state.in_window = 0
+                if state.in_window >= policy.max_per_second:
+                    state.suppressed += 1
+                    return None
+                state.in_window += 1
+            suppressed, state.suppressed = state.suppressed, 0
+            return suppressed
+
+
+def _quote(value: Any) -> str:
+    text = str(value)
+    if not text or any(char in text for char in ' ="\n'):
+        return json.dumps(text)
+    return text
+
+
+class StructuredFormatter(logging.Formatter):
+    """Uma linha por registro: `chave=valor` (logfmt) ou JSON."""
+
+    def __init__(self, json_lines: bool = False) -> None:
+        super().__init__()
+        self.json_lines = json_lines
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields: dict[str, Any] = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created))
+            + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+        }
+        event = getattr(record, "event", None)
+        if event is not None:
+            fields["event"] = event
+            fields.update(getattr(record, "fields", {}))
+        else:
+            fields["msg"] = record.getMessage()
+        if record.exc_info:
+            fields["exc"] = self.formatException(record.exc_info)
+        if self.json_lines:
+            return json.dumps(fields, default=str)
+        return " ".join(f"{key}={_quote(value)}" for key, value in fields.items())
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Enfileira sem formatar e descarta quando a fila esta cheia."""
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # A formatacao fica para a thread de fundo (mesmo processo: o
+        # registro nao precisa ser serializado aqui).
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: logging.handlers.QueueListener | None = None
+_handler: _NonBlockingQueueHandler | None = None
+_configure_lock = threading.Lock()
+
+
+def configure_logging(
+    level: int = logging.INFO,
+    stream: TextIO | None = None,
+    json_lines: bool = False,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    force: bool = False,
+) -> bool:
+    """Instala o handler de fila no logger raiz (substitui `basicConfig`).
+
+    Como `basicConfig`, nao altera uma configuracao ja existente, a menos
+    que `force=True`. Retorna True se a configuracao foi instalada.
+    """
+    global _listener, _handler
+    with _configure_lock:
+        root = logging.getLogger()
+        if root.handlers and not force:
+            return False
+        shutdown_logging()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+
+        output = logging.StreamHandler(stream or sys.stderr)
+        output.setFormatter(StructuredFormatter(json_lines))
+        log_queue: queue.Queue = queue.Queue(queue_size)
+        _handler = _NonBlockingQueueHandler(log_queue)
+        _listener = logging.handlers.QueueListener(
+            log_queue, output, respect_handler_level=True
+        )
+        _listener.start()
+        root.addHandler(_handler)
+        root.setLevel(level)
+        return True
+
+
+def dropped_records() -> int:
+    """Registros descartados por fila cheia desde a configuracao."""
+    return _handler.dropped if _handler else 0
+
+
+def shutdown_logging() -> None:
+    """Esvazia a fila e para a thread de escrita."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,344 @@
+"""Registro de metricas (contadores, gauges, histogramas) com exposicao Prometheus.
+
+Cada metrica pode ter rotulos fixos na criacao (ex.: `type`, `reason`);
+`labels(...)` devolve a serie correspondente, que pode ser guardada pelo
+chamador para que o caminho quente faca apenas uma soma sob lock.
+
+Exemplo:
+    registry = MetricsRegistry()
+    received = registry.counter("messages_total", "Mensagens", ("type",))
+    received.labels("NEW_BLOCK").inc()
+    registry.snapshot()          # dicionario para uso em Python
+    registry.to_prometheus()     # texto no formato de exposicao Prometheus
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Iterable
+
+# Limites padrao dos histogramas de latencia (segundos).
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value", "function", "_lock")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        # Calculado so na coleta (ex.: tamanho do mempool): custo zero no uso.
+        self.function: Callable[[], float] | None = None
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self.function = function
+
+    def get(self) -> float:
+        if self.function is not None:
+            try:
+                return float(self.function())
+            except Exception:
+                return math.nan
+        return self.value
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count", "_lock")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        # Uma posicao por limite + a do +Inf.
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        position = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[position] += 1
+            self.sum += value
+            self.count += 1
+
+    def cumulative(self) -> list[int]:
+        total = 0
+        result = []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...]) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self._children: dict[tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        if not labelnames:
+            self._default = self._child(())
+
+    @abstractmethod
+    def _new_child(self) -> Any:
+        """Serie nova (sem rotulos ou para uma combinacao de rotulos)."""
+
+    def _child(self, values: tuple[str, ...]) -> Any:
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def labels(self, *values: Any) -> Any:
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} espera rotulos {self.labelnames}")
+        return self._child(tuple(str(value) for value in values))
+
+    def series(self) -> list[tuple[tuple[str, ...], Any]]:
+        with self._lock:
+            return sorted(self._children.items())
+
+
+class Counter(_Metric):
+    """Valor que so cresce (eventos, bytes, rejeicoes)."""
+
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+
+class Gauge(_Metric):
+    """Valor instantaneo (altura da cadeia, tamanho do mempool, hashrate)."""
+
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._default.set_function(function)
+
+    def get(self) -> float:
+        return self._default.get()
+
+
+class Histogram(_Metric):
+    """Distribuicao de valores (latencias) em faixas cumulativas."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...],
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help_text, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], **extra: str) -> str:
+    pairs = list(zip(names, values)) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class MetricsRegistry:
+    """Conjunto de metricas de um no (um registro por no, nao global)."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls: type, name: str, *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, *args, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metrica {name} ja registrada como {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help_text: str = "", labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help_text, tuple(labelnames))
+
+    def gauge(self, name: str, help_text: str = "", labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help_text, tuple(labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str = "",
+        labelnames: tuple[str, ...] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, tuple(labelnames), buckets)
+
+    def get(self, name: str) -> _Metric | None:
+        return self._metrics.get(name)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Valores atuais: {nome: {"type", "help", "values": {rotulos: valor}}}.
+
+        As chaves de `values` sao os rotulos no formato `a=x,b=y` ("" sem
+        rotulos); histogramas trazem `count`, `sum` e `buckets` cumulativos.
+        """
+        result: dict[str, dict[str, Any]] = {}
+        for metric in list(self._metrics.values()):
+            values: dict[str, Any] = {}
+            for labels, child in metric.series():
+                key = ",".join(f"{n}={v}" for n, v in zip(metric.labelnames, labels))
+                if isinstance(child, _HistogramChild):
+                    bounds = [str(b) for b in metric.buckets] + ["+Inf"]
+                    values[key] = {
+                        "count": child.count,
+                        "sum": child.sum,
+                        "buckets": dict(zip(bounds, child.cumulative())),
+                    }
+                elif isinstance(child, _GaugeChild):
+                    values[key] = child.get()
+                else:
+                    values[key] = child.value
+            result[metric.name] = {"type": metric.kind, "help": metric.help, "values": values}
+        return result
+
+    def to_prometheus(self) -> str:
+        """Formato de exposicao em texto do Prometheus (versao 0.0.4)."""
+        lines: list[str] = []
+        for metric in list(self._metrics.values()):
+            if metric.help:
+                lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for labels, child in metric.series():
+                if isinstance(child, _HistogramChild):
+                    bounds = [_format_value(b) for b in metric.buckets] + ["+Inf"]
+                    for bound, total in zip(bounds, child.cumulative()):
+                        label_text = _format_labels(metric.labelnames, labels, le=bound)
+                        lines.append(f"{metric.name}_bucket{label_text} {total}")
+                    label_text = _format_labels(metric.labelnames, labels)
+                    lines.append(f"{metric.name}_sum{label_text} {_format_value(child.sum)}")
+                    lines.append(f"{metric.name}_count{label_text} {child.count}")
+                else:
+                    value = child.get() if isinstance(child, _GaugeChild) else child.value
+                    label_text = _format_labels(metric.labelnames, labels)
+                    lines.append(f"{metric.name}{label_text} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Servidor HTTP local que expoe `/metrics` no formato Prometheus."""
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9100) -> None:
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: ThreadingHTTPServer | None = None
+
+    def start(self) -> None:
+        registry = self.registry
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 (nome exigido pelo http.server)
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                # Sem log por requisicao (o scrape e periodico).
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        # Porta 0: o sistema escolhe; a porta real fica disponivel aqui.
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
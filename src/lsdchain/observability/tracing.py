@@ -0,0 +1,228 @@
+"""Tracing opcional dos caminhos quentes, exportado no formato Chrome trace.
+
+Desligado, o tracer nao custa nada: os pontos de trace (`TRACE_POINTS`) so
+sao envolvidos por wrappers quando `enable()` e chamado, e `disable()`
+restaura as funcoes originais. Ligado, cada chamada vira um evento
+"complete" (`ph: "X"`) com inicio, duracao e thread, que pode ser aberto
+em chrome://tracing ou https://ui.perfetto.dev.
+
+Exemplo:
+    TRACER.enable(sample_every=10)
+    ...
+    TRACER.disable()
+    TRACER.export_chrome("trace.json")
+"""
+
+from __future__ import annotations
+
+import functools
+import importlib
+import json
+import os
+import signal
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+
+@dataclass(frozen=True)
+class TracePoint:
+    """Funcao instrumentada: `modulo:Classe.metodo`."""
+
+    target: str
+    category: str
+    # Nome do evento a partir dos argumentos (ex.: tipo da mensagem).
+    name: Callable[[tuple[Any, ...]], str] | None = None
+
+
+TRACE_POINTS = (
+    TracePoint("lsdchain.network.protocol:Message.from_bytes", "codec"),
+    TracePoint("lsdchain.core.block:Block.from_dict", "codec"),
+    # Rede e importacao decodificam com LazyBlock (transacoes no primeiro acesso).
+    TracePoint("lsdchain.core.block:LazyBlock.from_dict", "codec"),
+    TracePoint("lsdchain.core.block:LazyBlock.transactions", "codec"),
+    TracePoint("lsdchain.core.blockchain:Blockchain.is_valid_chain", "validation"),
+    TracePoint("lsdchain.core.blockchain:Blockchain.add_block", "validation"),
+    TracePoint("lsdchain.core.blockchain:Blockchain.extend_chain", "validation"),
+    TracePoint("lsdchain.core.blockchain:Blockchain.add_transaction", "mempool"),
+    TracePoint("lsdchain.core.blockchain:Blockchain.add_transactions", "mempool"),
+    TracePoint("lsdchain.core.blockchain:Blockchain.get_balance", "balance"),
+    TracePoint("lsdchain.core.mining:Miner.mine_block", "mining"),
+    TracePoint(
+        "lsdchain.network.node:Node._process_message",
+        "network",
+        lambda args: f"Node._process_message:{args[1].type.value}",
+    ),
+    TracePoint(
+        "lsdchain.network.node:Node._send_message",
+        "network",
+        lambda args: f"Node._send_message:{args[2].type.value}",
+    ),
+)
+
+
+def _resolve(target: str) -> tuple[Any, str]:
+    module_name, qualname = target.split(":", 1)
+    owner: Any = importlib.import_module(module_name)
+    *path, attribute = qualname.split(".")
+    for part in path:
+        owner = getattr(owner, part)
+    return owner, attribute
+
+
+class Tracer:
+    """Coleta spans de duracao em memoria (buffer limitado)."""
+
+    def __init__(self, max_events: int = 1_000_000) -> None:
+        self._events: deque[tuple[str, str, int, int, int, dict[str, Any] | None]] = deque(
+            maxlen=max_events
+        )
+        self._origin = time.perf_counter_ns()
+        # Funcoes originais substituidas pelos wrappers: (dono, atributo, valor).
+        self._patched: list[tuple[Any, str, Any]] = []
+        self._lock = threading.Lock()
+        self.sample_every = 1
+        self._calls = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._patched)
+
+    def enable(
+        self, sample_every: int = 1, points: tuple[TracePoint, ...] = TRACE_POINTS
+    ) -> None:
+        """Instala os wrappers; com `sample_every=N` registra 1 de cada N chamadas."""
+        with self._lock:
+            if self._patched:
+                return
+            self.sample_every = max(1, sample_every)
+            for point in points:
+                owner, attribute = _resolve(point.target)
+                original = owner.__dict__[attribute]
+                setattr(owner, attribute, self._wrap(original, point))
+                self._patched.append((owner, attribute, original))
+
+    def disable(self) -> None:
+        """Restaura as funcoes originais (os eventos coletados sao mantidos)."""
+        with self._lock:
+            for owner, attribute, original in reversed(self._patched):
+                setattr(owner, attribute, original)
+            self._patched.clear()
+
+    def toggle(self) -> bool:
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable(self.sample_every)
+        return self.enabled
+
+    def clear(self) -> None:
+        self._events.clear()
+
+    def _wrap(self, original: Any, point: TracePoint) -> Any:
+        if isinstance(original, property):
+            # Property: so a leitura e medida.
+            return property(
+                self._wrap(original.fget, point), original.fset, original.fdel, original.__doc__
+            )
+        # classmethod/staticmethod: envolve a funcao e refaz o descritor.
+        descriptor = type(original) if isinstance(original, (classmethod, staticmethod)) else None
+        func = original.__func__ if descriptor else original
+        default_name = point.target.split(":", 1)[1]
+        category = point.category
+        name_of = point.name
+        tracer = self
+
+        @functools.wraps(func)
+        def traced(*args: Any, **kwargs: Any) -> Any:
+            tracer._calls += 1
+            if tracer._calls % tracer.sample_every:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end = time.perf_counter_ns()
+                name = default_name
+                if name_of is not None:
+                    try:
+                        name = name_of(args)
+                    except Exception:
+                        pass
+                tracer._events.append(
+                    (name, category, start, end, threading.get_ident(), None)
+                )
+
+        return descriptor(traced) if descriptor else traced
+
+    @contextmanager
+    def span(self, name: str, category: str = "app", **args: Any) -> Iterator[None]:
+        """Span manual; sem custo alem de um teste quando desligado."""
+        if not self._patched:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self._events.append(
+                (name, category, start, time.perf_counter_ns(), threading.get_ident(), args or None)
+            )
+
+    def to_chrome(self) -> dict[str, Any]:
+        """Eventos no formato Chrome trace (microssegundos)."""
+        pid = os.getpid()
+        events = []
+        for name, category, start, end, tid, args in list(self._events):
+            event: dict[str, Any] = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self._origin) / 1000,
+                "dur": (end - start) / 1000,
+                "pid": pid,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = args
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome(self, path: str) -> int:
+        """Grava o trace em `path`; retorna o numero de eventos."""
+        data = self.to_chrome()
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle)
+        return len(data["traceEvents"])
+
+
+# Tracer do processo (os pontos instrumentados sao globais).
+TRACER = Tracer()
+
+
+def install_signal_toggle(
+    path: str, tracer: Tracer = TRACER, signum: int | None = None
+) -> bool:
+    """Liga/desliga o tracing ao receber o sinal (padrao SIGUSR1).
+
+    Ao desligar, grava o trace em `path`. Retorna False onde o sinal nao
+    existe (Windows) ou fora da thread principal.
+    """
+    if signum is None:
+        signum = getattr(signal, "SIGUSR1", None)
+    if signum is None or threading.current_thread() is not threading.main_thread():
+        return False
+
+    def _handler(_signum: int, _frame: Any) -> None:
+        # Apenas agenda: o sinal pode chegar no meio de um wrapper.
+        threading.Thread(target=_toggle, daemon=True).start()
+
+    def _toggle() -> None:
+        if not tracer.toggle():
+            tracer.export_chrome(path)
+
+    signal.signal(signum, _handler)
+    return True
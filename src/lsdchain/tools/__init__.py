@@ -0,0 +1 @@
+"""Ferramentas auxiliares (geracao de dados sinteticos, importacao/exportacao)."""
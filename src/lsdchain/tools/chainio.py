@@ -0,0 +1,445 @@
+"""Exportacao e importacao da cadeia em streaming (NDJSON ou block store).
+
+Mover uma cadeia entre maquinas ou semear um no novo sem `REQUEST_CHAIN`
+(que monta a cadeia inteira na memoria duas vezes). Os blocos sao lidos e
+escritos um por vez:
+
+- NDJSON: uma linha por bloco, `{"hash": "<hex>", "block": {...}}`, em que
+  `block` e exatamente o JSON sobre o qual o hash foi calculado
+  (`Block.hash_preimage`). Linhas no formato de `Block.to_dict` tambem sao
+  aceitas na importacao.
+- block store: `MAGIC` seguido de registros
+  `[4 bytes tamanho big-endian][32 bytes do hash][JSON do hash comprimido (zlib)]`.
+
+Na importacao, o hash de cada bloco e conferido direto sobre os bytes lidos
+(SHA-256 + verificacao de que o JSON esta na forma canonica), em lotes que
+podem ser distribuidos entre processos; a validacao de encadeamento, PoW e
+saldos usa um unico ledger corrente e os indices sao montados no final
+(`Blockchain.bulk_load`).
+
+Uso:
+    PYTHONPATH=src python -m lsdchain.tools.chainio export chain.json chain.lsdstore --format store
+    PYTHONPATH=src python -m lsdchain.tools.chainio import chain.lsdstore --out chain.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import IO, Any, Callable, Iterable, Iterator
+
+from ..core.block import GENESIS_HASH, Block, LazyBlock
+from ..core.blockchain import AssumeValid, Blockchain
+from ..core.difficulty import Difficulty
+
+FORMATS = ("ndjson", "store")
+MAGIC = b"LSDSTORE1\n"
+_RECORD = struct.Struct(">I32s")
+# Prefixo fixo das linhas NDJSON escritas por este modulo (leitura sem reserializar).
+_LINE_PREFIX = b'{"hash": "'
+_LINE_MIDDLE = b'", "block": '
+# Blocos por lote de verificacao e intervalo entre relatorios de progresso.
+BATCH_SIZE = 256
+PROGRESS_EVERY = 1000
+_BLOCK_KEYS = frozenset(("index", "nonce", "previous_hash", "timestamp", "transactions"))
+_TX_KEYS = frozenset(("id", "origem", "destino", "valor", "timestamp"))
+
+Record = tuple[str, bytes]
+
+
+@dataclass
+class TransferProgress:
+    """Andamento de uma exportacao/importacao."""
+
+    blocks: int
+    bytes: int
+    seconds: float
+    done: bool = False
+
+    @property
+    def blocks_per_second(self) -> float:
+        return self.blocks / self.seconds if self.seconds > 0 else 0.0
+
+
+ProgressCallback = Callable[[TransferProgress], None]
+
+
+class _Progress:
+    def __init__(self, callback: ProgressCallback | None) -> None:
+        self.callback = callback
+        self.started = time.perf_counter()
+        self.blocks = 0
+        self.bytes = 0
+
+    def add(self, size: int) -> None:
+        self.blocks += 1
+        self.bytes += size
+        if self.callback is not None and self.blocks % PROGRESS_EVERY == 0:
+            self.report()
+
+    def report(self, done: bool = False) -> TransferProgress:
+        progress = TransferProgress(
+            self.blocks, self.bytes, time.perf_counter() - self.started, done
+        )
+        if self.callback is not None:
+            self.callback(progress)
+        return progress
+
+
+## escrita
+def _write_record(handle: IO[bytes], fmt: str, block_hash: str, preimage: bytes) -> int:
+    if fmt == "store":
+        data = zlib.compress(preimage, 1)
+        handle.write(_RECORD.pack(len(data), bytes.fromhex(block_hash)))
+        handle.write(data)
+        return _RECORD.size + len(data)
+    line = _LINE_PREFIX + block_hash.encode() + _LINE_MIDDLE + preimage + b"}\n"
+    handle.write(line)
+    return len(line)
+
+
+def write_records(
+    records: Iterable[Record],
+    path: str,
+    fmt: str = "ndjson",
+    on_progress: ProgressCallback | None = None,
+) -> TransferProgress:
+    """Grava registros (hash, bytes do hash) no formato escolhido."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato desconhecido: {fmt} (use {', '.join(FORMATS)})")
+    progress = _Progress(on_progress)
+    with open(path, "wb") as handle:
+        if fmt == "store":
+            handle.write(MAGIC)
+        for block_hash, preimage in records:
+            progress.add(_write_record(handle, fmt, block_hash, preimage))
+    return progress.report(done=True)
+
+
+def append_records(records: Iterable[Record], path: str) -> int:
+    """Acrescenta registros ao fim de um block store (criado se nao existir).
+
+    Retorna o tamanho final do arquivo; e o ponto de corte usado para
+    descartar um registro incompleto depois de uma queda.
+    """
+    with open(path, "ab") as handle:
+        if handle.tell() == 0:
+            handle.write(MAGIC)
+        for block_hash, preimage in records:
+            _write_record(handle, "store", block_hash, preimage)
+        handle.flush()
+        os.fsync(handle.fileno())
+        return handle.tell()
+
+
+def block_records(blocks: Iterable[Block]) -> Iterator[Record]:
+    for block in blocks:
+        if block.hash == GENESIS_HASH:
+            # Genesis do padrao: o hash e sobre o timestamp inteiro (0), que
+            # `Block.from_dict` converte para 0.0.
+            block = Block.create_genesis()
+        yield block.hash, block.hash_preimage()
+
+
+def export_chain(
+    blockchain: Blockchain,
+    path: str,
+    fmt: str = "ndjson",
+    on_progress: ProgressCallback | None = None,
+) -> TransferProgress:
+    """Exporta a cadeia (do genesis ao topo), um bloco por vez."""
+    if blockchain.pruned_height:
+        raise ValueError("Cadeia podada: os corpos dos blocos antigos nao existem mais")
+    return write_records(block_records(blockchain.chain), path, fmt, on_progress)
+
+
+## leitura
+def _ndjson_record(line: bytes) -> Record:
+    line = line.rstrip(b"\r\n")
+    start = len(_LINE_PREFIX)
+    middle = start + 64
+    if (
+        line.startswith(_LINE_PREFIX)
+        and line[middle : middle + len(_LINE_MIDDLE)] == _LINE_MIDDLE
+        and line.endswith(b"}")
+    ):
+        return line[start:middle].decode("ascii"), line[middle + len(_LINE_MIDDLE) : -1]
+    # Linha escrita por outra ferramenta: {"hash", "block"} ou Block.to_dict.
+    try:
+        data = json.loads(line)
+        if "block" in data:
+            block_hash, fields = data["hash"], data["block"]
+        else:
+            block_hash = data.pop("hash")
+            fields = data
+    except (KeyError, TypeError, AttributeError):
+        raise ValueError("Linha NDJSON sem hash/bloco") from None
+    return str(block_hash), json.dumps(fields, sort_keys=True).encode()
+
+
+def read_records(path: str) -> Iterator[Record]:
+    """Registros (hash, bytes do hash) de um arquivo NDJSON ou block store."""
+    with open(path, "rb") as handle:
+        if handle.read(len(MAGIC)) == MAGIC:
+            while True:
+                header = handle.read(_RECORD.size)
+                if not header:
+                    return
+                if len(header) < _RECORD.size:
+                    raise ValueError("Block store truncado")
+                size, digest = _RECORD.unpack(header)
+                data = handle.read(size)
+                if len(data) < size:
+                    raise ValueError("Block store truncado")
+                try:
+                    preimage = zlib.decompress(data)
+                except zlib.error:
+                    raise ValueError("Block store corrompido") from None
+                yield digest.hex(), preimage
+        handle.seek(0)
+        for line in handle:
+            if line.strip():
+                yield _ndjson_record(line)
+
+
+def store_offsets(path: str) -> Iterator[tuple[str, int]]:
+    """(hash, posicao do fim) de cada registro completo de um block store.
+
+    Le so os cabecalhos e para no primeiro registro incompleto (queda no
+    meio de uma gravacao).
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as handle:
+        if handle.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} nao e um block store")
+        offset = len(MAGIC)
+        while True:
+            header = handle.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                return
+            length, digest = _RECORD.unpack(header)
+            offset += _RECORD.size + length
+            if offset > size:
+                return
+            handle.seek(offset)
+            yield digest.hex(), offset
+
+
+def _check_record(block_hash: str, preimage: bytes, fields: dict[str, Any]) -> str | None:
+    if hashlib.sha256(preimage).hexdigest() != block_hash:
+        return "hash"
+    # So a forma canonica (sort_keys) e o mesmo JSON que o bloco reconstruido hasheia.
+    if json.dumps(fields, sort_keys=True).encode() != preimage:
+        return "encoding"
+    if fields.keys() != _BLOCK_KEYS or any(
+        tx.keys() != _TX_KEYS for tx in fields["transactions"]
+    ):
+        return "fields"
+    return None
+
+
+def _check_batch(batch: list[Record]) -> tuple[int, str] | None:
+    """Primeiro registro invalido do lote (posicao, motivo); roda em outro processo."""
+    for position, (block_hash, preimage) in enumerate(batch):
+        try:
+            error = _check_record(block_hash, preimage, json.loads(preimage))
+        except (TypeError, ValueError, AttributeError):
+            error = "json"
+        if error:
+            return position, error
+    return None
+
+
+def _batches(records: Iterable[Record]) -> Iterator[list[Record]]:
+    batch: list[Record] = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def read_blocks(
+    path: str,
+    verify: bool = True,
+    workers: int = 1,
+    on_progress: ProgressCallback | None = None,
+) -> Iterator[Block]:
+    """Blocos do arquivo, em ordem, com os hashes conferidos em lotes.
+
+    Com `workers > 1`, os lotes sao verificados em processos separados
+    enquanto este processo monta os blocos; no maximo `2 * workers` lotes
+    ficam em memoria.
+    """
+    progress = _Progress(on_progress)
+    height = 0
+    pool: Executor | None = ProcessPoolExecutor(workers) if verify and workers > 1 else None
+    pending: list[tuple[list[Record], Future]] = []
+    try:
+        batches = _batches(read_records(path))
+        while True:
+            if pool is not None:
+                while len(pending) < 2 * workers:
+                    batch = next(batches, None)
+                    if batch is None:
+                        break
+                    pending.append((batch, pool.submit(_check_batch, batch)))
+                if not pending:
+                    break
+                batch, future = pending.pop(0)
+                failure = future.result()
+            else:
+                batch = next(batches, None)
+                if batch is None:
+                    break
+                failure = None
+            for position, (block_hash, preimage) in enumerate(batch):
+                if failure is not None and position == failure[0]:
+                    raise ValueError(f"Bloco {height} invalido: {failure[1]}")
+                try:
+                    # LazyBlock: le so o cabecalho; as transacoes sao decodificadas
+                    # na validacao (ja conferidas no outro processo, com pool).
+                    if verify and pool is None:
+                        fields = json.loads(preimage)
+                        error = _check_record(block_hash, preimage, fields)
+                        if error:
+                            raise ValueError(f"Bloco {height} invalido: {error}")
+                        block = LazyBlock.from_preimage(block_hash, preimage, fields)
+                    else:
+                        block = LazyBlock.from_preimage(block_hash, preimage)
+                except (KeyError, TypeError, AttributeError) as exc:
+                    raise ValueError(f"Bloco {height} invalido: {exc!r}") from None
+                progress.add(len(preimage))
+                height += 1
+                yield block
+    finally:
+        if pool is not None:
+            for _, future in pending:
+                future.cancel()
+            pool.shutdown(wait=True, cancel_futures=True)
+    progress.report(done=True)
+
+
+def import_chain(
+    path: str,
+    blockchain: Blockchain | None = None,
+    difficulty: Difficulty | None = None,
+    verify: bool = True,
+    workers: int = 1,
+    on_progress: ProgressCallback | None = None,
+) -> Blockchain:
+    """Carrega um arquivo exportado em `blockchain` (nova, se None).
+
+    A cadeia de destino deve ter so o genesis. `verify=False` pula a
+    conferencia dos hashes (arquivo confiavel); encadeamento, PoW e saldos
+    sao sempre validados.
+    """
+    if blockchain is None:
+        blockchain = Blockchain(difficulty)
+    blockchain.bulk_load(read_blocks(path, verify, workers, on_progress), check_hashes=False)
+    return blockchain
+
+
+## linha de comando
+def _print_progress(progress: TransferProgress) -> None:
+    end = "\n" if progress.done else ""
+    print(
+        f"\r{progress.blocks} blocos, {progress.bytes / 1e6:.1f} MB, "
+        f"{progress.blocks_per_second:.0f} blocos/s",
+        end=end,
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def _source_records(path: str) -> Iterator[Record]:
+    """Registros de um arquivo exportado ou do JSON de `Blockchain.to_dict`."""
+    with open(path, "rb") as handle:
+        head = handle.read(len(MAGIC))
+        handle.seek(0)
+        first = handle.readline(4096)
+    if head != MAGIC and first.lstrip().startswith(b'{"chain"'):
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        return block_records(Block.from_dict(block) for block in data["chain"])
+    return read_records(path)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Exporta/importa a cadeia em streaming")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser(
+        "export", help="Converte o JSON da cadeia (ou outro arquivo exportado) para NDJSON/store"
+    )
+    export.add_argument("source", help="JSON de Blockchain.to_dict, NDJSON ou block store")
+    export.add_argument("out")
+    export.add_argument("--format", choices=FORMATS, default="ndjson")
+
+    load = commands.add_parser("import", help="Valida um arquivo exportado")
+    load.add_argument("source", help="NDJSON ou block store")
+    load.add_argument("--out", help="Grava a cadeia importada no JSON de Blockchain.to_dict")
+    load.add_argument("--difficulty-bits", type=int, default=None)
+    load.add_argument(
+        "--workers",
+        type=int,
+        default=min(4, os.cpu_count() or 1),
+        help="Processos para conferir os hashes",
+    )
+    load.add_argument(
+        "--assume-valid",
+        type=AssumeValid.parse,
+        default=None,
+        metavar="ALTURA:HASH",
+        help="Ancestrais deste bloco pulam a validacao de PoW e saldos",
+    )
+    load.add_argument(
+        "--no-verify", action="store_true", help="Nao confere os hashes (arquivo confiavel)"
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    if args.command == "export":
+        progress = write_records(
+            _source_records(args.source), args.out, args.format, _print_progress
+        )
+        print(f"{progress.blocks} blocos exportados para {args.out} ({args.format})")
+        return
+
+    difficulty = (
+        Difficulty.from_bits(args.difficulty_bits) if args.difficulty_bits is not None else None
+    )
+    started = time.perf_counter()
+    try:
+        blockchain = import_chain(
+            args.source,
+            Blockchain(difficulty, assume_valid=args.assume_valid),
+            verify=not args.no_verify,
+            workers=args.workers,
+            on_progress=_print_progress,
+        )
+    except ValueError as exc:
+        raise SystemExit(f"Importacao falhou: {exc}") from None
+    print(
+        f"Cadeia com {len(blockchain.chain)} blocos importada em "
+        f"{time.perf_counter() - started:.1f}s"
+    )
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as handle:
+            json.dump(blockchain.to_dict(), handle, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
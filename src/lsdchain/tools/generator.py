@@ -0,0 +1,324 @@
+"""Gerador deterministico de cadeias e cargas de transacoes para testes de escala.
+
+Exemplo:
+    PYTHONPATH=src python -m lsdchain.tools.generator --height 10000 \
+        --txs-per-block 20 --addresses 500 --seed 7 --out chain.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterator
+
+from ..core.block import Block
+from ..core.blockchain import COINBASE_REWARD, COINBASE_SENDER, Blockchain
+from ..core.difficulty import Difficulty
+from ..core.transaction import Transaction
+
+if TYPE_CHECKING:
+    from ..network.node import Node
+
+# Timestamp inicial fixo (a cadeia nao depende do relogio da maquina).
+BASE_TIMESTAMP = 1_700_000_000.0
+
+
+@dataclass
+class GeneratorConfig:
+    """Parametros da cadeia sintetica."""
+
+    height: int = 1000
+    txs_per_block: int = 10
+    # Quantidade de enderecos distintos (host:porta) usados nas transacoes.
+    addresses: int = 100
+    seed: int = 0
+    # Intervalo entre blocos (segundos) usado nos timestamps.
+    block_interval: float = 10.0
+    # Dificuldade da cadeia; o padrao (0 bits) aceita qualquer hash.
+    difficulty: Difficulty | None = None
+    # Arquivo com nonces ja encontrados (modo de nonces pre-calculados).
+    nonce_cache: str | None = None
+
+
+def make_addresses(count: int) -> list[str]:
+    """Enderecos no formato host:porta exigido pelo CLI/GUI."""
+    return [f"10.{i // 64000 % 256}.{i // 250 % 256}.{i % 250 + 1}:5000" for i in range(count)]
+
+
+class ChainGenerator:
+    """Produz blocos validos de forma deterministica a partir de uma seed.
+
+    Cada bloco tem a coinbase para um endereco sorteado e transferencias
+    entre enderecos com saldo, de modo que a cadeia passa na validacao
+    normal (`Blockchain.is_valid_chain`). Com dificuldade real, os nonces
+    encontrados podem ser salvos em `nonce_cache` e reutilizados, ja que a
+    mesma seed gera sempre os mesmos blocos.
+    """
+
+    def __init__(self, config: GeneratorConfig) -> None:
+        if config.addresses < 2:
+            raise ValueError("Sao necessarios pelo menos 2 enderecos")
+        self.config = config
+        self.difficulty = config.difficulty or Difficulty.from_bits(0)
+        self.rng = random.Random(config.seed)
+        self.addresses = make_addresses(config.addresses)
+        # Saldos confirmados, atualizados conforme os blocos sao gerados.
+        self.balances: dict[str, float] = {}
+        self._nonces: list[int] = self._load_nonce_cache()
+        self._nonces_dirty = False
+
+    def _load_nonce_cache(self) -> list[int]:
+        path = self.config.nonce_cache
+        if not path or not os.path.exists(path):
+            return []
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        if data.get("seed") != self.config.seed or data.get("target") != self.difficulty.target:
+            return []
+        return [int(nonce) for nonce in data.get("nonces", [])]
+
+    def _save_nonce_cache(self) -> None:
+        path = self.config.nonce_cache
+        if not path or not self._nonces_dirty:
+            return
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(
+                {"seed": self.config.seed, "target": self.difficulty.target, "nonces": self._nonces},
+                handle,
+            )
+        self._nonces_dirty = False
+
+    def _tx_id(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def _transfers(self, timestamp: float) -> list[Transaction]:
+        funded = [address for address, balance in self.balances.items() if balance >= 1.0]
+        if not funded:
+            return []
+        spent: dict[str, float] = {}
+        txs = []
+        for _ in range(self.config.txs_per_block):
+            origem = self.rng.choice(funded)
+            available = self.balances[origem] - spent.get(origem, 0.0)
+            if available < 1.0:
+                continue
+            destino = self.rng.choice(self.addresses)
+            if destino == origem:
+                continue
+            # Folga de 0.01 para diferencas de arredondamento de float entre
+            # este controle e o somatorio feito na validacao.
+            valor = round(self.rng.uniform(0.01, min(available - 0.01, 10.0)), 2)
+            spent[origem] = spent.get(origem, 0.0) + valor
+            txs.append(
+                Transaction(
+                    origem=origem,
+                    destino=destino,
+                    valor=valor,
+                    id=self._tx_id(),
+                    timestamp=timestamp,
+                )
+            )
+        return txs
+
+    def _apply(self, block: Block) -> None:
+        for tx in block.transactions:
+            self.balances[tx.destino] = self.balances.get(tx.destino, 0.0) + tx.valor
+            if tx.origem != COINBASE_SENDER:
+                self.balances[tx.origem] -= tx.valor
+
+    def _seal(self, block: Block, chain: list[Block], cache: dict[int, int]) -> None:
+        """Encontra (ou reaproveita) o nonce que satisfaz o alvo do bloco."""
+        target = self.difficulty.target_for(chain, block.index, cache)
+        position = block.index - 1
+        if position < len(self._nonces):
+            block.nonce = self._nonces[position]
+            block.hash = block.calculate_hash()
+            if block.meets_target(target):
+                return
+            # Cache inconsistente: descarta daqui em diante.
+            del self._nonces[position:]
+
+        prefix, suffix = block.hash_template()
+        base = hashlib.sha256(prefix)
+        nonce = 0
+        while True:
+            attempt = base.copy()
+            attempt.update(b"%d" % nonce)
+            attempt.update(suffix)
+            digest = attempt.digest()
+            if int.from_bytes(digest, "big") < target:
+                break
+            nonce += 1
+        block.nonce = nonce
+        block.hash = digest.hex()
+        self._nonces.append(nonce)
+        self._nonces_dirty = True
+
+    def blocks(self) -> Iterator[Block]:
+        """Gera os blocos 1..height em ordem (o genesis nao e incluido)."""
+        # Cada chamada recomeca da seed: mesma cadeia e saldos so dela; a
+        # `workload` seguinte continua deste estado.
+        self.rng = random.Random(self.config.seed)
+        self.balances = {}
+        chain = [Block.create_genesis()]
+        cache: dict[int, int] = {}
+        try:
+            for index in range(1, self.config.height + 1):
+                timestamp = BASE_TIMESTAMP + index * self.config.block_interval
+                coinbase = Transaction(
+                    origem=COINBASE_SENDER,
+                    destino=self.rng.choice(self.addresses),
+                    valor=COINBASE_REWARD,
+                    id=self._tx_id(),
+                    timestamp=timestamp,
+                )
+                block = Block(
+                    index=index,
+                    previous_hash=chain[-1].hash,
+                    transactions=[coinbase] + self._transfers(timestamp),
+                    nonce=0,
+                    timestamp=timestamp,
+                    hash="-",
+                )
+                self._seal(block, chain, cache)
+                self._apply(block)
+                chain.append(block)
+                yield block
+        finally:
+            self._save_nonce_cache()
+
+    def blockchain(self) -> Blockchain:
+        """Instancia de Blockchain com a cadeia completa gerada."""
+        blockchain = Blockchain(self.difficulty)
+        blockchain.chain.extend(self.blocks())
+        blockchain.reindex()
+        return blockchain
+
+    def workload(
+        self, count: int, rate: float, start: float = 0.0
+    ) -> Iterator[tuple[float, Transaction]]:
+        """Carga em malha aberta: (instante relativo, transacao).
+
+        Chegadas seguem um processo de Poisson com `rate` transacoes/s e
+        gastam apenas saldo confirmado mais o que ja foi gasto na propria
+        carga, para serem aceitas por um no com a cadeia gerada.
+        """
+        spent: dict[str, float] = {}
+        moment = start
+        emitted = 0
+        while emitted < count:
+            funded = [
+                address
+                for address, balance in self.balances.items()
+                if balance - spent.get(address, 0.0) >= 0.02
+            ]
+            if not funded:
+                return
+            origem = self.rng.choice(funded)
+            destino = self.rng.choice(self.addresses)
+            if destino == origem:
+                continue
+            available = self.balances[origem] - spent.get(origem, 0.0)
+            valor = round(self.rng.uniform(0.01, min(available / 2, 1.0)), 2)
+            spent[origem] = spent.get(origem, 0.0) + valor
+            moment += self.rng.expovariate(rate)
+            emitted += 1
+            yield moment, Transaction(
+                origem=origem,
+                destino=destino,
+                valor=valor,
+                id=self._tx_id(),
+                timestamp=BASE_TIMESTAMP + moment,
+            )
+
+
+def run_workload(
+    node: "Node", workload: Iterator[tuple[float, Transaction]]
+) -> dict[str, float]:
+    """Envia a carga via Node.broadcast_transaction respeitando os instantes.
+
+    Malha aberta: o envio seguinte nao espera o resultado do anterior
+    atrasar o cronograma; se o no ficar lento, o atraso aparece em `lag`.
+    """
+    started = time.perf_counter()
+    accepted = rejected = 0
+    max_lag = 0.0
+    for moment, tx in workload:
+        delay = started + moment - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            max_lag = max(max_lag, -delay)
+        if node.broadcast_transaction(tx):
+            accepted += 1
+        else:
+            rejected += 1
+    elapsed = time.perf_counter() - started
+    return {
+        "accepted": accepted,
+        "rejected": rejected,
+        "seconds": elapsed,
+        "max_lag": max_lag,
+    }
+
+
+def write_chain(blockchain: Blockchain, path: str) -> None:
+    """Salva a cadeia no mesmo formato JSON de `Blockchain.to_dict`."""
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(blockchain.to_dict(), handle, sort_keys=True)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Gerador de cadeias sinteticas")
+    parser.add_argument("--height", type=int, default=1000)
+    parser.add_argument("--txs-per-block", type=int, default=10)
+    parser.add_argument("--addresses", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--difficulty-bits",
+        type=int,
+        default=0,
+        help="Bits zerados exigidos (0 = sem PoW; 12 = padrao '000')",
+    )
+    parser.add_argument("--nonce-cache", help="Arquivo para reaproveitar nonces")
+    parser.add_argument("--out", required=True, help="Arquivo JSON da cadeia")
+    parser.add_argument("--workload", type=int, default=0, help="Transacoes de carga")
+    parser.add_argument("--workload-rate", type=float, default=100.0)
+    parser.add_argument("--workload-out", help="Arquivo NDJSON da carga")
+    args = parser.parse_args()
+    if args.workload and not args.workload_out:
+        parser.error("--workload exige --workload-out")
+    return args
+
+
+def main() -> None:
+    args = _parse_args()
+    generator = ChainGenerator(
+        GeneratorConfig(
+            height=args.height,
+            txs_per_block=args.txs_per_block,
+            addresses=args.addresses,
+            seed=args.seed,
+            difficulty=Difficulty.from_bits(args.difficulty_bits),
+            nonce_cache=args.nonce_cache,
+        )
+    )
+    blockchain = generator.blockchain()
+    write_chain(blockchain, args.out)
+    print(f"Cadeia com {len(blockchain.chain)} blocos salva em {args.out}")
+
+    if args.workload:
+        with open(args.workload_out, "w", encoding="utf-8") as handle:
+            for moment, tx in generator.workload(args.workload, args.workload_rate):
+                handle.write(json.dumps({"at": moment, "transaction": tx.to_dict()}) + "\n")
+        print(f"Carga com {args.workload} transacoes salva em {args.workload_out}")
+
+
+if __name__ == "__main__":
+    main()